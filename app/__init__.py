@@ -7,6 +7,8 @@ from flask import Flask
 from flask_jwt_extended import JWTManager
 from flask_sqlalchemy import SQLAlchemy
 
+from app.caching import ResponseCache
+from app.caching.revoked_tokens import RevokedTokens
 from app.na_celery import NewAcropolisCelery
 
 
@@ -14,6 +16,8 @@ db = SQLAlchemy()
 application = Flask(__name__)
 jwt = JWTManager(application)
 celery = NewAcropolisCelery()
+cache = ResponseCache()
+revoked_tokens = RevokedTokens()
 
 
 def create_app(**kwargs):
@@ -31,6 +35,8 @@ def create_app(**kwargs):
 
     db.init_app(application)
     celery.init_app(application)
+    cache.init_app(application)
+    revoked_tokens.init_app(application)
 
     register_blueprint()
 
@@ -61,6 +67,7 @@ def register_blueprint():
     from app.routes.fees.rest import fees_blueprint, fee_blueprint
     from app.routes.event_dates.rest import event_dates_blueprint, event_date_blueprint
     from app.routes.event_types.rest import event_types_blueprint, event_type_blueprint
+    from app.routes.imports.rest import imports_blueprint
     from app.routes.marketings.rest import marketings_blueprint
     from app.routes.members.rest import members_blueprint
     from app.routes.speakers.rest import speakers_blueprint, speaker_blueprint
@@ -78,6 +85,7 @@ def register_blueprint():
     application.register_blueprint(event_type_blueprint)
     application.register_blueprint(fees_blueprint)
     application.register_blueprint(fee_blueprint)
+    application.register_blueprint(imports_blueprint)
     application.register_blueprint(marketings_blueprint)
     application.register_blueprint(members_blueprint)
     application.register_blueprint(speakers_blueprint)
@@ -0,0 +1,96 @@
+from functools import wraps
+
+from flask import current_app, make_response, request
+
+from app.caching.backends import LRUCacheBackend, RedisCacheBackend
+
+HITS = 'hits'
+MISSES = 'misses'
+
+
+class ResponseCache(object):
+
+    def __init__(self):
+        self.backend = None
+        self.ttl = None
+
+    def init_app(self, app):
+        self.ttl = app.config['CACHE_TTL']
+
+        backend = app.config.get('CACHE_BACKEND')
+        redis_url = app.config.get('CACHE_REDIS_URL')
+        if backend and not redis_url:
+            # invalidations need to be shared by the web workers and the celery workers
+            self.backend = None
+            app.logger.info('Response cache disabled, CACHE_REDIS_URL is needed to share the tag versions')
+        elif backend == 'redis':
+            self.backend = RedisCacheBackend(redis_url)
+        elif backend == 'memory':
+            self.backend = LRUCacheBackend(app.config['CACHE_MAX_ENTRIES'], versions=RedisCacheBackend(redis_url))
+        else:
+            self.backend = None
+            app.logger.info('Response cache disabled')
+
+    def _make_key(self, tags):
+        versions = self.backend.get_versions(tags)
+        return 'response:{}:{}'.format(
+            request.full_path,
+            ','.join('{}={}'.format(tag, version) for tag, version in zip(tags, versions))
+        )
+
+    def cached(self, *tags):
+        """
+        Caches successful GET responses, entries are dropped when any of the tags are invalidated
+        """
+        def decorator(func):
+            @wraps(func)
+            def cached_response(*args, **kwargs):
+                if not self.backend or request.method != 'GET':
+                    return func(*args, **kwargs)
+
+                key = self._make_key(tags)
+                entry = self.backend.get(key)
+                if entry:
+                    self.backend.incr(HITS)
+                    data, status_code, mimetype = entry
+                    return current_app.response_class(data, status=status_code, mimetype=mimetype)
+
+                self.backend.incr(MISSES)
+
+                response = make_response(func(*args, **kwargs))
+                if response.status_code == 200:
+                    self.backend.set(key, (response.get_data(), response.status_code, response.mimetype), self.ttl)
+
+                return response
+            return cached_response
+        return decorator
+
+    def invalidate(self, *tags):
+        if self.backend:
+            self.backend.incr_versions(tags)
+
+    def invalidates(self, *tags):
+        """
+        Invalidates the tags once the decorated function returns, place above @transactional
+        so that the tags are only invalidated after a commit
+        """
+        def decorator(func):
+            @wraps(func)
+            def invalidate_after(*args, **kwargs):
+                res = func(*args, **kwargs)
+                self.invalidate(*tags)
+                return res
+            return invalidate_after
+        return decorator
+
+    def stats(self):
+        if not self.backend:
+            return {'enabled': False}
+
+        return {
+            'enabled': True,
+            'backend': self.backend.__class__.__name__,
+            'entries': self.backend.size(),
+            HITS: self.backend.get_counter(HITS),
+            MISSES: self.backend.get_counter(MISSES),
+        }
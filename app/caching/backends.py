@@ -0,0 +1,103 @@
+from collections import OrderedDict
+import pickle
+import threading
+import time
+
+
+class LRUCacheBackend(object):
+    """
+    Keeps the entries in process, the tag versions are kept by the versions backend when given,
+    so that an invalidation in one process is seen by the others
+    """
+
+    def __init__(self, max_entries, versions=None):
+        self.max_entries = max_entries
+        self.versions_backend = versions
+        self.entries = OrderedDict()
+        self.versions = {}
+        self.counters = {}
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.pop(key, None)
+            if not entry:
+                return
+
+            expires_at, value = entry
+            if expires_at < time.time():
+                return
+
+            self.entries[key] = entry
+            return value
+
+    def set(self, key, value, ttl):
+        with self.lock:
+            self.entries.pop(key, None)
+            self.entries[key] = (time.time() + ttl, value)
+
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def delete(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def get_versions(self, tags):
+        if self.versions_backend:
+            return self.versions_backend.get_versions(tags)
+        return [self.versions.get(tag, 0) for tag in tags]
+
+    def incr_versions(self, tags):
+        if self.versions_backend:
+            return self.versions_backend.incr_versions(tags)
+
+        with self.lock:
+            for tag in tags:
+                self.versions[tag] = self.versions.get(tag, 0) + 1
+
+    def incr(self, name):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + 1
+
+    def get_counter(self, name):
+        return self.counters.get(name, 0)
+
+    def size(self):
+        return len(self.entries)
+
+
+class RedisCacheBackend(object):
+
+    KEY_PREFIX = 'na_api:cache:'
+
+    def __init__(self, url):
+        import redis
+
+        self.redis = redis.StrictRedis.from_url(url)
+
+    def get(self, key):
+        value = self.redis.get(self.KEY_PREFIX + key)
+        if value:
+            return pickle.loads(value)
+
+    def set(self, key, value, ttl):
+        self.redis.set(self.KEY_PREFIX + key, pickle.dumps(value), ex=ttl)
+
+    def get_versions(self, tags):
+        return [int(v or 0) for v in self.redis.mget([self.KEY_PREFIX + 'tag:' + tag for tag in tags])]
+
+    def incr_versions(self, tags):
+        pipeline = self.redis.pipeline()
+        for tag in tags:
+            pipeline.incr(self.KEY_PREFIX + 'tag:' + tag)
+        pipeline.execute()
+
+    def incr(self, name):
+        self.redis.incr(self.KEY_PREFIX + 'counter:' + name)
+
+    def get_counter(self, name):
+        return int(self.redis.get(self.KEY_PREFIX + 'counter:' + name) or 0)
+
+    def size(self):
+        return sum(1 for _ in self.redis.scan_iter(match=self.KEY_PREFIX + 'response:*'))
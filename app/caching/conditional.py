@@ -0,0 +1,51 @@
+from datetime import datetime
+from functools import wraps
+import hashlib
+
+from flask import make_response, request
+
+from app.dao.table_versions_dao import dao_get_table_versions
+
+
+def conditional_get(*models, **options):
+    """
+    Sets a strong ETag and Last-Modified from the tables' versions and returns 304 without calling
+    the view when the client already has them. Responses that depend on the time as well as the data,
+    such as future events, pass time_bucket, a strftime format mixed into the ETag
+    """
+    time_bucket = options.get('time_bucket')
+
+    def decorator(func):
+        @wraps(func)
+        def conditional_response(*args, **kwargs):
+            versions = dao_get_table_versions(*models)
+
+            version_key = '{}|{}'.format(request.full_path, versions)
+            if time_bucket:
+                version_key += '|' + datetime.utcnow().strftime(time_bucket)
+            etag = hashlib.sha1(version_key.encode('utf-8')).hexdigest()
+
+            updated = [updated_at for _, updated_at in versions if updated_at]
+            last_modified = max(updated).replace(microsecond=0) if updated else None
+
+            if request.if_none_match:
+                not_modified = request.if_none_match.contains(etag)
+            else:
+                not_modified = (
+                    not time_bucket and last_modified and request.if_modified_since and
+                    request.if_modified_since.replace(tzinfo=None) >= last_modified
+                )
+
+            if not_modified:
+                response = make_response('', 304)
+            else:
+                response = make_response(func(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag)
+            if last_modified:
+                response.last_modified = last_modified
+            return response
+        return conditional_response
+    return decorator
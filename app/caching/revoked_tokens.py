@@ -0,0 +1,93 @@
+import time
+
+from flask import current_app
+
+from app.caching.backends import LRUCacheBackend
+
+
+class RevokedTokens(object):
+    """
+    Keeps the ids of revoked tokens in redis under keys which expire with the token, so that checking a token
+    does not query the token_blacklist table. Tokens found not to be revoked are remembered in process for a
+    few seconds. None is returned when redis cannot answer so that the caller can fall back to the database.
+    """
+
+    KEY_PREFIX = 'na_api:revoked:'
+    LOADED_KEY = KEY_PREFIX + 'loaded'
+
+    def __init__(self):
+        self.redis = None
+        self.redis_errors = ()
+        self.reload = False
+        self.not_revoked = None
+        self.not_revoked_ttl = None
+
+    def init_app(self, app):
+        self.not_revoked = LRUCacheBackend(app.config['REVOKED_TOKENS_MAX_ENTRIES'])
+        self.not_revoked_ttl = app.config['REVOKED_TOKENS_NOT_REVOKED_TTL']
+
+        url = app.config.get('CACHE_REDIS_URL')
+        if url:
+            import redis
+
+            self.redis = redis.StrictRedis.from_url(url)
+            self.redis_errors = redis.exceptions.RedisError
+        else:
+            self.redis = None
+            app.logger.info('Revoked tokens cache disabled')
+
+    def is_not_revoked(self, jti):
+        return bool(self.not_revoked.get(jti))
+
+    def set_not_revoked(self, jti):
+        self.not_revoked.set(jti, True, self.not_revoked_ttl)
+
+    def is_revoked(self, jti, get_revoked_tokens):
+        """
+        get_revoked_tokens returns the (jti, expires at timestamp) of all the unexpired revoked tokens,
+        it is called when redis does not have them, as happens after a restart without persistence
+        """
+        if not self.redis:
+            return
+
+        try:
+            if self.reload:
+                # a revoked token could not be added, so all of them are loaded again
+                self.redis.delete(self.LOADED_KEY)
+                self.reload = False
+
+            revoked, loaded = self.redis.pipeline().exists(self.KEY_PREFIX + jti).exists(self.LOADED_KEY).execute()
+            if loaded:
+                return bool(revoked)
+
+            pipeline = self.redis.pipeline()
+            for revoked_jti, expires_at in get_revoked_tokens():
+                self._add(pipeline, revoked_jti, expires_at)
+            pipeline.set(self.LOADED_KEY, 1)
+            pipeline.execute()
+        except self.redis_errors as e:
+            current_app.logger.warning('Revoked tokens cache unavailable: %s', e)
+
+    def add(self, jti, expires_at):
+        self.not_revoked.delete(jti)
+
+        if self.redis:
+            try:
+                pipeline = self.redis.pipeline()
+                self._add(pipeline, jti, expires_at)
+                pipeline.execute()
+            except self.redis_errors as e:
+                current_app.logger.warning('Revoked tokens cache unavailable: %s', e)
+                self.reload = True
+
+    def remove(self, jti):
+        if self.redis:
+            try:
+                self.redis.delete(self.KEY_PREFIX + jti)
+            except self.redis_errors as e:
+                current_app.logger.warning('Revoked tokens cache unavailable: %s', e)
+
+    def _add(self, pipeline, jti, expires_at):
+        ttl = int(expires_at - time.time()) + 1
+        if ttl > 0:
+            pipeline.set(self.KEY_PREFIX + jti, 1, ex=ttl)
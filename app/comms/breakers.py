@@ -0,0 +1,112 @@
+from datetime import datetime, timedelta
+from threading import Lock
+
+from flask import current_app
+
+from app.errors import CircuitOpenError
+
+EMAIL_PROVIDER = 'email_provider'
+GOOGLE_STORAGE = 'google_storage'
+PAYPAL = 'paypal'
+
+PROVIDERS = [EMAIL_PROVIDER, GOOGLE_STORAGE, PAYPAL]
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+_breakers = {}
+
+
+class CircuitBreaker(object):
+    """
+    Fails calls to a provider fast once it has failed failure_threshold times in a row,
+    after reset_timeout seconds one call is let through to probe whether the provider has recovered
+    """
+
+    def __init__(self, name, failure_threshold, reset_timeout):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self.lock = Lock()
+
+    def is_open(self):
+        """
+        True while calls fail fast, before the provider is due to be probed again
+        """
+        return self.state == OPEN and datetime.utcnow() < self.opened_at + timedelta(seconds=self.reset_timeout)
+
+    def before_call(self):
+        with self.lock:
+            if self.state == OPEN and datetime.utcnow() >= self.opened_at + timedelta(seconds=self.reset_timeout):
+                self.state = HALF_OPEN
+
+            if self.state == OPEN or (self.state == HALF_OPEN and self.probing):
+                raise CircuitOpenError(self.name)
+
+            if self.state == HALF_OPEN:
+                self.probing = True
+
+    def record_success(self):
+        with self.lock:
+            if self.state != CLOSED:
+                current_app.logger.info('Circuit closed for %s', self.name)
+            self.state = CLOSED
+            self.failures = 0
+            self.probing = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            self.probing = False
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    current_app.logger.error('Circuit opened for %s after %d failures', self.name, self.failures)
+                self.state = OPEN
+                self.opened_at = datetime.utcnow()
+
+    def call(self, errors, func, *args, **kwargs):
+        """
+        Calls func through the breaker, only the errors given count as the provider failing
+        """
+        self.before_call()
+        try:
+            result = func(*args, **kwargs)
+        except errors:
+            self.record_failure()
+            raise
+        except Exception:
+            # the provider responded, the error is with the call itself
+            self.record_success()
+            raise
+        self.record_success()
+        return result
+
+    def serialize(self):
+        return {
+            'state': self.state,
+            'failures': self.failures,
+            'opened_at': self.opened_at.strftime('%Y-%m-%d %H:%M:%S') if self.opened_at else None,
+        }
+
+
+def get_breaker(name):
+    """
+    Returns the breaker for the named provider, breakers are per process
+    """
+    breaker = _breakers.get(name)
+    if not breaker:
+        breaker = _breakers[name] = CircuitBreaker(
+            name,
+            failure_threshold=current_app.config['BREAKER_FAILURE_THRESHOLD'],
+            reset_timeout=current_app.config['BREAKER_RESET_TIMEOUT'],
+        )
+    return breaker
+
+
+def breakers_status():
+    return {name: get_breaker(name).serialize() for name in PROVIDERS}
@@ -1,7 +1,8 @@
-from flask import current_app, jsonify, render_template
-import requests
+from flask import current_app, json, jsonify, render_template
 from HTMLParser import HTMLParser
 
+from app.comms.breakers import EMAIL_PROVIDER
+from app.comms.sessions import PROVIDER_ERRORS, get_session
 from app.models import EVENT
 from app.dao.events_dao import dao_get_event_by_id
 
@@ -36,7 +37,7 @@ def get_nice_event_dates(event_dates):
 
 def get_email_html(email_type, **kwargs):
     if email_type == EVENT:
-        event = dao_get_event_by_id(kwargs.get('event_id'))
+        event = kwargs.get('event') or dao_get_event_by_id(kwargs.get('event_id'))
         return render_template(
             'emails/events.html',
             event=event,
@@ -47,6 +48,20 @@ def get_email_html(email_type, **kwargs):
         )
 
 
+def get_email_subject_and_html(email):
+    """
+    Renders the email once for everyone it is sent to, anything that varies by member is left to the email
+    provider to fill in from the recipient variables, e.g. %recipient.member_id%
+    """
+    if email.email_type != EVENT:
+        return email.get_subject(), None
+
+    event = dao_get_event_by_id(str(email.event_id))
+    html = get_email_html(email.email_type, event=event, details=email.details, extra_txt=email.extra_txt)
+
+    return email.get_subject(event=event), html
+
+
 def send_email(to, subject, message, _from=None):
     if not _from:
         _from = 'noreply@{}'.format(current_app.config['EMAIL_DOMAIN'])
@@ -62,7 +77,7 @@ def send_email(to, subject, message, _from=None):
     }
 
     if email_provider_url and email_provider_apikey:
-        response = requests.post(
+        response = get_session(EMAIL_PROVIDER).post(
             email_provider_url,
             auth=('api', email_provider_apikey),
             data=data,
@@ -78,3 +93,63 @@ def send_email(to, subject, message, _from=None):
         return response.status_code
     else:
         current_app.logger.info('Email not configured, email would have sent: {}'.format(data))
+
+
+def send_batch_email(to, subject, message, recipient_variables, _from=None):
+    """
+    Sends the email to a batch of recipients in one call to the email provider, the recipient variables
+    make the provider send each recipient their own copy.
+    Returns the status code for each recipient, if the provider rejects the batch each recipient is
+    sent to separately so that the recipients that failed get their own status code.
+    Only raises when the provider is unavailable or throttling, so that the email can be sent again later,
+    if that happens while sending separately the status codes of the recipients sent to so far are returned.
+    """
+    if not _from:
+        _from = 'noreply@{}'.format(current_app.config['EMAIL_DOMAIN'])
+
+    email_provider_url = current_app.config['EMAIL_PROVIDER_URL']
+    email_provider_apikey = current_app.config['EMAIL_PROVIDER_APIKEY']
+
+    data = {
+        "from": _from,
+        "to": to,
+        "subject": subject,
+        "html": message,
+        "recipient-variables": json.dumps(recipient_variables)
+    }
+
+    if not (email_provider_url and email_provider_apikey):
+        current_app.logger.info('Email not configured, email would have sent: {}'.format(data))
+        return {email_to: None for email_to in to}
+
+    response = get_session(EMAIL_PROVIDER).post(
+        email_provider_url,
+        auth=('api', email_provider_apikey),
+        data=data,
+    )
+
+    # a throttled batch raises from the session, so it is retried later rather than sent to each recipient
+    if 400 <= response.status_code < 500:
+        if len(to) == 1:
+            current_app.logger.error('Failed to send email: {} to {}, response: {}'.format(
+                subject, to[0], response.text))
+            return {to[0]: response.status_code}
+
+        current_app.logger.error(
+            'Batch email rejected: {}, response: {}, sending separately'.format(subject, response.text))
+        status_codes = {}
+        for email_to in to:
+            try:
+                status_codes.update(send_batch_email(
+                    [email_to], subject, message, {email_to: recipient_variables[email_to]}, _from=_from))
+            except PROVIDER_ERRORS as e:
+                # the recipients not sent to are left for the caller to send again later
+                current_app.logger.error('Email provider unavailable: {}, sent {} to {} of {}'.format(
+                    e, subject, len(status_codes), len(to)))
+                break
+        return status_codes
+
+    response.raise_for_status()
+    current_app.logger.info('Sent batch email: {} to {}, response: {}'.format(subject, len(to), response.text))
+
+    return {email_to: response.status_code for email_to in to}
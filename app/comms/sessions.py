@@ -0,0 +1,109 @@
+from flask import current_app
+import requests
+from requests.adapters import HTTPAdapter
+from requests.packages.urllib3.util.retry import Retry
+
+from app.comms.breakers import get_breaker
+from app.errors import CircuitOpenError
+
+RETRY_STATUSES = [429, 500, 502, 503, 504]
+
+
+class ProviderUnavailableError(requests.exceptions.HTTPError):
+    """
+    Raised for a response with one of the RETRY_STATUSES once the session's retries have run out
+    """
+
+
+# errors from a service being unavailable or throttling, the call can be made again later,
+# other HTTP errors are raised by the caller checking the response and are not worth retrying
+PROVIDER_ERRORS = (
+    CircuitOpenError,
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    ProviderUnavailableError,
+)
+
+_sessions = {}
+
+
+class PooledSession(requests.Session):
+    """
+    Keeps connections to a service alive between requests, applies the configured timeouts
+    and retries with backoff when the service is throttling or unavailable.
+    Requests go through the service's circuit breaker, so they fail fast while the service is down.
+    """
+
+    def __init__(self, name, timeout, retries, backoff, pool_size):
+        super(PooledSession, self).__init__()
+        self.name = name
+        self.timeout = timeout
+
+        self.adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_size,
+            # read errors are not retried as the service may have acted on the request, e.g. sent the emails
+            max_retries=Retry(
+                total=retries,
+                read=0,
+                backoff_factor=backoff,
+                status_forcelist=RETRY_STATUSES,
+                method_whitelist=False,
+                raise_on_status=False,
+            )
+        )
+        self.mount('https://', self.adapter)
+        self.mount('http://', self.adapter)
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+
+        breaker = get_breaker(self.name)
+        breaker.before_call()
+        try:
+            response = super(PooledSession, self).request(method, url, **kwargs)
+        except requests.exceptions.RequestException:
+            breaker.record_failure()
+            raise
+
+        if response.status_code in RETRY_STATUSES:
+            breaker.record_failure()
+            raise ProviderUnavailableError(
+                '{} {} from {}'.format(response.status_code, response.reason, self.name), response=response)
+
+        breaker.record_success()
+        return response
+
+    def stats(self):
+        pools = self.adapter.poolmanager.pools
+        connections = requests_made = 0
+        for key in pools.keys():
+            pool = pools[key]
+            connections += pool.num_connections
+            requests_made += pool.num_requests
+
+        return {
+            'requests': requests_made,
+            'connections': connections,
+            'reused': requests_made - connections,
+        }
+
+
+def get_session(name):
+    """
+    Returns the session for the named service, one per process so that each worker pools its own connections
+    """
+    session = _sessions.get(name)
+    if not session:
+        session = _sessions[name] = PooledSession(
+            name,
+            timeout=(current_app.config['HTTP_CONNECT_TIMEOUT'], current_app.config['HTTP_READ_TIMEOUT']),
+            retries=current_app.config['HTTP_RETRIES'],
+            backoff=current_app.config['HTTP_RETRY_BACKOFF'],
+            pool_size=current_app.config['HTTP_POOL_SIZE'],
+        )
+    return session
+
+
+def sessions_stats():
+    return {name: session.stats() for name, session in _sessions.items()}
@@ -39,6 +39,10 @@ class Config(object):
     ADMIN_USERS = os.environ.get('ADMIN_USERS')
     EMAIL_DOMAIN = os.environ.get('EMAIL_DOMAIN')
     EVENTS_MAX = 30
+    PAGE_SIZE = 50
+    PAGE_SIZE_MAX = 200
+    IMPORT_BATCH_SIZE = 1000
+    IMPORT_STREAM_BATCH_SIZE = 100
     PROJECT = os.environ.get('PROJECT')
     STORAGE = os.environ.get('GOOGLE_STORE')
     PAYPAL_URL = os.environ.get('PAYPAL_URL')
@@ -55,8 +59,60 @@ class Config(object):
     TRAVIS_COMMIT = os.environ.get('TRAVIS_COMMIT')
 
     CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL')
+    CELERYBEAT_SCHEDULE = {
+        'send-queued-emails': {
+            'task': 'app.na_celery.email_tasks.send_queued_emails',
+            'schedule': 60.0,
+        },
+        'prune-token-blacklist': {
+            'task': 'app.na_celery.blacklist_tasks.prune_token_blacklist',
+            'schedule': 60 * 60.0,
+        },
+    }
     EMAIL_DELAY = 30
     EMAIL_LIMIT = 400
+    # hour of the day, in UTC, that sends over the EMAIL_LIMIT are resumed the next day
+    EMAIL_QUOTA_RESUME_HOUR = 9
+    # recipients per call to the email provider, mailgun accepts up to 1000
+    EMAIL_BATCH_SIZE = 1000
+    # seconds before a queued email claimed by a worker that stopped can be claimed again
+    EMAIL_CLAIM_TIMEOUT = 15 * 60
+
+    # timeouts in seconds and retries for calls to the email provider and paypal
+    HTTP_CONNECT_TIMEOUT = 5
+    HTTP_READ_TIMEOUT = 30
+    HTTP_RETRIES = 3
+    HTTP_RETRY_BACKOFF = 0.5
+    HTTP_POOL_SIZE = 10
+
+    # consecutive failures before calls to a provider fail fast, and seconds before it is probed again
+    BREAKER_FAILURE_THRESHOLD = 5
+    BREAKER_RESET_TIMEOUT = 30
+
+    PAYPAL_RETRY_DELAY = 5 * 60
+    PAYPAL_MAX_RETRIES = 12
+
+    NOTIFICATION_RETRY_DELAY = 60
+    NOTIFICATION_MAX_RETRIES = 5
+
+    STORAGE_RETRY_DELAY = 5 * 60
+    STORAGE_MAX_RETRIES = 12
+
+    # memory keeps the responses in process and the tag versions in redis, redis keeps both
+    CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'memory')
+    CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL')
+    CACHE_TTL = 300
+    CACHE_MAX_ENTRIES = 500
+
+    # seconds a token found not to be revoked is trusted in process before it is checked again
+    REVOKED_TOKENS_NOT_REVOKED_TTL = 5
+    REVOKED_TOKENS_MAX_ENTRIES = 1000
+    TOKEN_PRUNE_BATCH_SIZE = 1000
+
+    # index of the blob names in storage used by imports, memory (default), redis or none
+    STORAGE_INDEX_BACKEND = os.environ.get('STORAGE_INDEX_BACKEND', 'memory')
+    # bytes sent per request of a resumable upload, a multiple of 256KB
+    STORAGE_UPLOAD_CHUNK_SIZE = 4 * 256 * 1024
 
 
 class Development(Config):
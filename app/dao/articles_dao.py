@@ -1,23 +1,68 @@
-from app import db
+from sqlalchemy.orm import load_only, undefer
+
+from app import cache, db
 from app.dao.decorators import transactional
-from app.models import Article
+from app.dao.pagination import dao_paginate
+from app.dao.search import get_search_expressions
+from app.models import Article, ARTICLES_PAGE_KEY
+
+SUMMARY_COLUMNS = ['id', 'old_id', 'title', 'author', 'short_content', 'very_short_content']
 
 
+@cache.invalidates('articles')
 @transactional
 def dao_create_article(article):
+    article.set_summary_content()
     db.session.add(article)
 
 
+@cache.invalidates('articles')
 @transactional
 def dao_update_article(article_id, **kwargs):
+    if 'content' in kwargs:
+        kwargs.update(Article.get_summary_content(kwargs['content']))
+
     return Article.query.filter_by(id=article_id).update(
         kwargs
     )
 
 
+@cache.invalidates('articles')
+@transactional
+def dao_backfill_article_summaries(batch_size=100):
+    articles = Article.query.filter(Article.short_content.is_(None)).limit(batch_size).all()
+    for article in articles:
+        article.set_summary_content()
+
+    return len(articles)
+
+
+def _query_summaries():
+    # content is loaded as well so that an article not backfilled yet makes its summary without another query
+    return Article.query.options(load_only(*SUMMARY_COLUMNS), undefer('content'))
+
+
 def dao_get_articles():
     return Article.query.order_by(Article.old_id).all()
 
 
+def dao_get_articles_summary():
+    return _query_summaries().order_by(Article.old_id).all()
+
+
+def dao_get_articles_page(cursor=None, limit=None, summary=False):
+    query = _query_summaries() if summary else Article.query
+
+    return dao_paginate(query, ARTICLES_PAGE_KEY, Article.id, cursor=cursor, limit=limit)
+
+
+def dao_search_articles(q, limit):
+    match, rank, snippet = get_search_expressions(Article.search_vector, Article.content, q)
+
+    return _query_summaries().add_columns(rank, snippet).filter(
+        match
+    ).order_by(rank.desc(), Article.id).limit(limit).all()
+
+
 def dao_get_article_by_id(article_id):
     return Article.query.filter_by(id=article_id).one()
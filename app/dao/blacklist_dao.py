@@ -1,9 +1,10 @@
 from datetime import datetime
+import time
 
 from sqlalchemy.orm.exc import NoResultFound
 from flask_jwt_extended import decode_token, get_jwt_identity
 
-from app import db
+from app import db, revoked_tokens
 from app.dao.decorators import transactional
 from app.routes.authentication.errors import TokenNotFound
 from app.models import TokenBlacklist
@@ -26,6 +27,8 @@ def store_token(decoded_token):
 
     db.session.add(db_token)
 
+    revoked_tokens.add(jti, decoded_token['exp'])
+
 
 def is_token_revoked(decoded_token):
     jti = decoded_token['jti']
@@ -36,6 +39,28 @@ def is_token_revoked(decoded_token):
         return False
 
 
+def _get_revoked_tokens():
+    tokens = TokenBlacklist.query.filter(TokenBlacklist.revoked, TokenBlacklist.expires >= datetime.now())
+    return [(token.jti, time.mktime(token.expires.timetuple())) for token in tokens]
+
+
+def check_token_revoked(decoded_token):
+    """
+    Checks the revoked tokens cache, the database is only queried when the cache is unavailable
+    """
+    jti = decoded_token['jti']
+    if revoked_tokens.is_not_revoked(jti):
+        return False
+
+    revoked = revoked_tokens.is_revoked(jti, _get_revoked_tokens)
+    if revoked is None:
+        revoked = is_token_revoked(decoded_token)
+
+    if not revoked:
+        revoked_tokens.set_not_revoked(jti)
+    return revoked
+
+
 def get_user_tokens(user_identity):
     return TokenBlacklist.query.filter_by(user_identity=user_identity).all()
 
@@ -45,13 +70,28 @@ def unrevoke_token(token_id, user):
     try:
         token = TokenBlacklist.query.filter_by(id=token_id, user_identity=user).one()
         db.session.delete(token)
+        revoked_tokens.remove(token.jti)
     except NoResultFound:
         raise TokenNotFound("Could not find the token {}".format(token_id))
 
 
 @transactional
-def prune_database():
-    now = datetime.now()
-    expired = TokenBlacklist.query.filter(TokenBlacklist.expires < now).all()
-    for token in expired:
-        db.session.delete(token)
+def _delete_expired_tokens(expired_before, batch_size):
+    expired_ids = db.session.query(TokenBlacklist.id).filter(
+        TokenBlacklist.expires < expired_before).limit(batch_size).subquery()
+
+    return TokenBlacklist.query.filter(TokenBlacklist.id.in_(expired_ids)).delete(synchronize_session=False)
+
+
+def prune_database(batch_size=1000):
+    """
+    Deletes the expired tokens a batch at a time, so that a large backlog does not hold locks for long
+    """
+    expired_before = datetime.now()
+
+    pruned = 0
+    while True:
+        deleted = _delete_expired_tokens(expired_before, batch_size)
+        pruned += deleted
+        if deleted < batch_size:
+            return pruned
@@ -1,10 +1,13 @@
 from datetime import datetime, timedelta
-from sqlalchemy import and_
+from sqlalchemy import and_, func, literal, or_, tuple_
+from sqlalchemy.dialects.postgresql import insert
 
 from app import db
 from app.dao.decorators import transactional
-from app.dao.members_dao import dao_get_member_by_id
-from app.models import Email, EmailToMember
+from app.dao.members_dao import dao_get_member_by_id, member_not_sent_email
+from app.models import (
+    Email, EmailOutbox, EmailQuota, EmailToMember, Member, APPROVED, FAILED, PENDING, SENDING, SENT
+)
 
 
 @transactional
@@ -47,11 +50,194 @@ def dao_add_member_sent_to_email(email_id, member_id, status_code=200, created_a
     email_to_member.status_code = status_code
 
 
+@transactional
+def dao_add_members_sent_to_email(email_id, status_codes, created_at=None):
+    """
+    Records the status code for each member id sent to in a single statement,
+    the queued sends for the members are marked as sent in the same transaction
+    """
+    if not status_codes:
+        return
+
+    if not created_at:
+        created_at = datetime.strftime(datetime.now(), "%Y-%m-%d")
+
+    db.session.execute(
+        insert(EmailToMember.__table__).values([
+            {'email_id': email_id, 'member_id': member_id, 'created_at': created_at, 'status_code': status_code}
+            for member_id, status_code in status_codes.items()
+        ]).on_conflict_do_nothing()
+    )
+
+    member_ids_by_status_code = {}
+    for member_id, status_code in status_codes.items():
+        member_ids_by_status_code.setdefault(status_code, []).append(member_id)
+
+    for status_code, member_ids in member_ids_by_status_code.items():
+        EmailOutbox.query.filter(
+            EmailOutbox.email_id == email_id,
+            EmailOutbox.member_id.in_(member_ids)
+        ).update({
+            'state': FAILED if status_code and status_code >= 400 else SENT,
+            'status_code': status_code
+        }, synchronize_session=False)
+
+
+@transactional
+def dao_queue_email(email, send_after):
+    """
+    Adds a pending send to the outbox for each active member that the email hasn't been sent to.
+    Returns the number of sends queued.
+    """
+    members = db.session.query(
+        literal(email.id, type_=EmailOutbox.email_id.type),
+        Member.id,
+        literal(PENDING),
+        literal(send_after, type_=EmailOutbox.send_after.type),
+        literal(email.get_expires(), type_=EmailOutbox.expires.type)
+    ).filter(
+        and_(
+            member_not_sent_email(email.id),
+            Member.active
+        )
+    )
+
+    return db.session.execute(
+        insert(EmailOutbox.__table__).from_select(
+            ['email_id', 'member_id', 'state', 'send_after', 'expires'], members.statement
+        ).on_conflict_do_nothing()
+    ).rowcount
+
+
+@transactional
+def dao_cancel_queued_email(email_id):
+    return EmailOutbox.query.filter_by(email_id=email_id, state=PENDING).delete()
+
+
+@transactional
+def dao_claim_queued_emails(batch_size, claim_timeout):
+    """
+    Claims up to batch_size sends that are due, rows locked by another worker are skipped so that
+    each send is claimed by one worker. Sends claimed by a worker that stopped before recording them
+    can be claimed again after claim_timeout seconds.
+    Returns the (email_id, member_id, email address) of each claimed send.
+    """
+    now = datetime.utcnow()
+
+    claimed = db.session.query(EmailOutbox.email_id, EmailOutbox.member_id, Member.email).join(
+        Member, Member.id == EmailOutbox.member_id
+    ).filter(
+        or_(
+            EmailOutbox.state == PENDING,
+            and_(
+                EmailOutbox.state == SENDING,
+                EmailOutbox.claimed_at < now - timedelta(seconds=claim_timeout)
+            )
+        ),
+        EmailOutbox.send_after <= now,
+        or_(EmailOutbox.expires.is_(None), EmailOutbox.expires > now)
+    ).order_by(EmailOutbox.send_after).limit(batch_size).with_for_update(of=EmailOutbox, skip_locked=True).all()
+
+    if claimed:
+        EmailOutbox.query.filter(
+            tuple_(EmailOutbox.email_id, EmailOutbox.member_id).in_(
+                [(email_id, member_id) for email_id, member_id, _ in claimed])
+        ).update({'state': SENDING, 'claimed_at': now}, synchronize_session=False)
+
+    return claimed
+
+
+@transactional
+def dao_release_queued_emails(sends, send_after=None):
+    """
+    Returns claimed (email_id, member_id) sends to the outbox, to be sent from send_after when given
+    """
+    if not sends:
+        return
+
+    values = {'state': PENDING, 'claimed_at': None}
+    if send_after:
+        values['send_after'] = send_after
+
+    EmailOutbox.query.filter(
+        tuple_(EmailOutbox.email_id, EmailOutbox.member_id).in_(sends)
+    ).update(values, synchronize_session=False)
+
+
+@transactional
+def dao_update_sent_email_totals(email_ids):
+    """
+    Records the sent and failed totals of each email, emails without any more queued sends are marked as sent
+    """
+    totals = {}
+    for email_id, state, count in db.session.query(
+        EmailOutbox.email_id, EmailOutbox.state, func.count()
+    ).filter(EmailOutbox.email_id.in_(email_ids)).group_by(EmailOutbox.email_id, EmailOutbox.state):
+        totals.setdefault(email_id, {})[state] = count
+
+    for email_id, counts in totals.items():
+        values = {'sent_count': counts.get(SENT, 0), 'failed_count': counts.get(FAILED, 0)}
+        if not counts.get(PENDING) and not counts.get(SENDING):
+            values['sent_at'] = datetime.utcnow()
+
+        Email.query.filter_by(id=email_id).update(values, synchronize_session=False)
+
+
+@transactional
+def dao_claim_email_quota(count, limit, day=None):
+    """
+    Claims up to count sends from the day's quota, the quota row is locked so that workers claim in turn.
+    Returns the number of sends claimed.
+    """
+    if not day:
+        day = datetime.utcnow().date()
+
+    db.session.execute(insert(EmailQuota.__table__).values(day=day, sent=0).on_conflict_do_nothing())
+    quota = EmailQuota.query.filter_by(day=day).with_for_update().one()
+
+    claimed = max(0, min(count, limit - quota.sent))
+    quota.sent += claimed
+
+    return claimed
+
+
+@transactional
+def dao_release_email_quota(count, day=None):
+    """
+    Returns sends that were claimed but not sent to the day's quota
+    """
+    if not day:
+        day = datetime.utcnow().date()
+
+    EmailQuota.query.filter_by(day=day).update(
+        {'sent': func.greatest(EmailQuota.sent - count, 0)}, synchronize_session=False)
+
+
 @transactional
 def dao_create_email_to_member(email_to_member):
     db.session.add(email_to_member)
 
 
+@transactional
+def dao_import_emails_to_members(emails_to_members):
+    """
+    Inserts the emails to members in a single statement, rows that already exist are skipped.
+    Returns the inserted rows.
+    """
+    if not emails_to_members:
+        return []
+
+    table = EmailToMember.__table__
+    return db.session.execute(
+        insert(table).values(emails_to_members).on_conflict_do_nothing().returning(
+            table.c.email_id, table.c.member_id, table.c.created_at)
+    ).fetchall()
+
+
+def dao_get_email_ids_by_old_ids(old_email_ids):
+    return dict(db.session.query(Email.old_id, Email.id).filter(Email.old_id.in_(old_email_ids)))
+
+
 def dao_get_emails_for_year_starting_on(date_starting=None):
     if not date_starting:
         date_starting = (datetime.today() - timedelta(weeks=52)).strftime("%Y-%m-%d")
@@ -71,6 +257,10 @@ def dao_get_email_by_id(email_id):
     return Email.query.filter_by(id=email_id).one()
 
 
+def dao_get_approved_emails():
+    return Email.query.filter(Email.email_state == APPROVED).order_by(Email.send_starts_at).all()
+
+
 def dao_get_future_emails():
     today = datetime.today().strftime("%Y-%m-%d")
     return Email.query.filter(
@@ -1,8 +1,10 @@
-from app import db
+from app import cache, db
 from app.dao.decorators import transactional
-from app.models import EventDate
+from app.dao.pagination import dao_paginate
+from app.models import EventDate, EVENT_DATES_PAGE_KEY
 
 
+@cache.invalidates('event_dates')
 @transactional
 def dao_create_event_date(event_date, speakers=None):
     if speakers:
@@ -12,12 +14,14 @@ def dao_create_event_date(event_date, speakers=None):
     db.session.add(event_date)
 
 
+@cache.invalidates('event_dates')
 @transactional
 def dao_delete_event_date(event_date_id):
     event_date = EventDate.query.filter_by(id=event_date_id).one()
     db.session.delete(event_date)
 
 
+@cache.invalidates('event_dates')
 @transactional
 def dao_update_event_date(event_date_id, **kwargs):
     return EventDate.query.filter_by(id=event_date_id).update(
@@ -29,6 +33,10 @@ def dao_get_event_dates():
     return EventDate.query.order_by(EventDate.event_datetime).all()
 
 
+def dao_get_event_dates_page(cursor=None, limit=None):
+    return dao_paginate(EventDate.query, EVENT_DATES_PAGE_KEY, EventDate.id, cursor=cursor, limit=limit)
+
+
 def dao_get_event_date_by_id(event_date_id):
     return EventDate.query.filter_by(id=event_date_id).one()
 
@@ -1,13 +1,15 @@
-from app import db
+from app import cache, db
 from app.dao.decorators import transactional
 from app.models import EventType
 
 
+@cache.invalidates('event_types')
 @transactional
 def dao_create_event_type(event_type):
     db.session.add(event_type)
 
 
+@cache.invalidates('event_types')
 @transactional
 def dao_update_event_type(event_type_id, **kwargs):
     return EventType.query.filter_by(id=event_type_id).update(
@@ -25,3 +27,7 @@ def dao_get_event_type_by_id(event_type_id):
 
 def dao_get_event_type_by_old_id(old_event_type_id):
     return EventType.query.filter_by(old_id=old_event_type_id).first()
+
+
+def dao_get_event_types_by_old_ids(old_event_type_ids):
+    return EventType.query.filter(EventType.old_id.in_(old_event_type_ids)).all()
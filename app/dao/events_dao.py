@@ -1,23 +1,49 @@
 from datetime import datetime, timedelta
 
-from sqlalchemy import and_
+from sqlalchemy import and_, func
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import joinedload, selectinload
 
-from app import db
+from app import cache, db
 from app.dao.decorators import transactional
-from app.models import Event, EventDate
+from app.dao.pagination import dao_paginate
+from app.dao.search import get_search_expressions
+from app.models import Event, EventDate, EVENTS_PAGE_KEY, NO_EVENT_DATETIME
 
+LOAD_SERIALIZE = 'serialize'
+LOAD_LAZY = 'lazy'
 
+
+def _get_load_options(load_profile):
+    if load_profile == LOAD_SERIALIZE:
+        # loads everything Event.serialize touches in a fixed number of queries
+        return [
+            joinedload(Event.event_type),
+            joinedload(Event.venue),
+            selectinload(Event.event_dates).selectinload(EventDate.speakers),
+            selectinload(Event.reject_reasons),
+        ]
+    return []
+
+
+def _event_query(load_profile):
+    return Event.query.options(*_get_load_options(load_profile))
+
+
+@cache.invalidates('events')
 @transactional
 def dao_create_event(event):
     db.session.add(event)
 
 
+@cache.invalidates('events')
 @transactional
 def dao_delete_event(event_id):
     event = Event.query.filter_by(id=event_id).one()
     db.session.delete(event)
 
 
+@cache.invalidates('events')
 @transactional
 def dao_update_event(event_id, **kwargs):
     if 'event_dates' in kwargs.keys():
@@ -38,8 +64,77 @@ def dao_update_event(event_id, **kwargs):
     return res
 
 
-def dao_get_events():
-    return Event.query.order_by(Event.id).all()
+@cache.invalidates('events', 'event_dates')
+@transactional
+def dao_import_events(events):
+    """
+    Inserts the events with their event dates and speakers in a single savepoint, if that fails
+    each event is retried in its own savepoint so that one bad row doesn't abort the rest.
+    Returns the imported events and a list of (event, error) for the events that failed.
+    """
+    try:
+        with db.session.begin_nested():
+            db.session.add_all(events)
+        return events, []
+    except SQLAlchemyError:
+        pass
+
+    imported = []
+    failed = []
+    for event in events:
+        try:
+            with db.session.begin_nested():
+                db.session.add(event)
+            imported.append(event)
+        except SQLAlchemyError as e:
+            failed.append((event, getattr(e, 'orig', e)))
+
+    return imported, failed
+
+
+def _event_date_order(latest_first=False):
+    # one value per event to order by, its first date (or last date with latest_first),
+    # events without dates sort before all others, or after with latest_first
+    aggregate = func.max if latest_first else func.min
+
+    event_date_order = db.session.query(
+        EventDate.event_id,
+        aggregate(EventDate.event_datetime).label('event_datetime')
+    ).group_by(EventDate.event_id).subquery()
+
+    return event_date_order, func.coalesce(event_date_order.c.event_datetime, NO_EVENT_DATETIME)
+
+
+def _events_by_event_date(load_profile, *criteria, **kwargs):
+    # one row per event rather than joining event_dates and returning an event per matching date
+    latest_first = kwargs.get('latest_first', False)
+    event_date_order, sort_key = _event_date_order(latest_first)
+
+    query = _event_query(load_profile).outerjoin(
+        event_date_order, Event.id == event_date_order.c.event_id)
+
+    if criteria:
+        query = query.filter(Event.event_dates.any(and_(*criteria)))
+
+    if latest_first:
+        return query.order_by(sort_key.desc(), Event.id)
+    return query.order_by(sort_key, Event.id)
+
+
+def dao_get_events(load_profile=LOAD_SERIALIZE):
+    return _events_by_event_date(load_profile).all()
+
+
+def dao_get_events_page(cursor=None, limit=None, load_profile=LOAD_SERIALIZE):
+    return dao_paginate(_event_query(load_profile), EVENTS_PAGE_KEY, Event.id, cursor=cursor, limit=limit)
+
+
+def dao_search_events(q, limit, load_profile=LOAD_SERIALIZE):
+    match, rank, snippet = get_search_expressions(Event.search_vector, Event.description, q)
+
+    return _event_query(load_profile).add_columns(rank, snippet).filter(
+        match
+    ).order_by(rank.desc(), Event.id).limit(limit).all()
 
 
 def dao_get_event_by_id(event_id):
@@ -50,31 +145,36 @@ def dao_get_event_by_old_id(old_event_id):
     return Event.query.filter(Event.old_id == old_event_id).first()
 
 
-def dao_get_events_in_year(year):
-    return Event.query.filter(
-        and_(
-            EventDate.event_datetime >= "{}-01-01".format(year),
-            EventDate.event_datetime < "{}-01-01".format(year + 1)
-        )
-    ).join(Event.event_dates).order_by(EventDate.event_datetime).all()
+def dao_get_events_by_old_ids(old_event_ids, load_profile=LOAD_SERIALIZE):
+    return _event_query(load_profile).filter(Event.old_id.in_(old_event_ids)).all()
+
+
+def dao_get_event_titles_by_old_ids(old_event_ids):
+    return dict(db.session.query(Event.old_id, Event.title).filter(Event.old_id.in_(old_event_ids)))
+
+
+def dao_get_events_in_year(year, load_profile=LOAD_SERIALIZE):
+    return _events_by_event_date(
+        load_profile,
+        EventDate.event_datetime >= "{}-01-01".format(year),
+        EventDate.event_datetime < "{}-01-01".format(year + 1)
+    ).all()
 
 
-def dao_get_limited_events(num):
-    return Event.query.join(
-        Event.event_dates).order_by(
-            EventDate.event_datetime.desc(), EventDate.event_datetime.desc()).limit(num).all()
+def dao_get_limited_events(num, load_profile=LOAD_SERIALIZE):
+    return _events_by_event_date(load_profile, latest_first=True).limit(num).all()
 
 
-def dao_get_future_events():
-    return Event.query.join(EventDate).filter(
+def dao_get_future_events(load_profile=LOAD_SERIALIZE):
+    return _events_by_event_date(
+        load_profile,
         EventDate.event_datetime >= datetime.today()
-    ).order_by(Event.id).all()
+    ).all()
 
 
-def dao_get_past_year_events():
-    return Event.query.filter(
-        and_(
-            EventDate.event_datetime < datetime.today(),
-            EventDate.event_datetime > datetime.today() - timedelta(days=365)
-        )
-    ).join(Event.event_dates).order_by(EventDate.event_datetime).all()
+def dao_get_past_year_events(load_profile=LOAD_SERIALIZE):
+    return _events_by_event_date(
+        load_profile,
+        EventDate.event_datetime < datetime.today(),
+        EventDate.event_datetime > datetime.today() - timedelta(days=365)
+    ).all()
@@ -1,13 +1,15 @@
-from app import db
+from app import cache, db
 from app.dao.decorators import transactional
 from app.models import Fee
 
 
+@cache.invalidates('fees')
 @transactional
 def dao_create_fee(fee):
     db.session.add(fee)
 
 
+@cache.invalidates('fees')
 @transactional
 def dao_update_fee(fee_id, **kwargs):
     return Fee.query.filter_by(id=fee_id).update(
@@ -0,0 +1,19 @@
+from app import db
+from app.dao.decorators import transactional
+from app.models import ImportJob
+
+
+@transactional
+def dao_create_import_job(import_job):
+    db.session.add(import_job)
+
+
+@transactional
+def dao_update_import_job(import_job_id, **kwargs):
+    return ImportJob.query.filter_by(id=import_job_id).update(
+        kwargs
+    )
+
+
+def dao_get_import_job_by_id(import_job_id):
+    return ImportJob.query.filter_by(id=import_job_id).one()
@@ -21,3 +21,7 @@ def dao_get_marketings():
 
 def dao_get_marketing_by_id(marketing_id):
     return Marketing.query.filter_by(id=marketing_id).one()
+
+
+def dao_get_marketing_ids_by_old_ids(old_marketing_ids):
+    return dict(db.session.query(Marketing.old_id, Marketing.id).filter(Marketing.old_id.in_(old_marketing_ids)))
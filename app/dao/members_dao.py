@@ -1,5 +1,6 @@
 from datetime import datetime, timedelta
-from sqlalchemy import and_
+from sqlalchemy import and_, exists
+from sqlalchemy.dialects.postgresql import insert
 
 from app import db
 from app.dao.decorators import transactional
@@ -18,16 +19,35 @@ def dao_update_member(member_id, **kwargs):
     )
 
 
+@transactional
+def dao_import_members(members):
+    """
+    Inserts the members in a single statement, members with an email that already exists are skipped.
+    Returns the inserted rows.
+    """
+    if not members:
+        return []
+
+    return db.session.execute(
+        insert(Member.__table__).values(members).on_conflict_do_nothing().returning(*Member.__table__.c)
+    ).fetchall()
+
+
 def dao_get_member_by_id(member_id):
     return Member.query.filter_by(id=member_id).one()
 
 
-def dao_get_members_not_sent_to(email_id):
-    subquery = db.session.query(EmailToMember.member_id).filter(EmailToMember.email_id == email_id)
-
-    return db.session.query(Member.id, Member.email).filter(
+def member_not_sent_email(email_id):
+    """
+    Anti join filter on email_to_member, uses the (email_id, member_id) primary key index
+    """
+    return ~exists().where(
         and_(
-            Member.id.notin_(subquery),
-            Member.active
+            EmailToMember.email_id == email_id,
+            EmailToMember.member_id == Member.id
         )
-    ).all()
+    )
+
+
+def dao_get_member_ids_by_old_ids(old_member_ids):
+    return dict(db.session.query(Member.old_id, Member.id).filter(Member.old_id.in_(old_member_ids)))
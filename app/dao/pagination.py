@@ -0,0 +1,50 @@
+import base64
+from datetime import datetime
+import json
+
+from sqlalchemy import tuple_
+
+from app.errors import InvalidRequest
+
+CURSOR_DATETIME_FORMAT = '%Y-%m-%dT%H:%M:%S.%f'
+
+
+def encode_cursor(sort_value, row_id):
+    if isinstance(sort_value, datetime):
+        sort_value = {'datetime': sort_value.strftime(CURSOR_DATETIME_FORMAT)}
+
+    return base64.urlsafe_b64encode(json.dumps([sort_value, str(row_id)]))
+
+
+def decode_cursor(cursor):
+    try:
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(str(cursor)))
+        if isinstance(sort_value, dict):
+            sort_value = datetime.strptime(sort_value['datetime'], CURSOR_DATETIME_FORMAT)
+    except (TypeError, ValueError, KeyError):
+        raise InvalidRequest('invalid cursor: {}'.format(cursor), 400)
+
+    return sort_value, row_id
+
+
+def dao_paginate(query, sort_key, id_column, cursor=None, limit=None):
+    """
+    Keyset pagination over (sort_key, id_column), sort_key must not be null so nullable columns are coalesced.
+    An index on (sort_key, id_column) lets each page be read from the index, see the page keys in app/models.py.
+    Returns the page of items and the cursor for the next page, None on the last page.
+    """
+    query = query.order_by(None).order_by(sort_key, id_column)
+
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor)
+        query = query.filter(tuple_(sort_key, id_column) > tuple_(sort_value, row_id))
+
+    rows = query.add_columns(sort_key).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_item, last_sort_value = rows[-1]
+        next_cursor = encode_cursor(last_sort_value, last_item.id)
+
+    return [item for item, _ in rows], next_cursor
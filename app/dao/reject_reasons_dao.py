@@ -1,13 +1,15 @@
-from app import db
+from app import cache, db
 from app.dao.decorators import transactional
 from app.models import RejectReason
 
 
+@cache.invalidates('reject_reasons')
 @transactional
 def dao_create_reject_reason(reject_reason):
     db.session.add(reject_reason)
 
 
+@cache.invalidates('reject_reasons')
 @transactional
 def dao_update_reject_reason(reject_reason_id, **kwargs):
     return RejectReason.query.filter_by(id=reject_reason_id).update(
@@ -0,0 +1,23 @@
+from sqlalchemy import func
+
+SEARCH_CONFIG = 'english'
+HEADLINE_OPTIONS = 'StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MaxWords=30, MinWords=10'
+
+
+def get_search_expressions(search_vector, text_column, q):
+    """
+    Returns the match filter, rank and highlighted snippet for a full text search of q,
+    html tags are removed from the text before highlighting
+    """
+    tsquery = func.plainto_tsquery(SEARCH_CONFIG, q)
+
+    match = search_vector.op('@@')(tsquery)
+    rank = func.ts_rank(search_vector, tsquery).label('rank')
+    snippet = func.ts_headline(
+        SEARCH_CONFIG,
+        func.regexp_replace(func.coalesce(text_column, ''), '<[^>]*>', '', 'g'),
+        tsquery,
+        HEADLINE_OPTIONS
+    ).label('snippet')
+
+    return match, rank, snippet
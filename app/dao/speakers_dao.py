@@ -1,13 +1,16 @@
-from app import db
+from app import cache, db
 from app.dao.decorators import transactional
-from app.models import Speaker
+from app.dao.pagination import dao_paginate
+from app.models import Speaker, SPEAKERS_PAGE_KEY
 
 
+@cache.invalidates('speakers')
 @transactional
 def dao_create_speaker(speaker):
     db.session.add(speaker)
 
 
+@cache.invalidates('speakers')
 @transactional
 def dao_update_speaker(speaker_id, **kwargs):
     return Speaker.query.filter_by(id=speaker_id).update(
@@ -22,9 +25,17 @@ def dao_get_speakers():
     return speakers
 
 
+def dao_get_speakers_page(cursor=None, limit=None):
+    return dao_paginate(Speaker.query, SPEAKERS_PAGE_KEY, Speaker.id, cursor=cursor, limit=limit)
+
+
 def dao_get_speaker_by_id(speaker_id):
     return Speaker.query.filter_by(id=speaker_id).one()
 
 
 def dao_get_speaker_by_name(name):
     return Speaker.query.filter_by(name=name).first()
+
+
+def dao_get_speakers_by_names(names):
+    return Speaker.query.filter(Speaker.name.in_(names)).all()
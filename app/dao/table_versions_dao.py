@@ -0,0 +1,19 @@
+from sqlalchemy import func
+
+from app import db
+
+
+def dao_get_table_versions(*models):
+    """
+    Returns the row count and latest updated_at for each model's table in one query,
+    the count changes on delete, updated_at on create or update.
+    Link tables have no version, a trigger sets event_dates.updated_at when an event date's speakers change
+    """
+    columns = []
+    for model in models:
+        columns.append(db.session.query(func.count(model.id)).as_scalar())
+        columns.append(db.session.query(func.max(model.updated_at)).as_scalar())
+
+    row = db.session.query(*columns).one()
+
+    return [(row[i], row[i + 1]) for i in range(0, len(row), 2)]
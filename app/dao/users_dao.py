@@ -1,6 +1,7 @@
 from app import db
 from app.dao.decorators import transactional
-from app.models import User
+from app.dao.pagination import dao_paginate
+from app.models import User, USERS_PAGE_KEY
 
 
 @transactional
@@ -22,6 +23,10 @@ def dao_get_users():
     return users
 
 
+def dao_get_users_page(cursor=None, limit=None):
+    return dao_paginate(User.query, USERS_PAGE_KEY, User.id, cursor=cursor, limit=limit)
+
+
 def dao_get_user_by_id(user_id):
     return User.query.filter_by(id=user_id).one()
 
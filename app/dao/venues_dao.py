@@ -1,8 +1,10 @@
-from app import db
+from app import cache, db
 from app.dao.decorators import transactional
-from app.models import Venue
+from app.dao.pagination import dao_paginate
+from app.models import Venue, VENUES_PAGE_KEY
 
 
+@cache.invalidates('venues')
 @transactional
 def dao_create_venue(venue):
     default = dao_get_default_venue()
@@ -14,6 +16,7 @@ def dao_create_venue(venue):
     db.session.add(venue)
 
 
+@cache.invalidates('venues')
 @transactional
 def dao_update_venue(venue_id, **kwargs):
     if 'default' in kwargs and kwargs['default'] is True:
@@ -33,6 +36,10 @@ def dao_get_venues():
     return Venue.query.order_by(Venue.name).all()
 
 
+def dao_get_venues_page(cursor=None, limit=None):
+    return dao_paginate(Venue.query, VENUES_PAGE_KEY, Venue.id, cursor=cursor, limit=limit)
+
+
 def dao_get_venue_by_id(venue_id):
     return Venue.query.filter_by(id=venue_id).one()
 
@@ -41,5 +48,9 @@ def dao_get_venue_by_old_id(venue_id):
     return Venue.query.filter_by(old_id=venue_id).first()
 
 
+def dao_get_venues_by_old_ids(venue_ids):
+    return Venue.query.filter(Venue.old_id.in_(venue_ids)).all()
+
+
 def dao_get_default_venue():
     return Venue.query.filter_by(default=True).first()
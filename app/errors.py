@@ -38,6 +38,13 @@ class PaypalException(Exception):
     pass
 
 
+class CircuitOpenError(Exception):
+
+    def __init__(self, name):
+        super(CircuitOpenError, self).__init__('{} is unavailable'.format(name))
+        self.name = name
+
+
 def register_errors(blueprint):
 
     @blueprint.errorhandler(ValidationError)
@@ -116,6 +123,11 @@ def register_errors(blueprint):
         error_message = "Forbidden, invalid authentication token provided"
         return jsonify(result='error', message=error_message), 403
 
+    @blueprint.errorhandler(CircuitOpenError)
+    def circuit_open(e):
+        current_app.logger.error(e)
+        return jsonify(result='error', message=str(e)), 503
+
     @blueprint.errorhandler(NoResultFound)
     @blueprint.errorhandler(DataError)
     def no_result_found(e):
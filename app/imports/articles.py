@@ -0,0 +1,32 @@
+from flask import current_app
+
+from app.dao.articles_dao import dao_create_article
+from app.models import Article
+
+
+def import_articles(data):
+    """
+    Returns the imported articles and the errors for each row that couldn't be imported
+    """
+    articles = []
+    errors = []
+    for item in data:
+        err = ''
+        article = Article.query.filter(Article.old_id == item['id']).first()
+        if not article:
+            article = Article(
+                old_id=item['id'],
+                title=item['title'],
+                author=item['author'],
+                content=item['content'],
+                created_at=item['entrydate'] if item['entrydate'] != '0000-00-00' else None
+            )
+
+            articles.append(article)
+            dao_create_article(article)
+        else:
+            err = u'article already exists: {} - {}'.format(article.old_id, article.title)
+            current_app.logger.info(err)
+            errors.append(err)
+
+    return articles, errors
@@ -0,0 +1,119 @@
+from datetime import datetime, timedelta
+
+from flask import current_app
+
+from app.dao.emails_dao import dao_create_email, dao_get_email_ids_by_old_ids, dao_import_emails_to_members
+from app.dao.events_dao import dao_get_event_by_old_id
+from app.dao.members_dao import dao_get_member_ids_by_old_ids
+from app.imports.utils import batches
+from app.models import Email, EmailToMember, ANNOUNCEMENT, EVENT, MAGAZINE
+
+
+def import_emails(data):
+    """
+    Returns the imported emails and the errors for each row that couldn't be imported
+    """
+    errors = []
+    emails = []
+    for item in data:
+        err = ''
+        email = Email.query.filter(Email.old_id == item['id']).first()
+        if not email:
+            event_id = None
+            email_type = EVENT
+            if int(item['eventid']) < 0:
+                if item['eventdetails'].startswith('New Acropolis'):
+                    email_type = MAGAZINE
+                else:
+                    email_type = ANNOUNCEMENT
+
+            expires = None
+            if email_type == EVENT:
+                event = dao_get_event_by_old_id(item['eventid'])
+
+                if not event:
+                    err = u'event not found: {}'.format(item)
+                    current_app.logger.info(err)
+                    errors.append(err)
+                    continue
+                event_id = str(event.id)
+                expires = event.get_last_event_date()
+            else:
+                # default to 2 weeks expiry after email was created
+                expires = datetime.strptime(item['timestamp'], "%Y-%m-%d %H:%M") + timedelta(weeks=2)
+
+            email = Email(
+                event_id=event_id,
+                old_id=item['id'],
+                old_event_id=item['eventid'],
+                details=item['eventdetails'],
+                extra_txt=item['extratxt'],
+                replace_all=True if item['replaceAll'] == 'y' else False,
+                email_type=email_type,
+                created_at=item['timestamp'],
+                send_starts_at=item['timestamp'],
+                expires=expires
+            )
+
+            dao_create_email(email)
+            emails.append(email)
+        else:
+            err = u'email already exists: {}'.format(email.old_id)
+            current_app.logger.info(err)
+            errors.append(err)
+
+    return emails, errors
+
+
+def import_emails_to_members(data, first_row=0):
+    """
+    Emails and members are resolved with one query each and the emails to members are inserted
+    a batch at a time. Returns the imported emails to members and the errors for each row that
+    couldn't be imported, in row order, rows are numbered from first_row
+    """
+    errors = []
+    email_ids = dao_get_email_ids_by_old_ids(set(int(item['emailid']) for item in data))
+    member_ids = dao_get_member_ids_by_old_ids(set(int(item['mailinglistid']) for item in data))
+
+    def add_error(i, error):
+        current_app.logger.error(error)
+        errors.append((i, error))
+
+    def already_exists(i, row):
+        add_error(i, '{}: Already exists email_to_member {}, {}'.format(
+            i, str(row['email_id']), str(row['member_id'])))
+
+    rows = []
+    seen = set()
+    for i, item in enumerate(data, first_row):
+        email_id = email_ids.get(int(item['emailid']))
+        member_id = member_ids.get(int(item['mailinglistid']))
+
+        if not email_id:
+            add_error(i, '{}: Email not found: {}'.format(i, item['emailid']))
+
+        if not member_id:
+            add_error(i, '{}: Member not found: {}'.format(i, item['mailinglistid']))
+
+        if email_id and member_id:
+            row = {'email_id': email_id, 'member_id': member_id, 'created_at': item['timestamp']}
+            if (email_id, member_id) in seen:
+                already_exists(i, row)
+                continue
+
+            seen.add((email_id, member_id))
+            rows.append((i, row))
+
+    emails_to_members = []
+    for batch in batches(rows, current_app.config['IMPORT_BATCH_SIZE']):
+        imported = [EmailToMember(**dict(row)) for row in dao_import_emails_to_members([row for _, row in batch])]
+        imported_keys = set((e.email_id, e.member_id) for e in imported)
+
+        for i, row in batch:
+            if (row['email_id'], row['member_id']) not in imported_keys:
+                already_exists(i, row)
+
+        emails_to_members.extend(imported)
+        current_app.logger.info('Imported %d emails to members', len(imported))
+
+    return emails_to_members, [error for _, error in sorted(errors, key=lambda e: e[0])]
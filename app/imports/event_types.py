@@ -0,0 +1,30 @@
+from flask import current_app
+
+from app.dao.event_types_dao import dao_create_event_type
+from app.models import EventType
+
+
+def import_event_types(data):
+    """
+    Returns the imported event types and the errors for each row that couldn't be imported
+    """
+    event_types = []
+    errors = []
+    for item in data:
+        event_type = EventType.query.filter(EventType.old_id == item['id']).first()
+        if not event_type:
+            event_type = EventType(
+                old_id=item['id'],
+                event_type=item['EventType'],
+                event_desc=item['EventDesc'],
+                event_filename=item['EventFilename'],
+            )
+
+            event_types.append(event_type)
+            dao_create_event_type(event_type)
+        else:
+            err = 'event type already exists: {}'.format(event_type.event_type)
+            current_app.logger.info(err)
+            errors.append(err)
+
+    return event_types, errors
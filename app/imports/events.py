@@ -0,0 +1,174 @@
+import os.path
+import re
+
+from flask import current_app
+
+from app.dao.event_types_dao import dao_get_event_types_by_old_ids
+from app.dao.events_dao import dao_get_event_titles_by_old_ids, dao_get_events_by_old_ids, dao_import_events
+from app.dao.speakers_dao import dao_get_speakers_by_names
+from app.dao.venues_dao import dao_get_venues_by_old_ids
+from app.models import Event, EventDate, APPROVED
+from app.storage.utils import Storage
+
+NO_START_DATE = '0000-00-00 00:00:00'
+NO_IMAGE_FILENAME = '../spacer.gif'
+
+
+def _split_speakers(speakers):
+    return re.split(r' and | & ', speakers) if speakers else []
+
+
+def _by_key(items, key):
+    lookup = {}
+    for item in items:
+        # keep the first match, as the single row lookups did
+        lookup.setdefault(getattr(item, key), item)
+    return lookup
+
+
+def _add_error(errors, err):
+    current_app.logger.info(err)
+    errors.append(err)
+
+
+class EventsImport(object):
+    """
+    Imports events from the old site, the event types, venues, speakers and existing events
+    are loaded up front so that each row is checked without querying the database.
+    """
+
+    def __init__(self, data):
+        self.data = data
+        self.errors = []
+        self.existing_events = dao_get_event_titles_by_old_ids(set(int(item['id']) for item in data))
+        self.event_types = _by_key(
+            dao_get_event_types_by_old_ids(set(int(item['Type']) for item in data)), 'old_id')
+        self.venues = _by_key(
+            dao_get_venues_by_old_ids(set(int(item['venue']) for item in data)), 'old_id')
+        self.speakers = _by_key(
+            dao_get_speakers_by_names(set(s for item in data for s in _split_speakers(item['Speaker']))), 'name')
+        self.imported_old_ids = []
+        self.storage = None
+
+    def create_event(self, item):
+        err = ''
+        speakers = []
+
+        event_type = self.event_types.get(int(item['Type']))
+        if not event_type:
+            err = '{} event type not found: {}'.format(item['id'], item['Type'])
+            _add_error(self.errors, err)
+
+        for s in _split_speakers(item['Speaker']):
+            speaker = self.speakers.get(s)
+            if not speaker:
+                err = '{} speaker not found: {}'.format(item['id'], item['Speaker'])
+                _add_error(self.errors, err)
+            else:
+                speakers.append(speaker)
+
+        venue = self.venues.get(int(item['venue']))
+        if not venue:
+            err = '{} venue not found: {}'.format(item['id'], item['venue'])
+            _add_error(self.errors, err)
+
+        if err:
+            return
+
+        event = Event(
+            old_id=item['id'],
+            event_type_id=event_type.id,
+            title=item['Title'],
+            sub_title=item['SubTitle'],
+            description=item['Description'],
+            booking_code=item['BookingCode'],
+            image_filename=item['ImageFilename'],
+            fee=item['Fee'],
+            conc_fee=item['ConcFee'],
+            multi_day_fee=item['MultiDayFee'],
+            multi_day_conc_fee=item['MultiDayConcFee'],
+            duration=item['Duration'],
+            venue_id=venue.id,
+            event_state=APPROVED
+        )
+
+        start_dates = [item['StartDate']] + [
+            item['StartDate{}'.format(i)] for i in range(2, 5) if item['StartDate{}'.format(i)] > NO_START_DATE
+        ]
+        for event_datetime in start_dates:
+            event.event_dates.append(
+                EventDate(
+                    event_datetime=event_datetime,
+                    duration=item['Duration'],
+                    fee=item['Fee'],
+                    conc_fee=item['ConcFee'],
+                    multi_day_fee=item['MultiDayFee'],
+                    multi_day_conc_fee=item['MultiDayConcFee'],
+                    venue_id=venue.id,
+                    speakers=list(speakers)
+                )
+            )
+
+        return event
+
+    def upload_image(self, item):
+        image_filename = item['ImageFilename']
+        if not image_filename or image_filename == NO_IMAGE_FILENAME:
+            return
+
+        if not self.storage:
+            self.storage = Storage(current_app.config['STORAGE'])
+            self.storage.warm_index()
+
+        if not self.storage.blob_exists(image_filename):
+            fname = "./data/events/{}".format(image_filename)
+            if os.path.isfile(fname):
+                self.storage.upload_blob(fname, image_filename)
+            else:
+                _add_error(self.errors, '{} not found for {}'.format(fname, item['id']))
+        else:
+            current_app.logger.info('{} found'.format(image_filename))
+
+    def run(self, upload_images=False):
+        events = []
+        for item in self.data:
+            old_id = int(item['id'])
+            if old_id in self.existing_events:
+                _add_error(
+                    self.errors, u'event already exists: {} - {}'.format(old_id, self.existing_events[old_id]))
+            else:
+                event = self.create_event(item)
+                if not event:
+                    continue
+
+                events.append(event)
+                self.imported_old_ids.append(old_id)
+                self.existing_events[old_id] = event.title
+
+            if upload_images:
+                self.upload_image(item)
+
+        events, failed = dao_import_events(events)
+        for event, error in failed:
+            _add_error(self.errors, u'{} failed to import: {}'.format(event.old_id, error))
+
+        if events:
+            # reloads the committed events with everything serialize needs, the failed events
+            # are transient so their attributes are still available
+            failed_old_ids = set(int(event.old_id) for event, _ in failed)
+            dao_get_events_by_old_ids(
+                [old_id for old_id in self.imported_old_ids if old_id not in failed_old_ids])
+            for event in events:
+                current_app.logger.info(u'added event {} - {}'.format(event.old_id, event.title))
+
+        return events
+
+
+def import_events(data, upload_images=False):
+    """
+    Returns the imported events and the errors for each row that couldn't be imported
+    """
+    events_import = EventsImport(data)
+    events = events_import.run(upload_images=upload_images)
+
+    return events, events_import.errors
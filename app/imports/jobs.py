@@ -0,0 +1,81 @@
+from flask import current_app
+
+from app import db
+from app.dao.import_jobs_dao import dao_get_import_job_by_id, dao_update_import_job
+from app.imports.articles import import_articles
+from app.imports.emails import import_emails, import_emails_to_members
+from app.imports.event_types import import_event_types
+from app.imports.events import import_events
+from app.imports.marketings import import_marketings
+from app.imports.members import import_members
+from app.imports.speakers import import_speakers
+from app.imports.venues import import_venues
+from app.models import COMPLETED, FAILED, RUNNING
+
+ARTICLES_IMPORT = 'articles'
+EMAILS_IMPORT = 'emails'
+EMAILS_MEMBERS_IMPORT = 'emails_members'
+EVENT_TYPES_IMPORT = 'event_types'
+EVENTS_IMPORT = 'events'
+MARKETINGS_IMPORT = 'marketings'
+MEMBERS_IMPORT = 'members'
+SPEAKERS_IMPORT = 'speakers'
+VENUES_IMPORT = 'venues'
+
+IMPORTERS = {
+    ARTICLES_IMPORT: import_articles,
+    EMAILS_IMPORT: import_emails,
+    EMAILS_MEMBERS_IMPORT: import_emails_to_members,
+    EVENT_TYPES_IMPORT: import_event_types,
+    EVENTS_IMPORT: import_events,
+    MARKETINGS_IMPORT: import_marketings,
+    MEMBERS_IMPORT: import_members,
+    SPEAKERS_IMPORT: import_speakers,
+    VENUES_IMPORT: import_venues,
+}
+
+# these importers number their errors by row, so are given where each batch starts in the payload
+ROW_NUMBERED_IMPORTS = [EMAILS_MEMBERS_IMPORT]
+
+
+def import_batch(import_type, batch, first_row=0, **options):
+    importer = IMPORTERS[import_type]
+    if import_type in ROW_NUMBERED_IMPORTS:
+        return importer(batch, first_row=first_row, **options)
+    return importer(batch, **options)
+
+
+def run_import_job(import_job_id, **options):
+    """
+    Runs the import a batch at a time, recording the progress on the import job after each batch
+    """
+    import_job = dao_get_import_job_by_id(import_job_id)
+    import_type = import_job.import_type
+    data = import_job.data
+    batch_size = current_app.config['IMPORT_BATCH_SIZE']
+
+    dao_update_import_job(import_job_id, state=RUNNING)
+
+    rows_processed = 0
+    rows_created = 0
+    errors = []
+    try:
+        for first_row in range(0, len(data), batch_size):
+            batch = data[first_row:first_row + batch_size]
+            created, batch_errors = import_batch(import_type, batch, first_row, **options)
+
+            rows_processed += len(batch)
+            rows_created += len(created)
+            errors.extend(batch_errors)
+
+            dao_update_import_job(
+                import_job_id, rows_processed=rows_processed, rows_created=rows_created, errors=errors)
+            current_app.logger.info(
+                'Import job %s: %s processed %d of %d rows', import_job_id, import_type, rows_processed, len(data))
+    except Exception as e:
+        current_app.logger.exception('Import job %s: %s failed', import_job_id, import_type)
+        db.session.rollback()
+        dao_update_import_job(import_job_id, state=FAILED, errors=errors + [u'import failed: {}'.format(e)])
+        return
+
+    dao_update_import_job(import_job_id, state=COMPLETED)
@@ -0,0 +1,32 @@
+from flask import current_app
+
+from app.dao.marketings_dao import dao_create_marketing
+from app.models import Marketing
+
+
+def import_marketings(data):
+    """
+    Returns the imported marketings and the errors for each row that couldn't be imported
+    """
+    errors = []
+    marketings = []
+    for item in data:
+        err = ''
+        marketing = Marketing.query.filter(Marketing.old_id == item['id']).first()
+
+        if marketing:
+            err = u'marketing already exists: {}'.format(marketing.old_id)
+            current_app.logger.info(err)
+            errors.append(err)
+        else:
+            marketing = Marketing(
+                old_id=item['id'],
+                description=item['marketingtxt'],
+                order_number=item['ordernum'],
+                active=item["visible"] == "1"
+            )
+
+            dao_create_marketing(marketing)
+            marketings.append(marketing)
+
+    return marketings, errors
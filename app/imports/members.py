@@ -0,0 +1,76 @@
+import uuid
+
+from flask import current_app
+
+from app.dao.marketings_dao import dao_get_marketing_ids_by_old_ids
+from app.dao.members_dao import dao_get_member_ids_by_old_ids, dao_import_members
+from app.imports.utils import batches
+from app.models import Member
+
+
+def clean_member(item):
+    """
+    Nulls the placeholder values in the old site's export, as the members import route does on the request text
+    """
+    if item.get('EmailAdd') in ['anon', '']:
+        item['EmailAdd'] = None
+    if item.get('CreationDate') == '0000-00-00':
+        item['CreationDate'] = None
+    return item
+
+
+def import_members(data):
+    """
+    Existing members and marketings are resolved with one query each and the new members are
+    inserted a batch at a time. Returns the imported members and the errors for each row that
+    couldn't be imported
+    """
+    errors = []
+    old_ids = set(dao_get_member_ids_by_old_ids(set(int(item['id']) for item in data)))
+    marketing_ids = dao_get_marketing_ids_by_old_ids(set(int(item['Marketing']) for item in data))
+
+    rows = []
+    for item in data:
+        old_id = int(item['id'])
+        if old_id in old_ids:
+            err = u'member already exists: {}'.format(old_id)
+            current_app.logger.info(err)
+            errors.append(err)
+            continue
+
+        marketing_id = marketing_ids.get(int(item['Marketing']))
+        if not marketing_id:
+            err = "Cannot find marketing: {}".format(item['Marketing'])
+            current_app.logger.error(err)
+            errors.append(err)
+            continue
+
+        old_ids.add(old_id)
+        rows.append({
+            'id': uuid.uuid4(),
+            'old_id': old_id,
+            'name': item['Name'],
+            'email': item['EmailAdd'],
+            'active': item["Active"] == "y",
+            'created_at': item["CreationDate"],
+            'marketing_id': marketing_id,
+            'old_marketing_id': item["Marketing"],
+            'is_course_member': item["IsMember"] == "y",
+            'last_updated': item["LastUpdated"]
+        })
+
+    members = []
+    for batch in batches(rows, current_app.config['IMPORT_BATCH_SIZE']):
+        imported = [Member(**dict(row)) for row in dao_import_members(batch)]
+        imported_ids = set(m.id for m in imported)
+
+        for row in batch:
+            if row['id'] not in imported_ids:
+                err = u'member email already exists: {}, {}'.format(row['old_id'], row['email'])
+                current_app.logger.error(err)
+                errors.append(err)
+
+        members.extend(imported)
+        current_app.logger.info('Imported %d members', len(imported))
+
+    return members, errors
@@ -0,0 +1,41 @@
+from flask import current_app
+
+from app.dao.speakers_dao import dao_create_speaker
+from app.models import Speaker
+
+
+def import_speakers(data):
+    """
+    Returns the imported speakers and the errors for each row that couldn't be imported
+    """
+    errors = []
+    speakers = []
+    for item in data:
+        err = ''
+        if item.get('parent_name'):
+            parent_speaker = Speaker.query.filter(Speaker.name == item['parent_name']).first()
+            if parent_speaker:
+                if parent_speaker.parent_id:
+                    err = 'Parent speaker can`t have a parent'
+                    current_app.logger.error(err)
+                    errors.append(err)
+                else:
+                    item['parent_id'] = str(parent_speaker.id)
+            else:
+                err = 'Can`t find speaker: {}'.format(item['parent_name'])
+                current_app.logger.error(err)
+                errors.append(err)
+            del item['parent_name']
+
+        if not err:
+            speaker = Speaker.query.filter(Speaker.name == item['name']).first()
+            if not speaker:
+                speaker = Speaker(**item)
+                speakers.append(speaker)
+                dao_create_speaker(speaker)
+            else:
+                err = u'speaker already exists: {}'.format(speaker.name)
+                current_app.logger.error(err)
+                errors.append(err)
+
+    return speakers, errors
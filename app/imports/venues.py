@@ -0,0 +1,32 @@
+from flask import current_app
+
+from app.dao.venues_dao import dao_create_venue
+from app.models import Venue
+
+
+def import_venues(data):
+    """
+    Returns the imported venues and the errors for each row that couldn't be imported
+    """
+    venues = []
+    errors = []
+    for item in data:
+        if not item["name"]:
+            item["name"] = "Head branch"
+
+        venue = Venue.query.filter(Venue.old_id == item['id']).first()
+        if not venue:
+            venue = Venue(
+                old_id=item['id'],
+                name=item['name'],
+                address=item['address'],
+                directions="<div>Bus: {bus}</div><div>Train: {train}</div>".format(bus=item['bus'], train=item['tube'])
+            )
+            venues.append(venue)
+            dao_create_venue(venue)
+        else:
+            err = 'venue already exists: {}'.format(venue.name)
+            current_app.logger.info(err)
+            errors.append(err)
+
+    return venues, errors
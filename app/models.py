@@ -2,7 +2,7 @@ import datetime
 import uuid
 import re
 
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import JSON, TSVECTOR, UUID
 from sqlalchemy import PrimaryKeyConstraint, UniqueConstraint
 from sqlalchemy.ext.hybrid import hybrid_property
 
@@ -29,16 +29,39 @@ EMAIL_STATES = EVENT_STATES = [
     DRAFT, READY, APPROVED, REJECTED
 ]
 
+PENDING = 'pending'
+RUNNING = 'running'
+COMPLETED = 'completed'
+FAILED = 'failed'
+
+IMPORT_JOB_STATES = [PENDING, RUNNING, COMPLETED, FAILED]
+
+SENDING = 'sending'
+SENT = 'sent'
+
+EMAIL_OUTBOX_STATES = [PENDING, SENDING, SENT, FAILED]
+
+# events and event dates without a date sort before all others
+NO_EVENT_DATETIME = datetime.datetime(1900, 1, 1)
+
 
 class Article(db.Model):
     __tablename__ = 'articles'
+    __table_args__ = (
+        db.Index('ix_articles_search_vector', 'search_vector', postgresql_using='gin'),
+    )
 
     id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     old_id = db.Column(db.Integer)
     title = db.Column(db.String(255))
     author = db.Column(db.String(255))
     content = db.Column(db.Text())
+    short_content = db.Column(db.Text())
+    very_short_content = db.Column(db.Text())
     created_at = db.Column(db.DateTime, default=datetime.datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+    # maintained by a database trigger on insert and update
+    search_vector = db.deferred(db.Column(TSVECTOR))
 
     def serialize(self):
         return {
@@ -50,10 +73,11 @@ class Article(db.Model):
             'created_at': self.created_at.strftime('%Y-%m-%d') if self.created_at else None,
         }
 
-    def serialize_summary(self):
+    @staticmethod
+    def get_summary_content(content):
         def get_short_content(num_words):
             html_tag_pattern = r'<.*?>'
-            clean_content = re.sub(html_tag_pattern, '', self.content)
+            clean_content = re.sub(html_tag_pattern, '', content or '')
 
             content_arr = clean_content.split(' ')
             if len(content_arr) > num_words:
@@ -62,15 +86,49 @@ class Article(db.Model):
             else:
                 return clean_content
 
+        return {
+            'short_content': get_short_content(num_words=110),
+            'very_short_content': get_short_content(num_words=30),
+        }
+
+    def set_summary_content(self):
+        for k, v in self.get_summary_content(self.content).items():
+            setattr(self, k, v)
+
+    def serialize_summary(self):
+        if self.short_content is None:
+            self.set_summary_content()
+
         return {
             'id': str(self.id),
             'title': self.title,
             'author': self.author,
-            'short_content': get_short_content(num_words=110),
-            'very_short_content': get_short_content(num_words=30),
+            'short_content': self.short_content,
+            'very_short_content': self.very_short_content,
         }
 
 
+class EmailOutbox(db.Model):
+    __tablename__ = 'email_outbox'
+    __table_args__ = (
+        PrimaryKeyConstraint('email_id', 'member_id'),
+        db.Index('ix_email_outbox_state_send_after', 'state', 'send_after'),
+    )
+    email_id = db.Column(UUID(as_uuid=True), db.ForeignKey('emails.id'))
+    member_id = db.Column(UUID(as_uuid=True), db.ForeignKey('members.id'))
+    state = db.Column(db.String(20), nullable=False, default=PENDING)
+    send_after = db.Column(db.DateTime, nullable=False)
+    expires = db.Column(db.DateTime)
+    claimed_at = db.Column(db.DateTime)
+    status_code = db.Column(db.Integer)
+
+
+class EmailQuota(db.Model):
+    __tablename__ = 'email_quotas'
+    day = db.Column(db.Date, primary_key=True)
+    sent = db.Column(db.Integer, nullable=False, default=0)
+
+
 class EmailToMember(db.Model):
     __tablename__ = 'email_to_member'
     __table_args__ = (
@@ -115,18 +173,21 @@ class Email(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.datetime.utcnow)
     send_starts_at = db.Column(db.DateTime, default=datetime.datetime.utcnow)
     expires = db.Column(db.DateTime)
-    task_id = db.Column(db.String)
+    sent_at = db.Column(db.DateTime)
+    sent_count = db.Column(db.Integer)
+    failed_count = db.Column(db.Integer)
     members_sent_to = db.relationship(
         'Member',
         secondary='email_to_member',
         backref=db.backref('email_to_member', lazy='dynamic'),
     )
 
-    def get_subject(self):
+    def get_subject(self, event=None):
         if self.email_type == EVENT:
-            from app.dao.events_dao import dao_get_event_by_id
+            if not event:
+                from app.dao.events_dao import dao_get_event_by_id
 
-            event = dao_get_event_by_id(str(self.event_id))
+                event = dao_get_event_by_id(str(self.event_id))
             return "{}: {}".format(event.event_type.event_type, event.title)
         return 'No email type'
 
@@ -137,6 +198,16 @@ class Email(db.Model):
             event = dao_get_event_by_id(str(self.event_id))
             return "{}".format(event.get_last_event_date())
 
+    def get_expires(self):
+        if self.expires:
+            return self.expires
+
+        try:
+            # event emails are no longer sent after the last event date
+            return datetime.datetime.strptime(self.get_expired_date(), '%Y-%m-%d') + datetime.timedelta(days=1)
+        except (TypeError, ValueError):
+            return None
+
     def serialize(self):
         return {
             'id': str(self.id),
@@ -152,7 +223,9 @@ class Email(db.Model):
             'created_at': self.created_at.strftime('%Y-%m-%d %H:%M'),
             'send_starts_at': self.send_starts_at.strftime('%Y-%m-%d'),
             'expires': self.expires.strftime('%Y-%m-%d') if self.expires else self.get_expired_date(),
-            'task_id': self.task_id
+            'sent_at': self.sent_at.strftime('%Y-%m-%d %H:%M') if self.sent_at else None,
+            'sent_count': self.sent_count,
+            'failed_count': self.failed_count
         }
 
 
@@ -217,6 +290,9 @@ class EmailType(db.Model):
 
 class Event(db.Model):
     __tablename__ = 'events'
+    __table_args__ = (
+        db.Index('ix_events_search_vector', 'search_vector', postgresql_using='gin'),
+    )
     id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     old_id = db.Column(db.Integer)
     duration = db.Column(db.Integer, nullable=True)
@@ -232,6 +308,7 @@ class Event(db.Model):
     multi_day_fee = db.Column(db.Integer, nullable=True)
     multi_day_conc_fee = db.Column(db.Integer, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
     event_dates = db.relationship("EventDate", backref=db.backref("events"), cascade="all,delete,delete-orphan")
     event_state = db.Column(
         db.String(255),
@@ -244,6 +321,10 @@ class Event(db.Model):
     reject_reasons = db.relationship("RejectReason", backref=db.backref("event", uselist=True))
     venue_id = db.Column(UUID(as_uuid=True), db.ForeignKey('venues.id'))
     venue = db.relationship("Venue", backref=db.backref("event", uselist=False))
+    # maintained by a database trigger on insert and update
+    search_vector = db.deferred(db.Column(TSVECTOR))
+    # the event's first date, maintained by a database trigger on event_dates
+    first_event_datetime = db.deferred(db.Column(db.DateTime))
 
     def serialize_event_dates(self):
         def serialize_speakers(speakers):
@@ -322,6 +403,7 @@ class EventDate(db.Model):
     id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     event_id = db.Column(UUID(as_uuid=True), db.ForeignKey('events.id'), nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
     event_datetime = db.Column(db.DateTime, default=datetime.datetime.utcnow)
     end_time = db.Column(db.Time, nullable=True)
     duration = db.Column(db.Integer, nullable=True)
@@ -368,6 +450,7 @@ class EventType(db.Model):
     repeat = db.Column(db.Integer)
     repeat_interval = db.Column(db.Integer)
     created_at = db.Column(db.DateTime, default=datetime.datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
 
     def serialize(self):
         def fees():
@@ -420,6 +503,34 @@ class Fee(db.Model):
         }
 
 
+class ImportJob(db.Model):
+    __tablename__ = 'import_jobs'
+    id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    import_type = db.Column(db.String(50), nullable=False)
+    state = db.Column(db.String(20), default=PENDING, nullable=False)
+    # the submitted payload, only needed by the import task
+    data = db.deferred(db.Column(JSON, nullable=False))
+    rows_total = db.Column(db.Integer, default=0)
+    rows_processed = db.Column(db.Integer, default=0)
+    rows_created = db.Column(db.Integer, default=0)
+    errors = db.Column(JSON)
+    created_at = db.Column(db.DateTime, default=datetime.datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+
+    def serialize(self):
+        return {
+            'id': str(self.id),
+            'import_type': self.import_type,
+            'state': self.state,
+            'rows_total': self.rows_total,
+            'rows_processed': self.rows_processed,
+            'rows_created': self.rows_created,
+            'errors': self.errors or [],
+            'created_at': self.created_at.strftime('%Y-%m-%d %H:%M:%S'),
+            'updated_at': self.updated_at.strftime('%Y-%m-%d %H:%M:%S'),
+        }
+
+
 class RejectReason(db.Model):
     __tablename__ = 'reject_reasons'
 
@@ -429,6 +540,7 @@ class RejectReason(db.Model):
     resolved = db.Column(db.Boolean, default=False)
     created_by = db.Column(UUID(as_uuid=True), db.ForeignKey('users.id'), nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
 
     def serialize(self):
         return {
@@ -447,6 +559,7 @@ class Speaker(db.Model):
     title = db.Column(db.String(100))
     name = db.Column(db.String(255))
     created_at = db.Column(db.DateTime, default=datetime.datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
     # should only expect 1 parent at most, so a parent cannot be a parent
     parent_id = db.Column(UUID(as_uuid=True), primary_key=False, default=None, nullable=True)
 
@@ -462,14 +575,18 @@ class Speaker(db.Model):
     def last_name(self):
         return str(self.name).split(' ')[-1]
 
+    @last_name.expression
+    def last_name(cls):
+        return db.func.regexp_replace(db.func.coalesce(cls.name, ''), '^.* ', '')
+
 
 class TokenBlacklist(db.Model):
     id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    jti = db.Column(db.String(36), nullable=False)
+    jti = db.Column(db.String(36), nullable=False, index=True)
     token_type = db.Column(db.String(10), nullable=False)
     user_identity = db.Column(db.String(50), nullable=False)
     revoked = db.Column(db.Boolean, nullable=False)
-    expires = db.Column(db.DateTime, nullable=False)
+    expires = db.Column(db.DateTime, nullable=False, index=True)
     created_at = db.Column(db.DateTime, default=datetime.datetime.utcnow)
 
     def serialize(self):
@@ -515,6 +632,14 @@ class User(db.Model):
     def is_admin(self):
         return self.access_area == USER_ADMIN
 
+    @hybrid_property
+    def last_name(self):
+        return str(self.name).split(' ')[-1]
+
+    @last_name.expression
+    def last_name(cls):
+        return db.func.regexp_replace(db.func.coalesce(cls.name, ''), '^.* ', '')
+
 
 class Venue(db.Model):
     __tablename__ = 'venues'
@@ -524,6 +649,7 @@ class Venue(db.Model):
     name = db.Column(db.String(255))
     address = db.Column(db.String(255))
     directions = db.Column(db.String(255))
+    updated_at = db.Column(db.DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
 
     default = db.Column(db.Boolean)
 
@@ -536,3 +662,21 @@ class Venue(db.Model):
             'directions': self.directions,
             'default': self.default,
         }
+
+
+# the sort keys of the paginated lists, indexed with the id so that each page is read from the index
+ARTICLES_PAGE_KEY = db.func.coalesce(Article.old_id, 0)
+# rendered as sql rather than a bind parameter so that it can be used in an index
+NO_EVENT_DATETIME_SQL = db.literal_column("'{}'::timestamp".format(NO_EVENT_DATETIME), type_=db.DateTime)
+EVENTS_PAGE_KEY = db.func.coalesce(Event.first_event_datetime, NO_EVENT_DATETIME_SQL)
+EVENT_DATES_PAGE_KEY = db.func.coalesce(EventDate.event_datetime, NO_EVENT_DATETIME_SQL)
+SPEAKERS_PAGE_KEY = Speaker.last_name
+USERS_PAGE_KEY = User.last_name
+VENUES_PAGE_KEY = db.func.coalesce(Venue.name, '')
+
+db.Index('ix_articles_page', ARTICLES_PAGE_KEY, Article.id)
+db.Index('ix_events_page', EVENTS_PAGE_KEY, Event.id)
+db.Index('ix_event_dates_page', EVENT_DATES_PAGE_KEY, EventDate.id)
+db.Index('ix_speakers_page', SPEAKERS_PAGE_KEY, Speaker.id)
+db.Index('ix_users_page', USERS_PAGE_KEY, User.id)
+db.Index('ix_venues_page', VENUES_PAGE_KEY, Venue.id)
@@ -1,6 +1,4 @@
 from celery import Celery
-from celery.task.control import revoke
-from flask import current_app
 
 
 class NewAcropolisCelery(Celery):  # pragma: no cover
@@ -27,9 +25,3 @@ class NewAcropolisCelery(Celery):  # pragma: no cover
                     return self.run(*args, **kwargs)
 
         self.Task = ContextTask
-
-
-def revoke_task(task_id):  # pragma: no cover
-    res = revoke(task_id, terminate=True)
-    current_app.logger.info('Task revoked: %d, %r', task_id, res)
-    return res
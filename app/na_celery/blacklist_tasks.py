@@ -0,0 +1,10 @@
+from flask import current_app
+
+from app import celery
+from app.dao.blacklist_dao import prune_database
+
+
+@celery.task()
+def prune_token_blacklist():
+    pruned = prune_database(current_app.config['TOKEN_PRUNE_BATCH_SIZE'])
+    current_app.logger.info('Task prune_token_blacklist deleted %d expired tokens', pruned)
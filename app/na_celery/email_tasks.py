@@ -1,28 +1,96 @@
-from datetime import datetime, timedelta
+from datetime import datetime, time, timedelta
 from flask import current_app
 
 from app import celery
-from app.comms.email import send_email, get_email_html
-from app.dao.emails_dao import dao_get_email_by_id, dao_add_member_sent_to_email
-from app.dao.members_dao import dao_get_members_not_sent_to
+from app.comms.breakers import EMAIL_PROVIDER, get_breaker
+from app.comms.email import get_email_subject_and_html, send_batch_email
+from app.comms.sessions import PROVIDER_ERRORS
+from app.dao.emails_dao import (
+    dao_add_members_sent_to_email,
+    dao_claim_email_quota,
+    dao_claim_queued_emails,
+    dao_get_email_by_id,
+    dao_release_email_quota,
+    dao_release_queued_emails,
+    dao_update_sent_email_totals,
+)
 from app.dao.users_dao import dao_get_admin_users
-from app.models import EVENT
+
+
+def _send_claimed_emails(email_id, sends, rendered):
+    """
+    Returns the ids of the members not sent to as the email provider became unavailable.
+    """
+    if email_id not in rendered:
+        rendered[email_id] = get_email_subject_and_html(dao_get_email_by_id(email_id))
+    subject, message = rendered[email_id]
+
+    status_codes = send_batch_email(
+        [email_to for _, email_to in sends], subject, message,
+        {email_to: {'member_id': str(member_id)} for member_id, email_to in sends}
+    )
+    dao_add_members_sent_to_email(
+        email_id, {member_id: status_codes[email_to] for member_id, email_to in sends if email_to in status_codes})
+
+    return [member_id for member_id, email_to in sends if email_to not in status_codes]
 
 
 @celery.task()
-def send_emails(email_id):
-    members_not_sent_to = dao_get_members_not_sent_to(email_id)
+def send_queued_emails():
+    """
+    Sends the due emails in the outbox a batch at a time, until none are due or the daily quota is reached.
+    Several workers can run this task at once as each batch is claimed by a single worker.
+    """
+    batch_size = current_app.config['EMAIL_BATCH_SIZE']
+    rendered = {}
+
+    while True:
+        if get_breaker(EMAIL_PROVIDER).is_open():
+            current_app.logger.info('Email provider unavailable, not sending queued emails')
+            break
+
+        claimed = dao_claim_queued_emails(batch_size, current_app.config['EMAIL_CLAIM_TIMEOUT'])
+        if not claimed:
+            break
+
+        quota = dao_claim_email_quota(len(claimed), current_app.config['EMAIL_LIMIT'])
+        if quota < len(claimed):
+            # the rest are sent once the quota is renewed
+            resume_at = datetime.combine(
+                datetime.utcnow().date() + timedelta(days=1), time(current_app.config['EMAIL_QUOTA_RESUME_HOUR']))
+            dao_release_queued_emails(
+                [(email_id, member_id) for email_id, member_id, _ in claimed[quota:]],
+                send_after=resume_at
+            )
 
-    current_app.logger.info('Task send_emails received %s, sending %d emails', email_id, len(members_not_sent_to))
+        sends_by_email = {}
+        for email_id, member_id, email_to in claimed[:quota]:
+            sends_by_email.setdefault(email_id, []).append((member_id, email_to))
 
-    email = dao_get_email_by_id(email_id)
+        sent_email_ids = []
+        unsent = []
+        try:
+            for email_id, sends in sends_by_email.items():
+                current_app.logger.info('Task send_queued_emails sending %s to %d members', email_id, len(sends))
+                unsent = [(email_id, member_id) for member_id in _send_claimed_emails(email_id, sends, rendered)]
+                sent_email_ids.append(email_id)
+                if unsent:
+                    break
+        except PROVIDER_ERRORS as e:
+            current_app.logger.error('Email provider unavailable: %s', e)
+        finally:
+            if sent_email_ids:
+                dao_update_sent_email_totals(sent_email_ids)
 
-    for member_id, email_to in members_not_sent_to:
-        subject = email.get_subject()
-        message = None
-        if email.email_type == EVENT:
-            message = get_email_html(
-                email.email_type, event_id=email.event_id, details=email.details, extra_txt=email.extra_txt)
+        unsent += [
+            (email_id, member_id) for email_id, sends in sends_by_email.items() if email_id not in sent_email_ids
+            for member_id, _ in sends
+        ]
+        if unsent:
+            dao_release_queued_emails(unsent)
+            dao_release_email_quota(len(unsent))
+            break
 
-        email_status_code = send_email(email_to, subject, message)
-        dao_add_member_sent_to_email(email_id, member_id, status_code=email_status_code)
+        if quota < len(claimed):
+            current_app.logger.info('Email limit of %d reached', current_app.config['EMAIL_LIMIT'])
+            break
@@ -0,0 +1,11 @@
+from flask import current_app
+
+from app import celery
+from app.imports.jobs import run_import_job
+
+
+@celery.task()
+def import_data(import_job_id, **options):
+    current_app.logger.info('Task import_data received %s', import_job_id)
+
+    run_import_job(import_job_id, **options)
@@ -0,0 +1,85 @@
+from flask import current_app
+
+from app import celery
+from app.comms.email import get_email_html, send_email
+from app.comms.sessions import PROVIDER_ERRORS
+from app.dao.emails_dao import dao_get_email_by_id
+from app.dao.events_dao import dao_get_event_by_id
+from app.dao.users_dao import dao_get_admin_users, dao_get_users
+from app.models import APPROVED, EVENT, READY, REJECTED
+
+
+def _send_notification(task, emails_to, subject, message):
+    try:
+        send_email(emails_to, subject, message)
+    except PROVIDER_ERRORS as e:
+        raise task.retry(
+            exc=e,
+            countdown=current_app.config['NOTIFICATION_RETRY_DELAY'],
+            max_retries=current_app.config['NOTIFICATION_MAX_RETRIES']
+        )
+
+
+@celery.task(bind=True)
+def send_event_notification(self, event_id, event_state):
+    event = dao_get_event_by_id(event_id)
+    if event.event_state != event_state:
+        current_app.logger.info('Event %s is no longer %s, not notifying', event_id, event_state)
+        return
+
+    event_url = '{}/events/{}'.format(current_app.config['FRONTEND_ADMIN_URL'], event_id)
+
+    if event_state == READY:
+        emails_to = [admin.email for admin in dao_get_admin_users()]
+
+        message = 'Please review this event for publishing <a href="{}">{}</a>'.format(event_url, event.title)
+
+        _send_notification(self, emails_to, '{} is ready for review'.format(event.title), message)
+    elif event_state == REJECTED:
+        emails_to = [user.email for user in dao_get_users()]
+
+        message = '<div>Please correct this event <a href="{}">{}</a></div>'.format(event_url, event.title)
+
+        message += '<ol>'
+        for reject_reason in [rr for rr in event.reject_reasons if not rr.resolved]:
+            message += '<li>{}</li>'.format(reject_reason.reason)
+        message += '</ol>'
+
+        _send_notification(self, emails_to, '{} event needs to be corrected'.format(event.title), message)
+
+
+@celery.task(bind=True)
+def send_email_notification(self, email_id, email_state, reject_reason=None, send_after=None):
+    email = dao_get_email_by_id(email_id)
+    if email.email_state != email_state:
+        current_app.logger.info('Email %s is no longer %s, not notifying', email_id, email_state)
+        return
+
+    # the email is rendered once and the event is loaded once for the subject and the html
+    event = dao_get_event_by_id(str(email.event_id)) if email.email_type == EVENT else None
+    email_url = '{}/emails/{}'.format(current_app.config['FRONTEND_ADMIN_URL'], email_id)
+    emails_to = [user.email for user in dao_get_users()]
+
+    if email_state == READY:
+        # ask the admin users to log in in order to approve the email
+        review_part = '<div>Please review this email: {}</div>'.format(email_url)
+        email_html = get_email_html(email.email_type, event=event, details=email.details, extra_txt=email.extra_txt)
+
+        _send_notification(
+            self, emails_to, 'Please review {}'.format(event.title) if event else None,
+            review_part + (email_html or ''))
+    elif email_state == REJECTED:
+        message = '<div>Please correct this email <a href="{}">{}</a></div>'.format(
+            email_url, email.get_subject(event=event))
+
+        message += '<div>Reason: {}</div>'.format(reject_reason)
+
+        _send_notification(
+            self, emails_to, '{} email needs to be corrected'.format(event.title if event else ''), message)
+    elif email_state == APPROVED:
+        review_part = '<div>Email will be sent at {}, log in to reject: {}</div>'.format(send_after, email_url)
+        email_html = get_email_html(email.email_type, event=event, details=email.details, extra_txt=email.extra_txt)
+
+        _send_notification(
+            self, emails_to, '{} has been approved'.format(email.get_subject(event=event)),
+            review_part + (email_html or ''))
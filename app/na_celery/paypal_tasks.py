@@ -0,0 +1,29 @@
+from flask import current_app
+
+from app import celery
+from app.comms.sessions import PROVIDER_ERRORS
+from app.dao.events_dao import dao_get_event_by_id, dao_update_event
+from app.payments.paypal import PayPal
+
+
+@celery.task(bind=True)
+def create_update_paypal_button(self, event_id, booking_code=None):
+    current_app.logger.info('Task create_update_paypal_button received %s', event_id)
+
+    event = dao_get_event_by_id(event_id)
+
+    try:
+        booking_code = PayPal().create_update_paypal_button(
+            event_id, event.title,
+            event.fee, event.conc_fee, event.multi_day_fee, event.multi_day_conc_fee,
+            True if event.event_type.event_type == 'Talk' else False,
+            booking_code=booking_code
+        )
+    except PROVIDER_ERRORS as e:
+        raise self.retry(
+            exc=e,
+            countdown=current_app.config['PAYPAL_RETRY_DELAY'],
+            max_retries=current_app.config['PAYPAL_MAX_RETRIES']
+        )
+
+    dao_update_event(event_id, booking_code=booking_code)
@@ -0,0 +1,22 @@
+from flask import current_app
+
+from app import celery
+from app.dao.events_dao import dao_update_event
+from app.storage.utils import STORAGE_ERRORS, Storage
+
+
+@celery.task(bind=True)
+def upload_event_image(self, event_id, image_filename, target_image_filename, image_data, event_image_filename=None):
+    current_app.logger.info('Task upload_event_image received %s', event_id)
+
+    try:
+        storage = Storage(current_app.config['STORAGE'])
+        storage.upload_blob_from_base64string(image_filename, target_image_filename, image_data)
+    except STORAGE_ERRORS as e:
+        raise self.retry(
+            exc=e,
+            countdown=current_app.config['STORAGE_RETRY_DELAY'],
+            max_retries=current_app.config['STORAGE_MAX_RETRIES']
+        )
+
+    dao_update_event(event_id, image_filename=event_image_filename or target_image_filename)
@@ -1,9 +1,10 @@
 from datetime import datetime, timedelta
 from flask import current_app
 import json
-import requests
 from urlparse import parse_qs
 
+from app.comms.breakers import PAYPAL
+from app.comms.sessions import get_session
 from app.errors import PaypalException
 
 PAYPAL_SEARCH_BACK_FROM = 90
@@ -19,6 +20,7 @@ class PayPal:
             'VERSION': '51.0',
         }
         self.paypal_url = current_app.config['PAYPAL_URL']
+        self.session = get_session(PAYPAL)
 
     def create_update_paypal_button(
         self, item_id, title, fee=5, conc_fee=3, all_fee=None, all_conc_fee=None, members_free=False, booking_code=None
@@ -33,7 +35,7 @@ class PayPal:
             'STARTDATE': datetime.now() - timedelta(days=PAYPAL_SEARCH_BACK_FROM)
         })
 
-        response = requests.post(
+        response = self.session.post(
             self.paypal_url,
             data=search_data,
             headers={'content-type': 'application/x-www-form-urlencoded'}
@@ -51,7 +53,7 @@ class PayPal:
                     'HOSTEDBUTTONID': search_resp[key]
                 })
 
-                response = requests.post(
+                response = self.session.post(
                     self.paypal_url,
                     data=get_data,
                     headers={'content-type': 'application/x-www-form-urlencoded'}
@@ -128,7 +130,7 @@ class PayPal:
 
         current_app.logger.info('Paypal process: {}'.format(data))
 
-        response = requests.post(
+        response = self.session.post(
             self.paypal_url,
             data=data,
             headers={'content-type': 'application/x-www-form-urlencoded'}
@@ -1,6 +1,9 @@
 from flask import Blueprint, jsonify, current_app
+from flask_jwt_extended import jwt_required
 
-from app import db
+from app import cache, db
+from app.comms.breakers import breakers_status
+from app.comms.sessions import sessions_stats
 from app.errors import register_errors
 
 base_blueprint = Blueprint('', __name__)
@@ -17,3 +20,21 @@ def get_info():
         info=full_name,
         commit=current_app.config['TRAVIS_COMMIT']
     )
+
+
+@base_blueprint.route('/cache/stats')
+@jwt_required
+def get_cache_stats():
+    return jsonify(cache.stats())
+
+
+@base_blueprint.route('/http/stats')
+@jwt_required
+def get_http_stats():
+    return jsonify(sessions_stats())
+
+
+@base_blueprint.route('/breakers')
+@jwt_required
+def get_breakers_status():
+    return jsonify(breakers_status())
@@ -1,6 +1,36 @@
-from flask import request
+from flask import current_app, request
 from urlparse import urlparse
 
 
 def is_running_locally():
     return urlparse(request.url_root).netloc.split(':')[0] in ['localhost', '127.0.0.1']
+
+
+def get_limit():
+    limit = request.args.get('limit', current_app.config['PAGE_SIZE'], type=int)
+    return min(max(limit, 1), current_app.config['PAGE_SIZE_MAX'])
+
+
+def get_page_args():
+    if 'cursor' not in request.args and 'limit' not in request.args:
+        return
+
+    return {
+        'cursor': request.args.get('cursor'),
+        'limit': get_limit(),
+    }
+
+
+def paginated(items, next_cursor):
+    return {
+        'data': items,
+        'next': next_cursor,
+    }
+
+
+def is_background_import():
+    return request.args.get('background') in ['1', 'true']
+
+
+def is_ndjson_request():
+    return request.mimetype == 'application/x-ndjson'
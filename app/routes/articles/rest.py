@@ -8,14 +8,22 @@ from flask import (
 
 from flask_jwt_extended import jwt_required
 
+from app import cache
+from app.caching.conditional import conditional_get
 from app.dao.articles_dao import (
-    dao_create_article,
     dao_get_articles,
+    dao_get_articles_page,
+    dao_get_articles_summary,
+    dao_search_articles,
     dao_update_article,
     dao_get_article_by_id
 )
-from app.errors import register_errors
+from app.errors import register_errors, InvalidRequest
+from app.imports.articles import import_articles as import_articles_data
+from app.imports.jobs import ARTICLES_IMPORT
 
+from app.routes import get_limit, get_page_args, is_background_import, is_ndjson_request, paginated
+from app.routes.imports.rest import stream_import, submit_import_job
 from app.routes.articles.schemas import post_import_articles_schema
 
 from app.models import Article
@@ -29,22 +37,57 @@ register_errors(article_blueprint)
 
 @articles_blueprint.route('/articles')
 @jwt_required
+@conditional_get(Article)
+@cache.cached('articles')
 def get_articles():
     current_app.logger.info('get_articles')
+    page_args = get_page_args()
+    if page_args:
+        articles, next_cursor = dao_get_articles_page(**page_args)
+        return jsonify(paginated([a.serialize() for a in articles], next_cursor))
+
     articles = [a.serialize() if a else None for a in dao_get_articles()]
     return jsonify(articles)
 
 
 @articles_blueprint.route('/articles/summary')
 @jwt_required
+@conditional_get(Article)
+@cache.cached('articles')
 def get_articles_summary():
     current_app.logger.info('get_articles_summary')
-    articles = [a.serialize_summary() if a else None for a in dao_get_articles()]
+    page_args = get_page_args()
+    if page_args:
+        articles, next_cursor = dao_get_articles_page(summary=True, **page_args)
+        return jsonify(paginated([a.serialize_summary() for a in articles], next_cursor))
+
+    articles = [a.serialize_summary() if a else None for a in dao_get_articles_summary()]
+    return jsonify(articles)
+
+
+@articles_blueprint.route('/articles/search')
+@jwt_required
+def search_articles():
+    q = request.args.get('q', '').strip()
+    if not q:
+        raise InvalidRequest('search text q is required', 400)
+
+    current_app.logger.info('search_articles: {}'.format(q))
+
+    articles = []
+    for article, rank, snippet in dao_search_articles(q, get_limit()):
+        json_article = article.serialize_summary()
+        json_article['rank'] = rank
+        json_article['snippet'] = snippet
+        articles.append(json_article)
+
     return jsonify(articles)
 
 
 @article_blueprint.route('/article/<uuid:article_id>', methods=['GET'])
 @jwt_required
+@conditional_get(Article)
+@cache.cached('articles')
 def get_article_by_id(article_id):
     current_app.logger.info('get_article: {}'.format(article_id))
     article = dao_get_article_by_id(article_id)
@@ -54,31 +97,17 @@ def get_article_by_id(article_id):
 @articles_blueprint.route('/articles/import', methods=['POST'])
 @jwt_required
 def import_articles():
+    if is_ndjson_request():
+        return stream_import(ARTICLES_IMPORT, post_import_articles_schema)
+
     data = request.get_json(force=True)
 
     validate(data, post_import_articles_schema)
 
-    articles = []
-    errors = []
-    for item in data:
-        err = ''
-        article = Article.query.filter(Article.old_id == item['id']).first()
-        print(article)
-        if not article:
-            article = Article(
-                old_id=item['id'],
-                title=item['title'],
-                author=item['author'],
-                content=item['content'],
-                created_at=item['entrydate'] if item['entrydate'] != '0000-00-00' else None
-            )
-
-            articles.append(article)
-            dao_create_article(article)
-        else:
-            err = u'article already exists: {} - {}'.format(article.old_id, article.title)
-            current_app.logger.info(err)
-            errors.append(err)
+    if is_background_import():
+        return submit_import_job(ARTICLES_IMPORT, data)
+
+    articles, errors = import_articles_data(data)
 
     res = {
         "articles": [a.serialize() for a in articles]
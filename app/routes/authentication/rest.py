@@ -16,20 +16,17 @@ from flask_jwt_extended import (
 from app import jwt
 from app.routes.authentication.errors import AuthenticationError
 from app.routes.authentication.schemas import post_login_schema
-from app.dao.blacklist_dao import store_token, prune_database, is_token_revoked
+from app.dao.blacklist_dao import store_token, check_token_revoked
 from app.errors import register_errors
 from app.schema_validation import validate
 
-blacklist = set()
 auth_blueprint = Blueprint('auth', __name__, url_prefix='/auth')
 register_errors(auth_blueprint)
 
 
 @jwt.token_in_blacklist_loader
 def check_if_token_in_blacklist(decrypted_token):
-    jti = decrypted_token['jti']
-    current_app.logger.info('check_token: {}, {}'.format(jti, blacklist))
-    return is_token_revoked(decrypted_token)
+    return check_token_revoked(decrypted_token)
 
 
 @auth_blueprint.route('/login', methods=['POST'])
@@ -76,7 +73,6 @@ def refresh():
 @auth_blueprint.route('/logout', methods=['DELETE'])
 @jwt_required
 def logout():
-    prune_database()
     store_token(get_raw_jwt())
     return jsonify({"logout": True}), 200
 
@@ -85,6 +81,5 @@ def logout():
 @auth_blueprint.route('/logout-refresh', methods=['DELETE'])
 @jwt_refresh_token_required
 def logout_refresh():
-    prune_database()
     store_token(get_raw_jwt())
     return jsonify({"logout": True}), 200
@@ -9,9 +9,11 @@ from flask import (
 
 from flask_jwt_extended import jwt_required
 
+from app.caching.conditional import conditional_get
 from app.dao.event_dates_dao import (
     dao_create_event_date,
     dao_get_event_dates,
+    dao_get_event_dates_page,
     dao_update_event_date,
     dao_get_event_date_by_id,
     dao_has_event_id_and_datetime
@@ -20,8 +22,9 @@ from app.dao.venues_dao import dao_get_default_venue
 
 from app.errors import register_errors, InvalidRequest
 
+from app.routes import get_page_args, paginated
 from app.routes.event_dates.schemas import post_create_event_date_schema, post_update_event_date_schema
-from app.models import EventDate
+from app.models import EventDate, Speaker
 from app.schema_validation import validate
 
 event_dates_blueprint = Blueprint('event_dates', __name__)
@@ -32,13 +35,20 @@ register_errors(event_date_blueprint)
 
 @event_dates_blueprint.route('/event_dates')
 @jwt_required
+@conditional_get(EventDate, Speaker)
 def get_event_dates():
     current_app.logger.info('get_event_dates')
+    page_args = get_page_args()
+    if page_args:
+        event_dates, next_cursor = dao_get_event_dates_page(**page_args)
+        return jsonify(paginated([e.serialize() for e in event_dates], next_cursor))
+
     event_dates = [e.serialize() if e else None for e in dao_get_event_dates()]
     return jsonify(event_dates)
 
 
 @event_date_blueprint.route('/event_date/<uuid:event_date_id>', methods=['GET'])
+@conditional_get(EventDate, Speaker)
 def get_event_date_by_id(event_date_id):
     current_app.logger.info('get_event_date: {}'.format(event_date_id))
     event_date = dao_get_event_date_by_id(event_date_id)
@@ -8,6 +8,7 @@ from flask import (
 
 from flask_jwt_extended import jwt_required
 
+from app import cache
 from app.dao.event_types_dao import (
     dao_create_event_type,
     dao_get_event_types,
@@ -15,6 +16,9 @@ from app.dao.event_types_dao import (
     dao_get_event_type_by_id
 )
 from app.errors import register_errors
+from app.imports.event_types import import_event_types as import_event_types_data
+from app.imports.jobs import EVENT_TYPES_IMPORT
+from app.routes import is_background_import, is_ndjson_request
 
 from app.routes.event_types.schemas import (
     post_create_event_type_schema,
@@ -22,6 +26,7 @@ from app.routes.event_types.schemas import (
     post_update_event_type_schema
 )
 from app.models import EventType
+from app.routes.imports.rest import stream_import, submit_import_job
 from app.schema_validation import validate
 
 event_types_blueprint = Blueprint('event_types', __name__)
@@ -32,6 +37,7 @@ register_errors(event_type_blueprint)
 
 @event_types_blueprint.route('/event_types')
 @jwt_required
+@cache.cached('event_types', 'fees')
 def get_event_types():
     current_app.logger.info('get_event_types')
     event_types = [e.serialize() if e else None for e in dao_get_event_types()]
@@ -39,6 +45,7 @@ def get_event_types():
 
 
 @event_type_blueprint.route('/event_type/<uuid:event_type_id>', methods=['GET'])
+@cache.cached('event_types', 'fees')
 def get_event_type_by_id(event_type_id):
     current_app.logger.info('get_event_type: {}'.format(event_type_id))
     event_type = dao_get_event_type_by_id(event_type_id)
@@ -61,25 +68,17 @@ def create_event_type():
 @event_types_blueprint.route('/event_types/import', methods=['POST'])
 @jwt_required
 def import_event_types():
+    if is_ndjson_request():
+        return stream_import(EVENT_TYPES_IMPORT, post_import_event_types_schema)
+
     data = request.get_json(force=True)
 
     validate(data, post_import_event_types_schema)
 
-    event_types = []
-    for item in data:
-        event_type = EventType.query.filter(EventType.old_id == item['id']).first()
-        if not event_type:
-            event_type = EventType(
-                old_id=item['id'],
-                event_type=item['EventType'],
-                event_desc=item['EventDesc'],
-                event_filename=item['EventFilename'],
-            )
-
-            event_types.append(event_type)
-            dao_create_event_type(event_type)
-        else:
-            current_app.logger.info('event type already exists: {}'.format(event_type.event_type))
+    if is_background_import():
+        return submit_import_job(EVENT_TYPES_IMPORT, data)
+
+    event_types, _ = import_event_types_data(data)
     return jsonify([e.serialize() for e in event_types]), 201
 
 
@@ -5,52 +5,59 @@ from flask import (
     jsonify,
     request
 )
-import os.path
-import re
 import time
 
 from flask_jwt_extended import jwt_required
 from sqlalchemy.orm.exc import NoResultFound
 
-from app.comms.email import send_email
+from app import cache
+from app.caching.conditional import conditional_get
 from app.dao.events_dao import (
     dao_create_event,
     dao_delete_event,
     dao_get_events,
+    dao_get_events_page,
     dao_get_event_by_id,
     dao_get_events_in_year,
     dao_get_future_events,
     dao_get_limited_events,
     dao_get_past_year_events,
+    dao_search_events,
     dao_update_event,
 )
 from app.dao.event_dates_dao import dao_create_event_date, dao_get_event_date_by_id
-from app.dao.event_types_dao import dao_get_event_type_by_old_id, dao_get_event_type_by_id
+from app.dao.event_types_dao import dao_get_event_type_by_id
 from app.dao.reject_reasons_dao import dao_create_reject_reason, dao_update_reject_reason
-from app.dao.speakers_dao import dao_get_speaker_by_name, dao_get_speaker_by_id
-from app.dao.users_dao import dao_get_admin_users, dao_get_users
-from app.dao.venues_dao import dao_get_venue_by_old_id, dao_get_venue_by_id
+from app.dao.speakers_dao import dao_get_speaker_by_id
+from app.dao.venues_dao import dao_get_venue_by_id
 
 from app.errors import register_errors, InvalidRequest, PaypalException
-from app.models import Event, EventDate, RejectReason, APPROVED, DRAFT, READY, REJECTED
+from app.imports.events import import_events as import_events_data
+from app.imports.jobs import EVENTS_IMPORT
+from app.models import (
+    Event, EventDate, EventType, RejectReason, Speaker, Venue, APPROVED, DRAFT, READY, REJECTED
+)
 
-from app.routes import is_running_locally
+from app.routes import (
+    get_limit, get_page_args, is_background_import, is_ndjson_request, is_running_locally, paginated
+)
+from app.routes.imports.rest import stream_import, submit_import_job
 from app.routes.events.schemas import post_create_event_schema, post_update_event_schema, post_import_events_schema
 
 from app.schema_validation import validate
 
+from app.na_celery import notification_tasks, paypal_tasks, storage_tasks
+from app.comms.sessions import PROVIDER_ERRORS
 from app.payments.paypal import PayPal
-from app.storage.utils import Storage
+from app.storage.utils import STORAGE_ERRORS, Storage
 
 events_blueprint = Blueprint('events', __name__)
 register_errors(events_blueprint)
 
-
-def extract_startdate(json):
-    if json['event_dates']:
-        return json['event_dates'][0]['event_datetime']
-    else:
-        return 0
+EVENT_CACHE_TAGS = ('events', 'event_dates', 'event_types', 'venues', 'speakers', 'reject_reasons')
+EVENT_MODELS = (Event, EventDate, EventType, RejectReason, Speaker, Venue)
+# future and past year events change as time passes as well as when events are saved
+EVENTS_TIME_BUCKET = '%Y-%m-%d %H'
 
 
 @events_blueprint.route('/paypal/<item_id>', methods=['POST'])
@@ -119,29 +126,42 @@ def create_event():
     if event.fee:
         event_type = dao_get_event_type_by_id(event.event_type_id)
         p = PayPal()
-        booking_code = p.create_update_paypal_button(
-            str(event.id), event.title,
-            event.fee, event.conc_fee, event.multi_day_fee, event.multi_day_conc_fee,
-            True if event_type.event_type == 'Talk' else False
-        )
+        try:
+            booking_code = p.create_update_paypal_button(
+                str(event.id), event.title,
+                event.fee, event.conc_fee, event.multi_day_fee, event.multi_day_conc_fee,
+                True if event_type.event_type == 'Talk' else False
+            )
 
-        dao_update_event(event.id, booking_code=booking_code)
+            dao_update_event(event.id, booking_code=booking_code)
+        except PROVIDER_ERRORS as e:
+            current_app.logger.error('Paypal unavailable, creating button later for {}: {}'.format(event.id, e))
+            paypal_tasks.create_update_paypal_button.apply_async((str(event.id),))
 
     image_filename = data.get('image_filename')
 
     image_data = data.get('image_data')
 
-    storage = Storage(current_app.config['STORAGE'])
+    target_image_filename = '{}/{}'.format(event_year, str(event.id))
 
-    if image_data:
-        target_image_filename = '{}/{}'.format(event_year, str(event.id))
+    try:
+        storage = Storage(current_app.config['STORAGE'])
 
-        storage.upload_blob_from_base64string(image_filename, target_image_filename, image_data)
+        if image_data:
+            storage.upload_blob_from_base64string(image_filename, target_image_filename, image_data)
 
-        image_filename = target_image_filename
-    elif image_filename:
-        if not storage.blob_exists(image_filename):
-            raise InvalidRequest('{} does not exist'.format(image_filename), 400)
+            image_filename = target_image_filename
+        elif image_filename:
+            if not storage.blob_exists(image_filename):
+                raise InvalidRequest('{} does not exist'.format(image_filename), 400)
+    except STORAGE_ERRORS as e:
+        if image_data:
+            current_app.logger.error('Storage unavailable, uploading image later for {}: {}'.format(event.id, e))
+            storage_tasks.upload_event_image.apply_async(
+                (str(event.id), image_filename, target_image_filename, image_data))
+            image_filename = None
+        else:
+            current_app.logger.error('Storage unavailable, not checking {} exists: {}'.format(image_filename, e))
 
     event.image_filename = image_filename
     dao_update_event(event.id, image_filename=image_filename)
@@ -164,6 +184,41 @@ def delete_event(event_id):
     return jsonify({'message': '{} deleted'.format(event_id)}), 200
 
 
+@events_blueprint.route('/event/<uuid:event_id>/image', methods=['POST'])
+@jwt_required
+def upload_event_image(event_id):
+    """
+    Streams the image to storage without reading it into memory, the image is either the request body
+    or the image file of a multipart form
+    """
+    try:
+        event = dao_get_event_by_id(event_id)
+    except NoResultFound:
+        raise InvalidRequest('event not found: {}'.format(event_id), 400)
+
+    if request.mimetype == 'multipart/form-data':
+        image = request.files.get('image')
+        if not image:
+            raise InvalidRequest('image file required', 400)
+        stream, content_type, size = image.stream, image.mimetype, None
+    else:
+        stream, content_type, size = request.stream, request.mimetype, request.content_length
+
+    if not content_type.startswith('image/'):
+        raise InvalidRequest('{} is not an image'.format(content_type), 400)
+
+    event_year = event.event_dates[0].event_datetime.year if event.event_dates else datetime.today().year
+    target_image_filename = '{}/{}'.format(event_year, str(event_id))
+
+    storage = Storage(current_app.config['STORAGE'])
+    storage.upload_blob_from_file(stream, target_image_filename, content_type, size=size)
+
+    image_filename = '{}?{}'.format(target_image_filename, time.time())
+    dao_update_event(event_id, image_filename=image_filename)
+
+    return jsonify({'image_filename': image_filename}), 201
+
+
 @events_blueprint.route('/event/<uuid:event_id>', methods=['POST'])
 @jwt_required
 def update_event(event_id):
@@ -178,6 +233,8 @@ def update_event(event_id):
     except NoResultFound:
         raise InvalidRequest('event not found: {}'.format(event_id), 400)
 
+    previous_state = event.event_state
+    previous_image_filename = event.image_filename
     errs = []
     event_dates = []
     event_data = {}
@@ -297,6 +354,11 @@ def update_event(event_id):
             except PaypalException as e:
                 current_app.logger.error(e)
                 errs.append(str(e))
+            except PROVIDER_ERRORS as e:
+                current_app.logger.error('Paypal unavailable, updating button later for {}: {}'.format(event_id, e))
+                paypal_tasks.create_update_paypal_button.apply_async(
+                    (str(event_id),), {'booking_code': event_data.get('booking_code')})
+                errs.append('Paypal unavailable, the booking code will be updated later')
 
     res = dao_update_event(event_id, **event_data)
 
@@ -305,19 +367,31 @@ def update_event(event_id):
 
         image_filename = data.get('image_filename')
 
-        storage = Storage(current_app.config['STORAGE'])
-        if image_data:
-            event_year = str(event.event_dates[0].event_datetime).split('-')[0]
-            target_image_filename = '{}/{}'.format(event_year, str(event_id))
-
-            storage.upload_blob_from_base64string(image_filename, target_image_filename, image_data)
+        event_year = str(event.event_dates[0].event_datetime).split('-')[0]
+        target_image_filename = '{}/{}'.format(event_year, str(event_id))
 
-            unix_time = time.time()
-            image_filename = '{}?{}'.format(target_image_filename, unix_time)
-        elif image_filename:
-            image_filename_without_cache_buster = image_filename.split('?')[0]
-            if not storage.blob_exists(image_filename_without_cache_buster):
-                raise InvalidRequest('{} does not exist'.format(image_filename_without_cache_buster), 400)
+        try:
+            storage = Storage(current_app.config['STORAGE'])
+            if image_data:
+                storage.upload_blob_from_base64string(image_filename, target_image_filename, image_data)
+
+                unix_time = time.time()
+                image_filename = '{}?{}'.format(target_image_filename, unix_time)
+            elif image_filename:
+                image_filename_without_cache_buster = image_filename.split('?')[0]
+                if not storage.blob_exists(image_filename_without_cache_buster):
+                    raise InvalidRequest('{} does not exist'.format(image_filename_without_cache_buster), 400)
+        except STORAGE_ERRORS as e:
+            if image_data:
+                current_app.logger.error('Storage unavailable, uploading image later for {}: {}'.format(event_id, e))
+                storage_tasks.upload_event_image.apply_async(
+                    (str(event_id), image_filename, target_image_filename, image_data),
+                    {'event_image_filename': '{}?{}'.format(target_image_filename, time.time())}
+                )
+                image_filename = previous_image_filename
+                errs.append('Storage unavailable, the image will be uploaded later')
+            else:
+                current_app.logger.error('Storage unavailable, not checking {} exists: {}'.format(image_filename, e))
 
         event.image_filename = image_filename
         dao_update_event(event.id, image_filename=image_filename)
@@ -325,28 +399,11 @@ def update_event(event_id):
         json_event = event.serialize()
         json_event['errors'] = errs
 
-        if data.get('event_state') == READY:
-            emails_to = [admin.email for admin in dao_get_admin_users()]
-
-            message = 'Please review this event for publishing <a href="{}">{}</a>'.format(
-                '{}/events/{}'.format(current_app.config['FRONTEND_ADMIN_URL'], event_id),
-                event.title
-            )
-
-            send_email(emails_to, '{} is ready for review'.format(event.title), message)
-        elif data.get('event_state') == REJECTED:
-            emails_to = [user.email for user in dao_get_users()]
-
-            message = '<div>Please correct this event <a href="{}">{}</a></div>'.format(
-                '{}/events/{}'.format(current_app.config['FRONTEND_ADMIN_URL'], event_id),
-                event.title)
-
-            message += '<ol>'
-            for reject_reason in [rr for rr in json_event.get('reject_reasons') if not rr.get('resolved')]:
-                message += '<li>{}</li>'.format(reject_reason['reason'])
-            message += '</ol>'
-
-            send_email(emails_to, '{} event needs to be corrected'.format(event.title), message)
+        # saving the same state again doesn't notify the users again, a rejection always has a new reason
+        if data.get('event_state') == REJECTED or (
+            data.get('event_state') == READY and data.get('event_state') != previous_state
+        ):
+            notification_tasks.send_event_notification.apply_async((str(event_id), data['event_state']))
 
         return jsonify(json_event), 200
 
@@ -355,24 +412,33 @@ def update_event(event_id):
 
 @events_blueprint.route('/events')
 @jwt_required
+@conditional_get(*EVENT_MODELS)
+@cache.cached(*EVENT_CACHE_TAGS)
 def get_events():
+    page_args = get_page_args()
+    if page_args:
+        events, next_cursor = dao_get_events_page(**page_args)
+        return jsonify(paginated([e.serialize() for e in events], next_cursor))
+
     events = [e.serialize() if e else None for e in dao_get_events()]
 
-    events.sort(key=extract_startdate)
     return jsonify(events)
 
 
 @events_blueprint.route('/events/year/<int:year>')
 @jwt_required
+@conditional_get(*EVENT_MODELS)
+@cache.cached(*EVENT_CACHE_TAGS)
 def get_events_in_year(year):
     events = [e.serialize() if e else None for e in dao_get_events_in_year(year)]
 
-    events.sort(key=extract_startdate)
     return jsonify(events)
 
 
 @events_blueprint.route('/events/limit/<int:limit>')
 @jwt_required
+@conditional_get(*EVENT_MODELS)
+@cache.cached(*EVENT_CACHE_TAGS)
 def get_limited_events(limit):
     if limit > current_app.config['EVENTS_MAX']:
         raise InvalidRequest("{} is greater than events max".format(limit), 400)
@@ -384,19 +450,40 @@ def get_limited_events(limit):
 
 @events_blueprint.route('/events/future')
 @jwt_required
+@conditional_get(*EVENT_MODELS, time_bucket=EVENTS_TIME_BUCKET)
+@cache.cached(*EVENT_CACHE_TAGS)
 def get_future_events():
     events = [e.serialize() if e else None for e in dao_get_future_events()]
 
-    events.sort(key=extract_startdate)
     return jsonify(events)
 
 
 @events_blueprint.route('/events/past_year')
 @jwt_required
+@conditional_get(*EVENT_MODELS, time_bucket=EVENTS_TIME_BUCKET)
+@cache.cached(*EVENT_CACHE_TAGS)
 def get_past_year_events():
     events = [e.serialize() if e else None for e in dao_get_past_year_events()]
 
-    events.sort(key=extract_startdate)
+    return jsonify(events)
+
+
+@events_blueprint.route('/events/search')
+@jwt_required
+def search_events():
+    q = request.args.get('q', '').strip()
+    if not q:
+        raise InvalidRequest('search text q is required', 400)
+
+    current_app.logger.info('search_events: {}'.format(q))
+
+    events = []
+    for event, rank, snippet in dao_search_events(q, get_limit()):
+        json_event = event.serialize()
+        json_event['rank'] = rank
+        json_event['snippet'] = snippet
+        events.append(json_event)
+
     return jsonify(events)
 
 
@@ -417,102 +504,17 @@ def extract_speakers():
 @events_blueprint.route('/events/import', methods=['POST'])
 @jwt_required
 def import_events():
+    if is_ndjson_request():
+        return stream_import(EVENTS_IMPORT, post_import_events_schema, upload_images=is_running_locally())
+
     data = request.get_json(force=True)
 
     validate(data, post_import_events_schema)
 
-    errors = []
-    events = []
-    for item in data:
-        err = ''
-        event = Event.query.filter(Event.old_id == item['id']).first()
-        if not event:
-            speakers = []
-
-            event_type = dao_get_event_type_by_old_id(item['Type'])
-            if not event_type:
-                err = '{} event type not found: {}'.format(item['id'], item['Type'])
-                current_app.logger.info(err)
-                errors.append(err)
-
-            if item['Speaker']:
-                for s in re.split(r' and | & ', item['Speaker']):
-                    speaker = dao_get_speaker_by_name(s)
-                    if not speaker:
-                        err = '{} speaker not found: {}'.format(item['id'], item['Speaker'])
-                        current_app.logger.info(err)
-                        errors.append(err)
-                    else:
-                        speakers.append(speaker)
-
-            venue = dao_get_venue_by_old_id(item['venue'])
-            if not venue:
-                err = '{} venue not found: {}'.format(item['id'], item['venue'])
-                current_app.logger.info(err)
-                errors.append(err)
-
-            if err:
-                continue
-
-            event = Event(
-                old_id=item['id'],
-                event_type_id=event_type.id,
-                title=item['Title'],
-                sub_title=item['SubTitle'],
-                description=item['Description'],
-                booking_code=item['BookingCode'],
-                image_filename=item['ImageFilename'],
-                fee=item['Fee'],
-                conc_fee=item['ConcFee'],
-                multi_day_fee=item['MultiDayFee'],
-                multi_day_conc_fee=item['MultiDayConcFee'],
-                duration=item['Duration'],
-                venue_id=venue.id,
-                event_state=APPROVED
-            )
-
-            def add_event_date(event_datetime):
-                event_date = EventDate(
-                    event_datetime=event_datetime,
-                    duration=item['Duration'],
-                    fee=item['Fee'],
-                    conc_fee=item['ConcFee'],
-                    multi_day_fee=item['MultiDayFee'],
-                    multi_day_conc_fee=item['MultiDayConcFee'],
-                    venue_id=venue.id
-                )
-
-                dao_create_event_date(event_date, speakers)
+    if is_background_import():
+        return submit_import_job(EVENTS_IMPORT, data, upload_images=is_running_locally())
 
-                event.event_dates.append(event_date)
-
-            add_event_date(item['StartDate'])
-
-            for i in range(2, 5):
-                if item['StartDate{}'.format(i)] > '0000-00-00 00:00:00':
-                    add_event_date(item['StartDate{}'.format(i)])
-
-            events.append(event)
-            dao_create_event(event)
-            current_app.logger.info(u'added event {} - {}'.format(event.old_id, event.title))
-        else:
-            err = u'event already exists: {} - {}'.format(event.old_id, event.title)
-            current_app.logger.info(err)
-            errors.append(err)
-
-        if is_running_locally() and item['ImageFilename'] and item['ImageFilename'] != '../spacer.gif':
-            storage = Storage(current_app.config['STORAGE'])
-
-            if not storage.blob_exists(item['ImageFilename']):
-                fname = "./data/events/{}".format(item['ImageFilename'])
-                if os.path.isfile(fname):
-                    storage.upload_blob(fname, item['ImageFilename'])
-                else:
-                    err = '{} not found for {}'.format(fname, event.old_id)
-                    current_app.logger.info(err)
-                    errors.append(err)
-            else:
-                current_app.logger.info('{} found'.format(item['ImageFilename']))
+    events, errors = import_events_data(data, upload_images=is_running_locally())
 
     res = {
         "events": [e.serialize() for e in events]
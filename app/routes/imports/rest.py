@@ -0,0 +1,112 @@
+from flask import (
+    Blueprint,
+    current_app,
+    json,
+    jsonify,
+    request,
+    stream_with_context,
+    Response
+)
+
+from flask_jwt_extended import jwt_required
+from jsonschema import ValidationError
+
+from app.na_celery import import_tasks
+from app.dao.import_jobs_dao import dao_create_import_job, dao_get_import_job_by_id
+from app.errors import register_errors
+from app.imports.jobs import import_batch
+from app.models import ImportJob
+from app.schema_validation import validate
+
+imports_blueprint = Blueprint('imports', __name__)
+register_errors(imports_blueprint)
+
+
+@imports_blueprint.route('/imports/<uuid:import_job_id>', methods=['GET'])
+@jwt_required
+def get_import_job(import_job_id):
+    import_job = dao_get_import_job_by_id(import_job_id)
+    return jsonify(import_job.serialize())
+
+
+def submit_import_job(import_type, data, **options):
+    import_job = ImportJob(import_type=import_type, data=data, rows_total=len(data), errors=[])
+    dao_create_import_job(import_job)
+
+    result = import_tasks.import_data.apply_async((str(import_job.id),), options)
+    current_app.logger.info('Task: import_data: %s, %s, %r', import_type, import_job.id, result.id)
+
+    return jsonify(import_job.serialize()), 202
+
+
+def _import_results(import_type, batch, first_row, totals, options):
+    if not batch:
+        return
+
+    created, errors = import_batch(import_type, batch, first_row, **options)
+
+    totals['rows_processed'] += len(batch)
+    totals['rows_created'] += len(created)
+    totals['errors'] += len(errors)
+
+    for item in created:
+        yield {'created': item.serialize()}
+    for error in errors:
+        yield {'error': error}
+
+
+def stream_import(import_type, schema, prepare=None, **options):
+    """
+    Imports newline delimited json a small batch at a time as the request is read, streaming back a
+    result line for each record so that memory use doesn't grow with the size of the upload
+    """
+    batch_size = current_app.config['IMPORT_STREAM_BATCH_SIZE']
+
+    def results():
+        totals = {'rows_processed': 0, 'rows_created': 0, 'errors': 0}
+        batch = []
+        first_row = 0
+
+        for row, line in enumerate(request.stream):
+            if not line.strip():
+                continue
+
+            try:
+                item = json.loads(line)
+                if prepare:
+                    item = prepare(item)
+                validate([item], schema)
+            except (ValueError, ValidationError) as e:
+                # import what has been read so far so that the results stay in row order
+                for result in _import_results(import_type, batch, first_row, totals, options):
+                    yield result
+                batch = []
+
+                totals['rows_processed'] += 1
+                totals['errors'] += 1
+                yield {
+                    'row': row,
+                    'error': json.loads(e.message)['errors'] if isinstance(e, ValidationError) else str(e)
+                }
+                continue
+
+            if not batch:
+                first_row = row
+            batch.append(item)
+
+            if len(batch) == batch_size:
+                for result in _import_results(import_type, batch, first_row, totals, options):
+                    yield result
+                batch = []
+
+        for result in _import_results(import_type, batch, first_row, totals, options):
+            yield result
+
+        current_app.logger.info('Streamed %s import: %r', import_type, totals)
+        yield totals
+
+    def lines():
+        for result in results():
+            yield json.dumps(result) + '\n'
+
+    return Response(stream_with_context(lines()), mimetype='application/x-ndjson')
@@ -1,6 +1,5 @@
 from flask import (
     Blueprint,
-    current_app,
     jsonify,
     request
 )
@@ -8,13 +7,14 @@ from flask import (
 from flask_jwt_extended import jwt_required
 
 from app.dao.marketings_dao import (
-    dao_create_marketing,
     dao_get_marketings,
 )
 
 from app.errors import register_errors
-
-from app.models import Marketing
+from app.imports.jobs import MARKETINGS_IMPORT
+from app.imports.marketings import import_marketings as import_marketings_data
+from app.routes import is_background_import, is_ndjson_request
+from app.routes.imports.rest import stream_import, submit_import_job
 from app.routes.marketings.schemas import post_import_marketings_schema
 from app.schema_validation import validate
 
@@ -32,30 +32,17 @@ def get_marketings():
 @marketings_blueprint.route('/marketings/import', methods=['POST'])
 @jwt_required
 def import_marketings():
+    if is_ndjson_request():
+        return stream_import(MARKETINGS_IMPORT, post_import_marketings_schema)
+
     data = request.get_json(force=True)
 
     validate(data, post_import_marketings_schema)
 
-    errors = []
-    marketings = []
-    for item in data:
-        err = ''
-        marketing = Marketing.query.filter(Marketing.old_id == item['id']).first()
-
-        if marketing:
-            err = u'marketing already exists: {}'.format(marketing.old_id)
-            current_app.logger.info(err)
-            errors.append(err)
-        else:
-            marketing = Marketing(
-                old_id=item['id'],
-                description=item['marketingtxt'],
-                order_number=item['ordernum'],
-                active=item["visible"] == "1"
-            )
+    if is_background_import():
+        return submit_import_job(MARKETINGS_IMPORT, data)
 
-            dao_create_marketing(marketing)
-            marketings.append(marketing)
+    marketings, errors = import_marketings_data(data)
 
     res = {
         "marketings": [m.serialize() for m in marketings]
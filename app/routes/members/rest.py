@@ -1,6 +1,5 @@
 from flask import (
     Blueprint,
-    current_app,
     jsonify,
     request
 )
@@ -9,13 +8,14 @@ import json
 from flask_jwt_extended import jwt_required
 
 from app.dao.members_dao import (
-    dao_create_member,
     dao_get_member_by_id,
 )
 
 from app.errors import register_errors
-
-from app.models import Marketing, Member
+from app.imports.jobs import MEMBERS_IMPORT
+from app.imports.members import clean_member, import_members as import_members_data
+from app.routes import is_background_import, is_ndjson_request
+from app.routes.imports.rest import stream_import, submit_import_job
 from app.routes.members.schemas import post_import_members_schema
 from app.schema_validation import validate
 
@@ -26,6 +26,9 @@ register_errors(members_blueprint)
 @members_blueprint.route('/members/import', methods=['POST'])
 @jwt_required
 def import_members():
+    if is_ndjson_request():
+        return stream_import(MEMBERS_IMPORT, post_import_members_schema, prepare=clean_member)
+
     text = request.get_data(as_text=True)
     text = text.replace('"EmailAdd": "anon"', '"EmailAdd": null')
     text = text.replace('"EmailAdd": ""', '"EmailAdd": null')
@@ -34,41 +37,10 @@ def import_members():
 
     validate(data, post_import_members_schema)
 
-    errors = []
-    members = []
-    for item in data:
-        err = ''
-        member = Member.query.filter(Member.old_id == item['id']).first()
-
-        if member:
-            err = u'member already exists: {}'.format(member.old_id)
-            current_app.logger.info(err)
-            errors.append(err)
-        else:
-            member = Member(
-                old_id=item['id'],
-                name=item['Name'],
-                email=item['EmailAdd'],
-                active=item["Active"] == "y",
-                created_at=item["CreationDate"],
-                old_marketing_id=item["Marketing"],
-                is_course_member=item["IsMember"] == "y",
-                last_updated=item["LastUpdated"]
-            )
-
-            marketing = Marketing.query.filter(Marketing.old_id == item['Marketing']).first()
-            if not marketing:
-                err = "Cannot find marketing: {}".format(item['Marketing'])
-                current_app.logger.error(err)
-                errors.append(err)
-                continue
-            else:
-                member.marketing_id = marketing.id
-
-            dao_create_member(member)
-            members.append(member)
+    if is_background_import():
+        return submit_import_job(MEMBERS_IMPORT, data)
 
-            current_app.logger.info('Creating member: %d, %s', member.old_id, member.name)
+    members, errors = import_members_data(data)
 
     res = {
         "members": [m.serialize() for m in members]
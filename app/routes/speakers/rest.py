@@ -6,11 +6,17 @@ from flask import (
 )
 from flask_jwt_extended import jwt_required
 
+from app.caching.conditional import conditional_get
 from app.dao.speakers_dao import (
-    dao_get_speakers, dao_get_speaker_by_id, dao_get_speaker_by_name, dao_create_speaker, dao_update_speaker
+    dao_get_speakers, dao_get_speakers_page, dao_get_speaker_by_id, dao_get_speaker_by_name,
+    dao_create_speaker, dao_update_speaker
 )
 from app.errors import register_errors
+from app.imports.jobs import SPEAKERS_IMPORT
+from app.imports.speakers import import_speakers as import_speakers_data
 from app.models import Speaker
+from app.routes import get_page_args, is_background_import, is_ndjson_request, paginated
+from app.routes.imports.rest import stream_import, submit_import_job
 from app.schema_validation import validate
 from app.routes.speakers.schemas import (
     post_create_speaker_schema,
@@ -28,7 +34,13 @@ register_errors(speaker_blueprint)
 
 @speakers_blueprint.route('/speakers')
 @jwt_required
+@conditional_get(Speaker)
 def get_speakers():
+    page_args = get_page_args()
+    if page_args:
+        speakers, next_cursor = dao_get_speakers_page(**page_args)
+        return jsonify(paginated([s.serialize() for s in speakers], next_cursor))
+
     speakers = [s.serialize() if s else None for s in dao_get_speakers()]
     return jsonify(speakers)
 
@@ -55,39 +67,17 @@ def create_speakers():
 @speakers_blueprint.route('/speakers/import', methods=['POST'])
 @jwt_required
 def import_speakers():
+    if is_ndjson_request():
+        return stream_import(SPEAKERS_IMPORT, post_import_speakers_schema)
+
     data = request.get_json(force=True)
 
     validate(data, post_import_speakers_schema)
 
-    errors = []
-    speakers = []
-    for item in data:
-        err = ''
-        if item.get('parent_name'):
-            parent_speaker = Speaker.query.filter(Speaker.name == item['parent_name']).first()
-            if parent_speaker:
-                if parent_speaker.parent_id:
-                    err = 'Parent speaker can`t have a parent'
-                    current_app.logger.error(err)
-                    errors.append(err)
-                else:
-                    item['parent_id'] = str(parent_speaker.id)
-            else:
-                err = 'Can`t find speaker: {}'.format(item['parent_name'])
-                current_app.logger.error(err)
-                errors.append(err)
-            del item['parent_name']
-
-        if not err:
-            speaker = Speaker.query.filter(Speaker.name == item['name']).first()
-            if not speaker:
-                speaker = Speaker(**item)
-                speakers.append(speaker)
-                dao_create_speaker(speaker)
-            else:
-                err = u'speaker already exists: {}'.format(speaker.name)
-                current_app.logger.error(err)
-                errors.append(err)
+    if is_background_import():
+        return submit_import_job(SPEAKERS_IMPORT, data)
+
+    speakers, errors = import_speakers_data(data)
 
     res = {
         "speakers": [s.serialize() for s in speakers]
@@ -101,6 +91,7 @@ def import_speakers():
 
 @speaker_blueprint.route('/speaker/<uuid:speaker_id>', methods=['GET'])
 @jwt_required
+@conditional_get(Speaker)
 def get_speaker_by_id(speaker_id):
     current_app.logger.info('get_speaker: {}'.format(speaker_id))
     speaker = dao_get_speaker_by_id(speaker_id)
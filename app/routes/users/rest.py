@@ -9,6 +9,7 @@ from sqlalchemy.exc import IntegrityError
 
 from app.dao.users_dao import (
     dao_get_users,
+    dao_get_users_page,
     dao_get_user_by_email,
     dao_get_user_by_id,
     dao_create_user,
@@ -16,6 +17,7 @@ from app.dao.users_dao import (
 )
 from app.errors import register_errors, InvalidRequest
 from app.models import User, ACCESS_AREAS, USER_ADMIN
+from app.routes import get_page_args, paginated
 from app.schema_validation import validate
 from app.routes.users.schemas import (
     post_create_user_schema,
@@ -32,6 +34,11 @@ register_errors(user_blueprint)
 @users_blueprint.route('/users')
 @jwt_required
 def get_users():
+    page_args = get_page_args()
+    if page_args:
+        users, next_cursor = dao_get_users_page(**page_args)
+        return jsonify(paginated([u.serialize() for u in users], next_cursor))
+
     users = [s.serialize() if s else None for s in dao_get_users()]
     return jsonify(users)
 
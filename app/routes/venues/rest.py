@@ -8,14 +8,21 @@ from flask import (
 
 from flask_jwt_extended import jwt_required
 
+from app import cache
+from app.caching.conditional import conditional_get
 from app.dao.venues_dao import (
     dao_create_venue,
     dao_get_venues,
+    dao_get_venues_page,
     dao_update_venue,
     dao_get_venue_by_id
 )
 from app.errors import register_errors
+from app.imports.jobs import VENUES_IMPORT
+from app.imports.venues import import_venues as import_venues_data
 
+from app.routes import get_page_args, is_background_import, is_ndjson_request, paginated
+from app.routes.imports.rest import stream_import, submit_import_job
 from app.routes.venues.schemas import (
     post_create_venue_schema,
     post_create_venues_schema,
@@ -33,12 +40,21 @@ register_errors(venue_blueprint)
 
 @venues_blueprint.route('/venues')
 @jwt_required
+@conditional_get(Venue)
+@cache.cached('venues')
 def get_venues():
+    page_args = get_page_args()
+    if page_args:
+        venues, next_cursor = dao_get_venues_page(**page_args)
+        return jsonify(paginated([v.serialize() for v in venues], next_cursor))
+
     venues = [e.serialize() if e else None for e in dao_get_venues()]
     return jsonify(venues)
 
 
 @venue_blueprint.route('/venue/<uuid:venue_id>', methods=['GET'])
+@conditional_get(Venue)
+@cache.cached('venues')
 def get_venue_by_id(venue_id):
     current_app.logger.info('get_venue: {}'.format(venue_id))
     venue = dao_get_venue_by_id(venue_id)
@@ -79,27 +95,17 @@ def create_venues():
 @venues_blueprint.route('/venues/import', methods=['POST'])
 @jwt_required
 def import_venues():
+    if is_ndjson_request():
+        return stream_import(VENUES_IMPORT, post_import_venues_schema)
+
     data = request.get_json(force=True)
 
     validate(data, post_import_venues_schema)
 
-    venues = []
-    for item in data:
-        if not item["name"]:
-            item["name"] = "Head branch"
+    if is_background_import():
+        return submit_import_job(VENUES_IMPORT, data)
 
-        venue = Venue.query.filter(Venue.old_id == item['id']).first()
-        if not venue:
-            venue = Venue(
-                old_id=item['id'],
-                name=item['name'],
-                address=item['address'],
-                directions="<div>Bus: {bus}</div><div>Train: {train}</div>".format(bus=item['bus'], train=item['tube'])
-            )
-            venues.append(venue)
-            dao_create_venue(venue)
-        else:
-            current_app.logger.info('venue already exists: {}'.format(venue.name))
+    venues, _ = import_venues_data(data)
     return jsonify([v.serialize() for v in venues]), 201
 
 
@@ -0,0 +1,63 @@
+import threading
+
+
+class MemoryBlobIndex(object):
+    """
+    Names of the blobs in a bucket, only this process adds to it so uploads from other
+    processes are not seen until it is loaded again
+    """
+
+    def __init__(self):
+        self.names = set()
+        self.loaded = False
+        self.lock = threading.Lock()
+
+    def is_loaded(self):
+        return self.loaded
+
+    def load(self, names):
+        with self.lock:
+            self.names = set(names)
+            self.loaded = True
+
+    def add(self, name):
+        with self.lock:
+            self.names.add(name)
+
+    def contains(self, name):
+        return name in self.names
+
+
+class RedisBlobIndex(object):
+    """
+    Names of the blobs in a bucket, shared by all the processes
+    """
+
+    KEY_PREFIX = 'na_api:blobs:'
+    LOAD_BATCH_SIZE = 1000
+
+    def __init__(self, url, bucket_name):
+        import redis
+
+        self.redis = redis.StrictRedis.from_url(url)
+        self.key = self.KEY_PREFIX + bucket_name
+        self.loaded_key = self.key + ':loaded'
+
+    def is_loaded(self):
+        return bool(self.redis.exists(self.loaded_key))
+
+    def load(self, names):
+        names = list(names)
+
+        pipeline = self.redis.pipeline()
+        pipeline.delete(self.key)
+        for i in range(0, len(names), self.LOAD_BATCH_SIZE):
+            pipeline.sadd(self.key, *names[i:i + self.LOAD_BATCH_SIZE])
+        pipeline.set(self.loaded_key, 1)
+        pipeline.execute()
+
+    def add(self, name):
+        self.redis.sadd(self.key, name)
+
+    def contains(self, name):
+        return bool(self.redis.sismember(self.key, name))
@@ -3,28 +3,101 @@ import os
 
 from flask import current_app
 
+from google.api_core.exceptions import ServerError, TooManyRequests
 from google.auth import compute_engine
+from google.auth.exceptions import TransportError
 from google.cloud import storage
+import requests
+
+from app.comms.breakers import GOOGLE_STORAGE, get_breaker
+from app.errors import CircuitOpenError
+from app.storage.index import MemoryBlobIndex, RedisBlobIndex
+
+# errors from google storage being unavailable or throttling, client errors are not storage failing
+GOOGLE_ERRORS = (
+    ServerError,
+    TooManyRequests,
+    TransportError,
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+)
+
+# errors from google storage being unavailable, the call can be made again later
+STORAGE_ERRORS = (CircuitOpenError,) + GOOGLE_ERRORS
+
+# files up to this size are sent in a single multipart upload by google storage
+MAX_MULTIPART_SIZE = 8 * 1024 * 1024
+
+# the client and buckets are shared by all the requests in a process, and created again in a forked worker
+_clients = {}
+
+
+def _get_client_and_buckets():
+    pid = os.getpid()
+    if pid not in _clients:
+        _clients.clear()
+
+        if not os.environ.get("GOOGLE_APPLICATION_CREDENTIALS"):
+            credentials = compute_engine.Credentials()
+            storage_client = storage.Client(credentials=credentials, project=current_app.config['PROJECT'])
+        else:
+            storage_client = storage.Client()
+
+        _clients[pid] = (storage_client, {}, {})
+    return _clients[pid]
+
+
+def _create_index(bucket_name):
+    backend = current_app.config.get('STORAGE_INDEX_BACKEND')
+    if backend == 'redis':
+        return RedisBlobIndex(current_app.config['CACHE_REDIS_URL'], bucket_name)
+    elif backend == 'memory':
+        return MemoryBlobIndex()
 
 
 class Storage(object):
 
     def __init__(self, bucket_name):
+        self.breaker = get_breaker(GOOGLE_STORAGE)
+
         if self.no_google_config():
             current_app.logger.info('Google credentials not available')
             return
 
-        if not os.environ.get("GOOGLE_APPLICATION_CREDENTIALS"):
-            credentials = compute_engine.Credentials()
-            self.storage_client = storage.Client(credentials=credentials, project=current_app.config['PROJECT'])
-        else:
-            self.storage_client = storage.Client()
+        self.storage_client, buckets, indexes = _get_client_and_buckets()
+
+        if bucket_name not in indexes:
+            indexes[bucket_name] = _create_index(bucket_name)
+        self.index = indexes[bucket_name]
+
+        self.bucket = buckets.get(bucket_name)
+        if not self.bucket:
+            self.bucket = self.call(self.storage_client.lookup_bucket, bucket_name)
+            if not self.bucket:
+                self.bucket = self.call(self.storage_client.create_bucket, bucket_name)
+                current_app.logger.info('Bucket {} created'.format(self.bucket.name))
+            buckets[bucket_name] = self.bucket
+
+    def call(self, func, *args, **kwargs):
+        """
+        Calls google storage through the circuit breaker, so that calls fail fast while it is unavailable
+        """
+        return self.breaker.call(GOOGLE_ERRORS, func, *args, **kwargs)
+
+    def warm_index(self):
+        """
+        Loads the blob names with one paginated listing when the index is not loaded yet,
+        so that checking many blobs, as an import does, does not make a request for each of them
+        """
+        if self.no_google_config() or not self.index or self.index.is_loaded():
+            return
 
-        if bucket_name not in [b.name for b in self.storage_client.list_buckets()]:
-            self.bucket = self.storage_client.create_bucket(bucket_name)
-            current_app.logger.info('Bucket {} created'.format(self.bucket.name))
-        else:
-            self.bucket = self.storage_client.get_bucket(bucket_name)
+        self.index.load(
+            self.call(lambda: [b.name for b in self.bucket.list_blobs(fields='items(name),nextPageToken')]))
+
+    def _add_to_index(self, blob_name):
+        if self.index and self.index.is_loaded():
+            self.index.add(blob_name)
 
     def no_google_config(self):
         return (
@@ -39,10 +112,12 @@ class Storage(object):
 
         blob = self.bucket.blob(destination_blob_name)
 
-        blob.upload_from_filename(source_file_name)
+        self.call(blob.upload_from_filename, source_file_name)
 
         if set_public:
-            blob.make_public()
+            self.call(blob.make_public)
+
+        self._add_to_index(destination_blob_name)
 
         current_app.logger.info('File {} uploaded to {}'.format(
             source_file_name,
@@ -54,16 +129,18 @@ class Storage(object):
         if self.no_google_config():
             current_app.logger.info(
                 'No Google config, upload_blob_from_base64string: fielname: '
-                '%s, destination: %s, base64data: %s, content_type %s',
-                image_filename, destination_blob_name, base64data, content_type)
+                '%s, destination: %s, base64data: %d characters, content_type %s',
+                image_filename, destination_blob_name, len(base64data), content_type)
             return
 
         blob = self.bucket.blob(destination_blob_name)
 
         binary = base64.b64decode(base64data)
 
-        blob.upload_from_string(binary, content_type=content_type)
-        blob.make_public()
+        self.call(blob.upload_from_string, binary, content_type=content_type)
+        self.call(blob.make_public)
+
+        self._add_to_index(destination_blob_name)
 
         binary_len = len(binary)
         current_app.logger.info('Uploaded {} file {} uploaded to {}'.format(
@@ -71,14 +148,42 @@ class Storage(object):
             image_filename,
             destination_blob_name))
 
-    def blob_exists(self, prefix, delimiter=None):
+    def upload_blob_from_file(self, file_obj, destination_blob_name, content_type, size=None):
+        """
+        Streams the file to storage, files of unknown size or over 8MB are sent in chunks with a resumable upload
+        """
         if self.no_google_config():
             current_app.logger.info(
-                'No Google config, blob_exists: prefix: %s, delimiter: %s', prefix, delimiter)
+                'No Google config, upload_blob_from_file: destination: %s, content_type %s, size %s',
+                destination_blob_name, content_type, size)
+            return
+
+        chunk_size = None
+        if size is None or size > MAX_MULTIPART_SIZE:
+            chunk_size = current_app.config['STORAGE_UPLOAD_CHUNK_SIZE']
+
+        blob = self.bucket.blob(destination_blob_name, chunk_size=chunk_size)
+
+        self.call(blob.upload_from_file, file_obj, size=size, content_type=content_type)
+        self.call(blob.make_public)
+
+        self._add_to_index(destination_blob_name)
+
+        current_app.logger.info('Streamed file uploaded to {}'.format(destination_blob_name))
+
+    def blob_exists(self, blob_name):
+        if self.no_google_config():
+            current_app.logger.info('No Google config, blob_exists: blob_name: %s', blob_name)
             return
 
-        blobs = self.bucket.list_blobs(prefix=prefix, delimiter=delimiter)
-        return any(True for _ in blobs)
+        if self.index and self.index.is_loaded() and self.index.contains(blob_name):
+            return True
+
+        # blobs uploaded by other processes may not be in the index, this only fetches the blob's metadata
+        exists = self.call(self.bucket.blob(blob_name).exists)
+        if exists:
+            self._add_to_index(blob_name)
+        return exists
 
 
 def sizeof_fmt(num, suffix='B'):
@@ -1,6 +1,9 @@
 import os
+from datetime import datetime, timedelta
 from flask_script import Manager, Server
 from app import create_app, db
+from app.dao.articles_dao import dao_backfill_article_summaries
+from app.dao.emails_dao import dao_get_approved_emails, dao_queue_email
 from flask_migrate import Migrate, MigrateCommand
 
 
@@ -19,5 +22,35 @@ def list_routes():
         print("{:10} {}".format(", ".join(rule.methods - set(['OPTIONS', 'HEAD'])), rule.rule))
 
 
+@manager.command
+def backfill_article_summaries():
+    """Store short content for articles created before summaries were stored."""
+    total = 0
+    while True:
+        updated = dao_backfill_article_summaries()
+        if not updated:
+            break
+        total += updated
+        print("{} articles updated".format(total))
+
+
+@manager.command
+def queue_approved_emails():
+    """Queue sends in the outbox for approved emails which have not expired."""
+    now = datetime.utcnow()
+    for email in dao_get_approved_emails():
+        expires = email.get_expires()
+        if expires and expires <= now:
+            continue
+
+        # matches the send time set when an email is approved
+        send_after = now
+        if now < email.send_starts_at:
+            send_after = email.send_starts_at + timedelta(hours=9)
+
+        queued = dao_queue_email(email, send_after)
+        print("Email {} queued for {} members at {}".format(email.id, queued, send_after))
+
+
 if __name__ == '__main__':
     manager.run()
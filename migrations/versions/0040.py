@@ -0,0 +1,70 @@
+"""empty message
+
+Revision ID: 0040 add page indexes
+Revises: 0039 add token blacklist indexes
+Create Date: 2026-10-18 21:14:09.552301
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '0040 add page indexes'
+down_revision = '0039 add token blacklist indexes'
+
+from alembic import op
+import sqlalchemy as sa
+
+# must match the page sort keys in app/models.py for the indexes to be used
+PAGE_INDEXES = {
+    'articles': "coalesce(old_id, 0)",
+    'events': "coalesce(first_event_datetime, '1900-01-01 00:00:00'::timestamp)",
+    'event_dates': "coalesce(event_datetime, '1900-01-01 00:00:00'::timestamp)",
+    'speakers': "regexp_replace(coalesce(name, ''), '^.* ', '')",
+    'users': "regexp_replace(coalesce(name, ''), '^.* ', '')",
+    'venues': "coalesce(name, '')",
+}
+
+
+def upgrade():
+    op.add_column('events', sa.Column('first_event_datetime', sa.DateTime(), nullable=True))
+
+    op.execute("""
+        CREATE FUNCTION events_first_event_datetime_update() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP <> 'INSERT' THEN
+                UPDATE events SET first_event_datetime = (
+                    SELECT min(event_datetime) FROM event_dates WHERE event_id = OLD.event_id
+                ) WHERE id = OLD.event_id;
+            END IF;
+            IF TG_OP <> 'DELETE' THEN
+                UPDATE events SET first_event_datetime = (
+                    SELECT min(event_datetime) FROM event_dates WHERE event_id = NEW.event_id
+                ) WHERE id = NEW.event_id;
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+
+    op.execute("""
+        CREATE TRIGGER event_dates_first_event_datetime_update
+        AFTER INSERT OR UPDATE OF event_id, event_datetime OR DELETE ON event_dates
+        FOR EACH ROW EXECUTE PROCEDURE events_first_event_datetime_update()
+    """)
+
+    op.execute("""
+        UPDATE events SET first_event_datetime = (
+            SELECT min(event_datetime) FROM event_dates WHERE event_id = events.id
+        )
+    """)
+
+    for table, sort_key in PAGE_INDEXES.items():
+        op.create_index('ix_{}_page'.format(table), table, [sa.text(sort_key), 'id'], unique=False)
+
+
+def downgrade():
+    for table in PAGE_INDEXES.keys():
+        op.drop_index('ix_{}_page'.format(table), table_name=table)
+
+    op.execute("DROP TRIGGER event_dates_first_event_datetime_update ON event_dates")
+    op.execute("DROP FUNCTION events_first_event_datetime_update()")
+    op.drop_column('events', 'first_event_datetime')
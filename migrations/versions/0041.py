@@ -0,0 +1,45 @@
+"""empty message
+
+Revision ID: 0041 touch event dates speakers
+Revises: 0040 add page indexes
+Create Date: 2026-10-18 21:52:30.118204
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '0041 touch event dates speakers'
+down_revision = '0040 add page indexes'
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade():
+    # changing an event date's speakers only writes to the link table, so updated_at is set here
+    # for the table versions used by the ETags to change
+    op.execute("""
+        CREATE FUNCTION event_date_to_speaker_touch_event_date() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP <> 'INSERT' THEN
+                UPDATE event_dates SET updated_at = timezone('utc', clock_timestamp())
+                WHERE id = OLD.event_date_id;
+            END IF;
+            IF TG_OP <> 'DELETE' THEN
+                UPDATE event_dates SET updated_at = timezone('utc', clock_timestamp())
+                WHERE id = NEW.event_date_id;
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+
+    op.execute("""
+        CREATE TRIGGER event_date_to_speaker_touch_event_date
+        AFTER INSERT OR UPDATE OR DELETE ON event_date_to_speaker
+        FOR EACH ROW EXECUTE PROCEDURE event_date_to_speaker_touch_event_date()
+    """)
+
+
+def downgrade():
+    op.execute("DROP TRIGGER event_date_to_speaker_touch_event_date ON event_date_to_speaker")
+    op.execute("DROP FUNCTION event_date_to_speaker_touch_event_date()")
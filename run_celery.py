@@ -7,3 +7,6 @@ from app import celery, create_app  # noqa
 
 application = create_app()
 application.app_context().push()
+
+# registers the tasks that aren't imported by the app, once celery has been set up
+from app.na_celery import blacklist_tasks, email_tasks  # noqa
@@ -79,6 +79,7 @@ if [ $port != 'No environment' ]; then
     export GOOGLE_APPLICATION_CREDENTIALS=$GOOGLE_APPLICATION_CREDENTIALS
     export TRAVIS_COMMIT=$TRAVIS_COMMIT
     export CELERY_BROKER_URL=$CELERY_BROKER_URL
+    export CELERY_CONCURRENCY=$CELERY_CONCURRENCY
     export JWT_SECRET=$JWT_SECRET
 
     # if [ -z $GOOGLE_AUTH_USER ]; then
@@ -7,4 +7,8 @@ if [ -z "$VIRTUAL_ENV" ] && [ -d venv ]; then
   nooutput=' >&- 2>&- <&- &'
 fi
 
-eval "celery -A run_celery.celery worker --loglevel=INFO --concurrency=1"$nooutput
+# a worker process for each task run at the same time, send_queued_emails runs overlap when sending takes
+# longer than a minute and the runs claim different sends
+concurrency=${CELERY_CONCURRENCY:-4}
+
+eval "celery -A run_celery.celery worker --beat --loglevel=INFO --concurrency=$concurrency"$nooutput
@@ -85,7 +85,6 @@ class WhenDoingLogout(object):
     def it_logs_the_user_out_and_adds_token_to_blacklist(
             self, client, mocker, url, create_header, sample_decoded_token):
         mock_store_token = mocker.patch("app.routes.authentication.rest.store_token")
-        mock_prune_database = mocker.patch("app.routes.authentication.rest.prune_database")
         mocker.patch(
             "app.routes.authentication.rest.get_raw_jwt",
             return_value=sample_decoded_token
@@ -99,7 +98,6 @@ class WhenDoingLogout(object):
 
         json_resp = json.loads(response.get_data(as_text=True))
         assert json_resp['logout']
-        assert mock_prune_database.called
         mock_store_token.assert_called_with(sample_decoded_token)
 
 
@@ -0,0 +1,53 @@
+from freezegun import freeze_time
+
+from app.caching.backends import LRUCacheBackend
+
+
+class WhenUsingLRUCacheBackend(object):
+
+    def it_gets_a_stored_value(self):
+        backend = LRUCacheBackend(2)
+        backend.set('key', 'value', 60)
+
+        assert backend.get('key') == 'value'
+
+    def it_evicts_the_least_recently_used_entry(self):
+        backend = LRUCacheBackend(2)
+        backend.set('key 1', 'value 1', 60)
+        backend.set('key 2', 'value 2', 60)
+        backend.get('key 1')
+        backend.set('key 3', 'value 3', 60)
+
+        assert backend.get('key 1') == 'value 1'
+        assert not backend.get('key 2')
+        assert backend.size() == 2
+
+    def it_deletes_an_entry(self):
+        backend = LRUCacheBackend(2)
+        backend.set('key', 'value', 60)
+        backend.delete('key')
+
+        assert not backend.get('key')
+
+    def it_does_not_return_expired_entries(self):
+        backend = LRUCacheBackend(2)
+        with freeze_time("2018-01-10T19:00:00"):
+            backend.set('key', 'value', 60)
+
+        with freeze_time("2018-01-10T19:01:01"):
+            assert not backend.get('key')
+
+    def it_uses_the_versions_backend_for_tag_versions(self, mocker):
+        versions = mocker.Mock()
+        versions.get_versions.return_value = [2]
+        backend = LRUCacheBackend(2, versions=versions)
+        backend.incr_versions(['events'])
+
+        assert backend.get_versions(['events']) == [2]
+        versions.incr_versions.assert_called_once_with(['events'])
+
+    def it_increments_tag_versions(self):
+        backend = LRUCacheBackend(2)
+        backend.incr_versions(['events'])
+
+        assert backend.get_versions(['events', 'venues']) == [1, 0]
@@ -0,0 +1,66 @@
+from flask import url_for
+
+from tests.conftest import create_authorization_header
+from tests.db import create_article
+
+
+class WhenMakingConditionalRequests(object):
+
+    def it_returns_304_if_etag_matches(self, client, sample_article, db_session):
+        response = client.get(
+            url_for('articles.get_articles_summary'),
+            headers=[create_authorization_header()]
+        )
+        assert response.status_code == 200
+        assert response.headers['ETag']
+        assert response.headers['Last-Modified']
+
+        response = client.get(
+            url_for('articles.get_articles_summary'),
+            headers=[create_authorization_header(), ('If-None-Match', response.headers['ETag'])]
+        )
+
+        assert response.status_code == 304
+        assert not response.get_data(as_text=True)
+
+    def it_returns_200_if_table_has_changed(self, client, sample_article, db_session):
+        response = client.get(
+            url_for('articles.get_articles_summary'),
+            headers=[create_authorization_header()]
+        )
+        etag = response.headers['ETag']
+
+        create_article(old_id=2, title='New article')
+
+        response = client.get(
+            url_for('articles.get_articles_summary'),
+            headers=[create_authorization_header(), ('If-None-Match', etag)]
+        )
+
+        assert response.status_code == 200
+        assert response.headers['ETag'] != etag
+
+    def it_returns_304_if_not_modified_since(self, client, sample_article, db_session):
+        response = client.get(
+            url_for('articles.get_articles'),
+            headers=[create_authorization_header()]
+        )
+
+        response = client.get(
+            url_for('articles.get_articles'),
+            headers=[create_authorization_header(), ('If-Modified-Since', response.headers['Last-Modified'])]
+        )
+
+        assert response.status_code == 304
+
+    def it_uses_a_different_etag_for_each_url(self, client, sample_article, db_session):
+        summary_response = client.get(
+            url_for('articles.get_articles_summary'),
+            headers=[create_authorization_header()]
+        )
+        articles_response = client.get(
+            url_for('articles.get_articles'),
+            headers=[create_authorization_header()]
+        )
+
+        assert summary_response.headers['ETag'] != articles_response.headers['ETag']
@@ -0,0 +1,80 @@
+from flask import jsonify
+import pytest
+
+from app.caching import ResponseCache
+from app.caching.backends import LRUCacheBackend
+
+
+@pytest.fixture
+def response_cache(app):
+    response_cache = ResponseCache()
+    response_cache.backend = LRUCacheBackend(10)
+    response_cache.ttl = 60
+    return response_cache
+
+
+class WhenUsingResponseCache(object):
+
+    def it_returns_a_cached_response(self, app, mocker, response_cache):
+        view = mocker.Mock(return_value=jsonify({'title': 'test'}))
+        cached_view = response_cache.cached('events')(view)
+
+        with app.test_request_context('/events'):
+            cached_view()
+            response = cached_view()
+
+        assert view.call_count == 1
+        assert response.get_data(as_text=True) == jsonify({'title': 'test'}).get_data(as_text=True)
+        assert response_cache.stats()['hits'] == 1
+        assert response_cache.stats()['misses'] == 1
+
+    def it_calls_the_view_again_after_invalidation(self, app, mocker, response_cache):
+        view = mocker.Mock(return_value=jsonify({'title': 'test'}))
+        cached_view = response_cache.cached('events', 'venues')(view)
+
+        @response_cache.invalidates('venues')
+        def update_venue():
+            pass
+
+        with app.test_request_context('/events'):
+            cached_view()
+            update_venue()
+            cached_view()
+
+        assert view.call_count == 2
+
+    def it_caches_responses_by_query_string(self, app, mocker, response_cache):
+        view = mocker.Mock(return_value=jsonify([]))
+        cached_view = response_cache.cached('articles')(view)
+
+        with app.test_request_context('/articles?limit=1'):
+            cached_view()
+
+        with app.test_request_context('/articles?limit=2'):
+            cached_view()
+
+        assert view.call_count == 2
+
+    def it_does_not_cache_error_responses(self, app, mocker, response_cache):
+        view = mocker.Mock(return_value=(jsonify({'result': 'error'}), 400))
+        cached_view = response_cache.cached('articles')(view)
+
+        with app.test_request_context('/articles'):
+            cached_view()
+            cached_view()
+
+        assert view.call_count == 2
+
+    def it_is_disabled_without_redis_to_share_the_tag_versions(self, app, mocker):
+        mocker.patch.dict(app.config, {'CACHE_BACKEND': 'memory', 'CACHE_REDIS_URL': None})
+        response_cache = ResponseCache()
+        response_cache.init_app(app)
+
+        assert not response_cache.backend
+
+    def it_passes_through_when_disabled(self, app, mocker):
+        view = mocker.Mock(return_value='response')
+        cached_view = ResponseCache().cached('articles')(view)
+
+        with app.test_request_context('/articles'):
+            assert cached_view() == 'response'
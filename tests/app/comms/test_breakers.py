@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta
+import pytest
+
+from app.comms.breakers import CircuitBreaker, breakers_status, CLOSED, HALF_OPEN, OPEN
+from app.errors import CircuitOpenError
+
+
+class ProviderError(Exception):
+    pass
+
+
+def _fail():
+    raise ProviderError()
+
+
+def _succeed():
+    return 'ok'
+
+
+class WhenUsingCircuitBreakers:
+
+    def it_opens_after_consecutive_failures(self, app):
+        breaker = CircuitBreaker('test', failure_threshold=2, reset_timeout=30)
+
+        for _ in range(2):
+            with pytest.raises(ProviderError):
+                breaker.call(ProviderError, _fail)
+
+        assert breaker.state == OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.call(ProviderError, _succeed)
+
+    def it_resets_failures_after_a_success(self, app):
+        breaker = CircuitBreaker('test', failure_threshold=2, reset_timeout=30)
+
+        with pytest.raises(ProviderError):
+            breaker.call(ProviderError, _fail)
+        breaker.call(ProviderError, _succeed)
+        with pytest.raises(ProviderError):
+            breaker.call(ProviderError, _fail)
+
+        assert breaker.state == CLOSED
+
+    def it_lets_one_probe_through_once_the_reset_timeout_passes(self, app):
+        breaker = CircuitBreaker('test', failure_threshold=1, reset_timeout=30)
+        with pytest.raises(ProviderError):
+            breaker.call(ProviderError, _fail)
+        breaker.opened_at = datetime.utcnow() - timedelta(seconds=31)
+
+        breaker.before_call()
+
+        assert breaker.state == HALF_OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+
+        breaker.record_success()
+        assert breaker.state == CLOSED
+
+    def it_opens_again_if_the_probe_fails(self, app):
+        breaker = CircuitBreaker('test', failure_threshold=3, reset_timeout=30)
+        breaker.state = OPEN
+        breaker.opened_at = datetime.utcnow() - timedelta(seconds=31)
+
+        with pytest.raises(ProviderError):
+            breaker.call(ProviderError, _fail)
+
+        assert breaker.state == OPEN
+        assert breaker.is_open()
+
+    def it_returns_the_status_of_each_provider(self, app):
+        assert set(breakers_status().keys()) == {'email_provider', 'google_storage', 'paypal'}
@@ -1,7 +1,9 @@
-from mock import call
+from mock import call, Mock
 import pytest
+import requests
 
-from app.comms.email import send_email
+from app.comms.email import send_batch_email, send_email
+from app.comms.sessions import ProviderUnavailableError
 
 
 @pytest.fixture
@@ -26,3 +28,71 @@ class WhenSendingAnEmail:
         assert mock_logger.call_args == call(
             "Email not configured, email would have sent: {'to': 'test@example.com', 'html': 'test message',"
             " 'from': 'noreply@example.com', 'subject': 'test subject'}")
+
+
+class WhenSendingABatchEmail:
+
+    @pytest.fixture
+    def mock_provider_config(self, mocker):
+        mocker.patch(
+            'flask.current_app.config',
+            {
+                'EMAIL_DOMAIN': 'example.com',
+                'EMAIL_PROVIDER_URL': 'http://email-provider',
+                'EMAIL_PROVIDER_APIKEY': 'apikey'
+            }
+        )
+
+    def it_sends_to_all_recipients_in_one_call(self, app, mocker, mock_provider_config):
+        mock_post = Mock(return_value=Mock(status_code=200))
+        mocker.patch('app.comms.email.get_session', return_value=Mock(post=mock_post))
+        to = ['test1@example.com', 'test2@example.com']
+
+        status_codes = send_batch_email(to, 'test subject', 'test message', {t: {} for t in to})
+
+        assert mock_post.call_count == 1
+        assert mock_post.call_args[1]['data']['to'] == to
+        assert status_codes == {'test1@example.com': 200, 'test2@example.com': 200}
+
+    def it_records_each_recipients_status_if_the_batch_is_rejected(self, app, mocker, mock_provider_config):
+        rejected = Mock(status_code=400)
+        rejected.raise_for_status.side_effect = requests.exceptions.HTTPError(response=rejected)
+        mock_post = Mock(side_effect=[rejected, Mock(status_code=200), rejected])
+        mocker.patch('app.comms.email.get_session', return_value=Mock(post=mock_post))
+        to = ['test1@example.com', 'invalid']
+
+        status_codes = send_batch_email(to, 'test subject', 'test message', {t: {} for t in to})
+
+        assert mock_post.call_count == 3
+        assert status_codes == {'test1@example.com': 200, 'invalid': 400}
+
+    def it_raises_without_splitting_the_batch_if_throttled(self, app, mocker, mock_provider_config):
+        mock_post = Mock(side_effect=ProviderUnavailableError(response=Mock(status_code=429)))
+        mocker.patch('app.comms.email.get_session', return_value=Mock(post=mock_post))
+        to = ['test1@example.com', 'test2@example.com']
+
+        with pytest.raises(ProviderUnavailableError):
+            send_batch_email(to, 'test subject', 'test message', {t: {} for t in to})
+
+        assert mock_post.call_count == 1
+
+    def it_returns_the_statuses_sent_so_far_if_throttled_while_sending_separately(
+            self, app, mocker, mock_provider_config):
+        throttled = ProviderUnavailableError(response=Mock(status_code=429))
+        mock_post = Mock(side_effect=[Mock(status_code=400), Mock(status_code=200), throttled])
+        mocker.patch('app.comms.email.get_session', return_value=Mock(post=mock_post))
+        to = ['test1@example.com', 'test2@example.com', 'test3@example.com']
+
+        status_codes = send_batch_email(to, 'test subject', 'test message', {t: {} for t in to})
+
+        assert mock_post.call_count == 3
+        assert status_codes == {'test1@example.com': 200}
+
+    def it_records_the_status_if_a_single_recipient_is_rejected(self, app, mocker, mock_provider_config):
+        rejected = Mock(status_code=400)
+        rejected.raise_for_status.side_effect = requests.exceptions.HTTPError(response=rejected)
+        mocker.patch('app.comms.email.get_session', return_value=Mock(post=Mock(return_value=rejected)))
+
+        status_codes = send_batch_email(['invalid'], 'test subject', 'test message', {'invalid': {}})
+
+        assert status_codes == {'invalid': 400}
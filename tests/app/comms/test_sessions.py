@@ -0,0 +1,52 @@
+from mock import Mock
+import pytest
+
+from app.comms.sessions import PooledSession, ProviderUnavailableError, get_session, sessions_stats
+
+
+class WhenUsingPooledSessions:
+
+    def it_reuses_the_session_for_a_service(self, app):
+        assert get_session('test') is get_session('test')
+        assert get_session('test') is not get_session('other test')
+
+    def it_applies_the_configured_timeouts(self, app, mocker):
+        mock_request = mocker.patch('requests.Session.request', return_value=Mock(status_code=200))
+        session = get_session('test')
+
+        session.post('http://example.com', data={})
+
+        assert mock_request.call_args[1]['timeout'] == (
+            app.config['HTTP_CONNECT_TIMEOUT'], app.config['HTTP_READ_TIMEOUT'])
+
+    def it_retries_when_throttled_or_unavailable(self, app):
+        session = PooledSession('test', timeout=1, retries=2, backoff=0.1, pool_size=1)
+
+        retry = session.adapter.max_retries
+        assert retry.total == 2
+        assert retry.is_retry('POST', 429)
+        assert retry.is_retry('POST', 503)
+        assert not retry.is_retry('POST', 400)
+
+    def it_raises_when_still_throttled_or_unavailable(self, app, mocker):
+        mocker.patch('requests.Session.request', return_value=Mock(status_code=503, reason='Service Unavailable'))
+        session = get_session('unavailable test')
+
+        with pytest.raises(ProviderUnavailableError):
+            session.post('http://example.com', data={})
+
+    def it_returns_client_errors_for_the_caller_to_check(self, app, mocker):
+        mocker.patch('requests.Session.request', return_value=Mock(status_code=400))
+        session = get_session('test')
+
+        assert session.post('http://example.com', data={}).status_code == 400
+
+    def it_does_not_retry_after_a_read_error(self, app):
+        session = PooledSession('test', timeout=1, retries=2, backoff=0.1, pool_size=1)
+
+        assert session.adapter.max_retries.read == 0
+
+    def it_returns_connection_stats(self, app):
+        get_session('test')
+
+        assert sessions_stats()['test'] == {'requests': 0, 'connections': 0, 'reused': 0}
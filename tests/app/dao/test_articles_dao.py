@@ -1,8 +1,16 @@
 import json
 
-from app.dao.articles_dao import dao_create_article, dao_update_article, dao_get_articles, dao_get_article_by_id
+from app.dao.articles_dao import (
+    dao_backfill_article_summaries,
+    dao_create_article,
+    dao_update_article,
+    dao_get_articles,
+    dao_get_articles_summary,
+    dao_get_article_by_id
+)
 from app.models import Article
 
+from tests.conftest import count_queries
 from tests.db import create_article
 
 
@@ -35,3 +43,47 @@ class WhenUsingArticlesDAO:
 
         fetched_article = dao_get_article_by_id(article.id)
         assert fetched_article == article
+
+    def it_stores_summary_content_on_create(self, db_session):
+        article = create_article(content='<h1>Egypt</h1> some info')
+
+        article_from_db = Article.query.filter(Article.id == article.id).first()
+
+        assert article_from_db.short_content == 'Egypt some info'
+        assert article_from_db.very_short_content == 'Egypt some info'
+
+    def it_updates_summary_content_when_content_updated(self, db, db_session, sample_article):
+        dao_update_article(sample_article.id, content='<p>New content</p>')
+
+        article_from_db = Article.query.filter(Article.id == sample_article.id).first()
+
+        assert article_from_db.short_content == 'New content'
+        assert article_from_db.very_short_content == 'New content'
+
+    def it_gets_articles_summary(self, db, db_session, sample_article):
+        articles_from_db = dao_get_articles_summary()
+
+        assert articles_from_db == [sample_article]
+        assert articles_from_db[0].serialize_summary()['short_content'] == sample_article.content
+
+    def it_gets_articles_summary_not_backfilled_without_loading_content_again(
+            self, db, db_session, sample_article):
+        Article.query.update({'short_content': None, 'very_short_content': None})
+        db.session.commit()
+
+        articles_from_db = dao_get_articles_summary()
+        with count_queries(db) as counter:
+            summary = articles_from_db[0].serialize_summary()
+
+        assert summary['short_content'] == sample_article.content
+        assert counter.count == 0
+
+    def it_backfills_article_summaries(self, db, db_session, sample_article):
+        Article.query.update({'short_content': None, 'very_short_content': None})
+        db.session.commit()
+
+        assert dao_backfill_article_summaries() == 1
+        assert dao_backfill_article_summaries() == 0
+
+        article_from_db = Article.query.filter(Article.id == sample_article.id).first()
+        assert article_from_db.short_content == sample_article.content
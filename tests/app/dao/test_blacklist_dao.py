@@ -7,7 +7,9 @@ from flask_jwt_extended import (
 )
 
 from app.routes.authentication.errors import TokenNotFound
-from app.dao.blacklist_dao import store_token, is_token_revoked, get_user_tokens, unrevoke_token, prune_database
+from app.dao.blacklist_dao import (
+    check_token_revoked, store_token, is_token_revoked, get_user_tokens, unrevoke_token, prune_database
+)
 from app.models import TokenBlacklist
 from tests.conftest import get_unixtime_start_and_expiry
 from tests.db import create_token_blacklist
@@ -45,6 +47,33 @@ class WhenUsingBlacklistDAO(object):
     def it_checks_if_token_is_not_revoked(self, db_session, sample_decoded_token):
         assert not is_token_revoked(sample_decoded_token)
 
+    def it_checks_if_token_is_revoked_using_the_cache(self, mocker, db_session, sample_decoded_token):
+        mocker.patch('app.dao.blacklist_dao.revoked_tokens.is_revoked', return_value=True)
+        mock_is_token_revoked = mocker.patch('app.dao.blacklist_dao.is_token_revoked')
+
+        assert check_token_revoked(sample_decoded_token)
+        assert not mock_is_token_revoked.called
+
+    def it_checks_the_database_if_the_cache_is_unavailable(self, db_session, sample_decoded_token):
+        create_token_blacklist(sample_decoded_token)
+
+        assert check_token_revoked(sample_decoded_token)
+
+    def it_remembers_tokens_which_are_not_revoked(self, mocker, db_session, sample_decoded_token):
+        assert not check_token_revoked(sample_decoded_token)
+
+        mock_is_token_revoked = mocker.patch('app.dao.blacklist_dao.is_token_revoked')
+
+        assert not check_token_revoked(sample_decoded_token)
+        assert not mock_is_token_revoked.called
+
+    def it_checks_a_token_again_once_it_is_revoked(self, db_session, sample_decoded_token):
+        assert not check_token_revoked(sample_decoded_token)
+
+        create_token_blacklist(sample_decoded_token)
+
+        assert check_token_revoked(sample_decoded_token)
+
     def it_gets_user_tokens(self, db_session, sample_decoded_token):
         another_token = {
             'jti': 'test',
@@ -97,3 +126,11 @@ class WhenUsingBlacklistDAO(object):
         prune_database()
 
         assert len(TokenBlacklist.query.all()) == 1
+
+    def it_prunes_database_in_batches(self, db_session, sample_decoded_token):
+        create_token_blacklist(sample_decoded_token)
+        create_token_blacklist(sample_decoded_token)
+        create_token_blacklist(sample_decoded_token)
+
+        assert prune_database(batch_size=2) == 3
+        assert TokenBlacklist.query.all() == []
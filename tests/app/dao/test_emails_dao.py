@@ -4,12 +4,14 @@ from sqlalchemy.exc import IntegrityError
 
 from app.dao.emails_dao import (
     dao_add_member_sent_to_email,
+    dao_claim_email_quota,
     dao_get_emails_for_year_starting_on,
     dao_get_email_by_id,
+    dao_get_approved_emails,
     dao_get_future_emails,
     dao_update_email,
 )
-from app.models import Email, EmailToMember
+from app.models import Email, EmailToMember, APPROVED
 
 from tests.db import create_email, create_member
 
@@ -107,3 +109,18 @@ class WhenUsingEmailsDAO(object):
         assert emails_from_db[0] == active_email
         assert emails_from_db[1] == active_email_2
         assert emails_from_db[2] == active_email_3
+
+    def it_gets_approved_emails(self, db, db_session):
+        email = create_email(old_id=1, send_starts_at='2019-07-10')
+        email_2 = create_email(old_id=2, send_starts_at='2019-07-01')
+        create_email(old_id=3, send_starts_at='2019-07-05')
+        dao_update_email(email.id, email_state=APPROVED)
+        dao_update_email(email_2.id, email_state=APPROVED)
+
+        assert dao_get_approved_emails() == [email_2, email]
+
+    def it_claims_email_quota_up_to_the_limit(self, db, db_session):
+        assert dao_claim_email_quota(3, 5, day='2019-06-10') == 3
+        assert dao_claim_email_quota(3, 5, day='2019-06-10') == 2
+        assert dao_claim_email_quota(3, 5, day='2019-06-10') == 0
+        assert dao_claim_email_quota(3, 5, day='2019-06-11') == 3
@@ -1,3 +1,5 @@
+import uuid
+
 from freezegun import freeze_time
 
 from app.dao.event_dates_dao import dao_get_event_date_by_id
@@ -12,6 +14,7 @@ from app.dao.events_dao import (
     dao_get_future_events,
     dao_get_limited_events,
     dao_get_past_year_events,
+    dao_import_events,
 )
 from app.models import Event, EventDate, RejectReason
 
@@ -152,6 +155,25 @@ class WhenUsingEventsDAO(object):
         assert len(events_from_db) == 1
         assert events_from_db[0] == sample_event_with_dates
 
+    @freeze_time("2018-01-10T19:00:00")
+    def it_gets_future_events_once_ordered_by_first_date(self, db, db_session, sample_event_type):
+        multi_date_event = create_event(
+            title='multi date event',
+            event_type_id=sample_event_type.id,
+            event_dates=[
+                create_event_date(event_datetime='2018-01-30T19:00:00'),
+                create_event_date(event_datetime='2018-01-15T19:00:00'),
+            ]
+        )
+        event = create_event(
+            title='future event',
+            event_type_id=sample_event_type.id,
+            event_dates=[create_event_date(event_datetime='2018-01-20T19:00:00')]
+        )
+        events_from_db = dao_get_future_events()
+
+        assert events_from_db == [multi_date_event, event]
+
     def it_gets_events_in_year(self, db, db_session, sample_event_with_dates, sample_event_type):
         event_2 = create_event(
             title='2018 event',
@@ -190,3 +212,14 @@ class WhenUsingEventsDAO(object):
         assert len(events_from_db) == 2
         assert events_from_db[0] == event_2
         assert events_from_db[1] == sample_event_with_dates
+
+    def it_imports_events_skipping_events_that_fail(self, db, db_session, sample_event_type):
+        event = Event(old_id=1, title='imported', event_type_id=sample_event_type.id)
+        bad_event = Event(old_id=2, title='unknown event type', event_type_id=uuid.uuid4())
+
+        imported, failed = dao_import_events([event, bad_event])
+
+        assert imported == [event]
+        assert [e for e, _ in failed] == [bad_event]
+        assert Event.query.count() == 1
+        assert Event.query.one().title == 'imported'
@@ -0,0 +1,74 @@
+from datetime import datetime
+
+import pytest
+
+from app.dao.event_dates_dao import dao_get_event_dates_page
+from app.dao.events_dao import dao_get_events_page
+from app.dao.pagination import decode_cursor, encode_cursor
+from app.dao.speakers_dao import dao_get_speakers_page
+from app.dao.venues_dao import dao_get_venues_page
+from app.errors import InvalidRequest
+
+from tests.db import create_event, create_event_date, create_speaker, create_venue
+
+
+class WhenPaginating(object):
+
+    @pytest.mark.parametrize('sort_value', [
+        1, 'Head office', datetime(2018, 1, 20, 19, 0)
+    ])
+    def it_decodes_an_encoded_cursor(self, sort_value, sample_uuid):
+        cursor = encode_cursor(sort_value, sample_uuid)
+
+        assert decode_cursor(cursor) == (sort_value, sample_uuid)
+
+    def it_raises_an_invalid_request_for_a_bad_cursor(self):
+        with pytest.raises(InvalidRequest):
+            decode_cursor('not a cursor')
+
+    def it_pages_through_venues(self, db, db_session):
+        venues = [create_venue(name=name) for name in ['Venue C', 'Venue A', 'Venue B']]
+
+        page, next_cursor = dao_get_venues_page(limit=2)
+
+        assert page == [venues[1], venues[2]]
+        assert next_cursor
+
+        page, next_cursor = dao_get_venues_page(cursor=next_cursor, limit=2)
+
+        assert page == [venues[0]]
+        assert not next_cursor
+
+    def it_pages_through_speakers_by_last_name(self, db, db_session):
+        speakers = [create_speaker(name=name) for name in ['Mary Brown', 'Alice White', 'John Smith']]
+
+        page, next_cursor = dao_get_speakers_page(limit=2)
+        next_page, last_cursor = dao_get_speakers_page(cursor=next_cursor, limit=2)
+
+        assert page == [speakers[0], speakers[2]]
+        assert next_page == [speakers[1]]
+        assert not last_cursor
+
+    def it_pages_through_events_by_first_event_date(self, db, db_session):
+        later = create_event(
+            title='later', event_dates=[create_event_date(event_datetime='2018-03-01 19:00')])
+        earlier = create_event(
+            title='earlier', event_dates=[create_event_date(event_datetime='2018-02-01 19:00')])
+        without_dates = create_event(title='without dates')
+
+        page, next_cursor = dao_get_events_page(limit=2)
+        next_page, last_cursor = dao_get_events_page(cursor=next_cursor, limit=2)
+
+        assert page == [without_dates, earlier]
+        assert next_page == [later]
+        assert not last_cursor
+
+    def it_pages_through_event_dates_without_a_date(self, db, db_session):
+        event_date = create_event_date(event_datetime='2018-03-01 19:00')
+        event_date_without_date = create_event_date(event_datetime=None)
+
+        page, next_cursor = dao_get_event_dates_page(limit=1)
+        next_page, _ = dao_get_event_dates_page(cursor=next_cursor, limit=1)
+
+        assert page == [event_date_without_date]
+        assert next_page == [event_date]
@@ -0,0 +1,27 @@
+from app.dao.articles_dao import dao_update_article
+from app.dao.table_versions_dao import dao_get_table_versions
+from app.models import Article, EventDate, Venue
+
+from tests.db import create_event_date, create_speaker
+
+
+class WhenUsingTableVersionsDAO(object):
+
+    def it_gets_count_and_latest_updated_at(self, db, db_session, sample_article):
+        assert dao_get_table_versions(Article, Venue) == [(1, sample_article.updated_at), (0, None)]
+
+    def it_changes_version_on_update(self, db, db_session, sample_article):
+        versions = dao_get_table_versions(Article)
+
+        dao_update_article(sample_article.id, title='New title')
+
+        assert dao_get_table_versions(Article) != versions
+
+    def it_changes_event_dates_version_when_speakers_change(self, db, db_session):
+        event_date = create_event_date(speakers=[create_speaker(name='Mary Brown')])
+        versions = dao_get_table_versions(EventDate)
+
+        event_date.speakers = [create_speaker(name='John Smith')]
+        db.session.commit()
+
+        assert dao_get_table_versions(EventDate) != versions
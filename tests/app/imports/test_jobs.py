@@ -0,0 +1,41 @@
+from mock import Mock
+
+from app.dao.import_jobs_dao import dao_get_import_job_by_id, dao_update_import_job
+from app.imports.jobs import run_import_job
+from app.models import Marketing, COMPLETED, FAILED
+
+from tests.db import create_import_job
+
+sample_marketings = [
+    {"id": "1", "marketingtxt": 'Poster', "ordernum": "0", "visible": "1"},
+    {"id": "2", "marketingtxt": 'Leaflet', "ordernum": "1", "visible": "1"},
+    {"id": "1", "marketingtxt": 'Poster', "ordernum": "0", "visible": "1"},
+]
+
+
+class WhenRunningImportJobs:
+
+    def it_imports_a_batch_at_a_time_recording_progress(self, app, mocker, db_session):
+        mocker.patch.dict(app.config, {'IMPORT_BATCH_SIZE': 2})
+        mock_update = mocker.patch('app.imports.jobs.dao_update_import_job', wraps=dao_update_import_job)
+        import_job = create_import_job(data=sample_marketings)
+
+        run_import_job(import_job.id)
+
+        import_job = dao_get_import_job_by_id(import_job.id)
+        assert import_job.state == COMPLETED
+        assert import_job.rows_processed == 3
+        assert import_job.rows_created == 2
+        assert import_job.errors == ['marketing already exists: 1']
+        assert [c[1].get('rows_processed') for c in mock_update.call_args_list] == [None, 2, 3, None]
+        assert Marketing.query.count() == 2
+
+    def it_marks_the_import_job_as_failed(self, mocker, db_session):
+        mocker.patch('app.imports.jobs.IMPORTERS', {'marketings': Mock(side_effect=Exception('unexpected'))})
+        import_job = create_import_job(data=sample_marketings)
+
+        run_import_job(import_job.id)
+
+        import_job = dao_get_import_job_by_id(import_job.id)
+        assert import_job.state == FAILED
+        assert import_job.errors == ['import failed: unexpected']
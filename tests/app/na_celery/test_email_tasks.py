@@ -1,20 +1,177 @@
-from app.na_celery.email_tasks import send_emails
+from datetime import datetime, time, timedelta
+import pytest
+import requests
 
+from app.dao.emails_dao import dao_queue_email
+from app.dao.events_dao import dao_get_event_by_id
+from app.models import Email, EmailOutbox, EmailQuota, EmailToMember, FAILED, PENDING, SENDING, SENT
+from app.na_celery.email_tasks import send_queued_emails
 
-class WhenProcessingSendEmailsTask:
+from tests.db import create_email, create_member
 
-    def it_calls_send_email_to_task(self, mocker, db, db_session, sample_email, sample_member):
-        mock_send_email = mocker.patch('app.na_celery.email_tasks.send_email', return_value=200)
-        send_emails(sample_email.id)
 
-        assert mock_send_email.call_args[0][0] == sample_member.email
+@pytest.fixture
+def email_to_send(db):
+    return create_email(
+        send_starts_at=datetime.utcnow() - timedelta(days=1),
+        expires=datetime.utcnow() + timedelta(days=7)
+    )
+
+
+def _send_to_all(to, *args):
+    return {email_to: 200 for email_to in to}
+
+
+class WhenProcessingSendQueuedEmailsTask:
+
+    def it_sends_queued_emails(self, mocker, db, db_session, email_to_send, sample_member):
+        mock_send_email = mocker.patch(
+            'app.na_celery.email_tasks.send_batch_email', return_value={sample_member.email: 200})
+        dao_queue_email(email_to_send, datetime.utcnow())
+
+        send_queued_emails()
+
+        assert mock_send_email.call_args[0][0] == [sample_member.email]
         assert mock_send_email.call_args[0][1] == 'workshop: test title'
+        assert email_to_send.members_sent_to == [sample_member]
+        assert EmailOutbox.query.one().state == SENT
 
-    def it_sends_an_email_to_members_up_to_email_limit(self):
-        pass
+        email = Email.query.filter_by(id=email_to_send.id).one()
+        assert email.sent_at
+        assert email.sent_count == 1
+        assert email.failed_count == 0
 
-    def it_does_not_send_an_email_if_not_between_start_and_expiry(self):
-        pass
+    def it_does_not_send_emails_before_send_after(self, mocker, db, db_session, email_to_send, sample_member):
+        mock_send_email = mocker.patch('app.na_celery.email_tasks.send_batch_email')
+        dao_queue_email(email_to_send, datetime.utcnow() + timedelta(hours=1))
+
+        send_queued_emails()
+
+        assert not mock_send_email.called
+        assert EmailOutbox.query.one().state == PENDING
+
+    def it_does_not_send_expired_emails(self, mocker, db, db_session, sample_member):
+        email = create_email(
+            send_starts_at=datetime.utcnow() - timedelta(days=7), expires=datetime.utcnow() - timedelta(days=1))
+        mock_send_email = mocker.patch('app.na_celery.email_tasks.send_batch_email')
+        dao_queue_email(email, datetime.utcnow() - timedelta(days=7))
+
+        send_queued_emails()
+
+        assert not mock_send_email.called
+
+    def it_does_not_send_emails_claimed_by_another_worker(
+            self, mocker, db, db_session, email_to_send, sample_member):
+        mock_send_email = mocker.patch('app.na_celery.email_tasks.send_batch_email')
+        dao_queue_email(email_to_send, datetime.utcnow())
+        EmailOutbox.query.update({'state': SENDING, 'claimed_at': datetime.utcnow()})
+
+        send_queued_emails()
+
+        assert not mock_send_email.called
+
+    def it_sends_emails_claimed_by_a_stopped_worker(
+            self, app, mocker, db, db_session, email_to_send, sample_member):
+        mock_send_email = mocker.patch('app.na_celery.email_tasks.send_batch_email', side_effect=_send_to_all)
+        dao_queue_email(email_to_send, datetime.utcnow())
+        EmailOutbox.query.update({
+            'state': SENDING,
+            'claimed_at': datetime.utcnow() - timedelta(seconds=app.config['EMAIL_CLAIM_TIMEOUT'] + 1)
+        })
+
+        send_queued_emails()
+
+        assert mock_send_email.call_args[0][0] == [sample_member.email]
+
+    def it_renders_each_email_once(self, app, mocker, db, db_session, email_to_send, sample_member):
+        mocker.patch.dict(app.config, {'EMAIL_BATCH_SIZE': 1})
+        create_member(name='Jack Green', email='jack@example.com', old_id=2)
+        mocker.patch('app.na_celery.email_tasks.send_batch_email', side_effect=_send_to_all)
+        mock_get_event = mocker.patch(
+            'app.comms.email.dao_get_event_by_id', wraps=dao_get_event_by_id)
+        mock_render = mocker.patch('app.comms.email.render_template', return_value='<p>test</p>')
+        dao_queue_email(email_to_send, datetime.utcnow())
+
+        send_queued_emails()
+
+        assert mock_get_event.call_count == 1
+        assert mock_render.call_count == 1
+
+    def it_sends_emails_in_batches(self, app, mocker, db, db_session, email_to_send, sample_member):
+        mocker.patch.dict(app.config, {'EMAIL_BATCH_SIZE': 1})
+        member = create_member(name='Jack Green', email='jack@example.com', old_id=2)
+        status_codes = {sample_member.email: 200, member.email: 400}
+        mock_send_email = mocker.patch(
+            'app.na_celery.email_tasks.send_batch_email',
+            side_effect=lambda to, *args: {email_to: status_codes[email_to] for email_to in to}
+        )
+        dao_queue_email(email_to_send, datetime.utcnow())
+
+        send_queued_emails()
+
+        assert mock_send_email.call_count == 2
+        status_codes = dict((e.member_id, e.status_code) for e in EmailToMember.query.all())
+        assert status_codes == {sample_member.id: 200, member.id: 400}
+
+        email = Email.query.filter_by(id=email_to_send.id).one()
+        assert email.sent_count == 1
+        assert email.failed_count == 1
+
+    def it_sends_an_email_to_members_up_to_email_limit(
+            self, app, mocker, db, db_session, email_to_send, sample_member):
+        mocker.patch.dict(app.config, {'EMAIL_LIMIT': 1, 'EMAIL_QUOTA_RESUME_HOUR': 6})
+        create_member(name='Jack Green', email='jack@example.com', old_id=2)
+        mock_send_email = mocker.patch('app.na_celery.email_tasks.send_batch_email', side_effect=_send_to_all)
+        dao_queue_email(email_to_send, datetime.utcnow())
+
+        send_queued_emails()
+
+        assert mock_send_email.call_count == 1
+        assert len(mock_send_email.call_args[0][0]) == 1
+        assert EmailQuota.query.one().sent == 1
+
+        pending = EmailOutbox.query.filter_by(state=PENDING).one()
+        assert pending.send_after == datetime.combine(datetime.utcnow().date() + timedelta(days=1), time(6))
+
+        email = Email.query.filter_by(id=email_to_send.id).one()
+        assert not email.sent_at
+        assert email.sent_count == 1
+
+    def it_records_emails_rejected_by_the_provider_as_failed(
+            self, mocker, db, db_session, email_to_send, sample_member):
+        mocker.patch(
+            'app.na_celery.email_tasks.send_batch_email', return_value={sample_member.email: 400})
+        dao_queue_email(email_to_send, datetime.utcnow())
+
+        send_queued_emails()
+
+        assert EmailOutbox.query.one().state == FAILED
+        assert Email.query.filter_by(id=email_to_send.id).one().failed_count == 1
+
+    def it_sends_emails_again_if_the_provider_is_unavailable(
+            self, mocker, db, db_session, email_to_send, sample_member):
+        mocker.patch(
+            'app.na_celery.email_tasks.send_batch_email', side_effect=requests.exceptions.ConnectionError)
+        dao_queue_email(email_to_send, datetime.utcnow())
+
+        send_queued_emails()
+
+        assert EmailOutbox.query.one().state == PENDING
+        assert EmailQuota.query.one().sent == 0
+
+    def it_sends_emails_again_only_to_members_not_sent_to(
+            self, mocker, db, db_session, email_to_send, sample_member):
+        member = create_member(name='Jack Green', email='jack@example.com', old_id=2)
+        mocker.patch(
+            'app.na_celery.email_tasks.send_batch_email', return_value={sample_member.email: 200})
+        dao_queue_email(email_to_send, datetime.utcnow())
+
+        send_queued_emails()
+
+        assert EmailOutbox.query.filter_by(member_id=sample_member.id).one().state == SENT
+        assert EmailOutbox.query.filter_by(member_id=member.id).one().state == PENDING
+        assert EmailQuota.query.one().sent == 1
+        assert email_to_send.members_sent_to == [sample_member]
 
     def it_sends_email_with_correct_template(self):
         pass
@@ -0,0 +1,46 @@
+from celery.exceptions import Retry
+import pytest
+import requests
+
+from app.models import READY
+from app.na_celery.notification_tasks import send_email_notification, send_event_notification
+
+
+class WhenProcessingSendEmailNotificationTask:
+
+    def it_sends_a_review_notification(self, mocker, db, db_session, sample_email, sample_admin_user):
+        mock_send_email = mocker.patch('app.na_celery.notification_tasks.send_email')
+        sample_email.email_state = READY
+
+        send_email_notification(str(sample_email.id), READY)
+
+        assert mock_send_email.call_args[0][0] == [sample_admin_user.email]
+        assert mock_send_email.call_args[0][1] == 'Please review test title'
+
+    def it_does_not_notify_if_the_email_state_has_changed(self, mocker, db, db_session, sample_email):
+        mock_send_email = mocker.patch('app.na_celery.notification_tasks.send_email')
+
+        send_email_notification(str(sample_email.id), READY)
+
+        assert not mock_send_email.called
+
+    def it_retries_if_the_email_provider_is_unavailable(self, mocker, db, db_session, sample_email):
+        mocker.patch(
+            'app.na_celery.notification_tasks.send_email', side_effect=requests.exceptions.ConnectionError)
+        mock_retry = mocker.patch.object(send_email_notification, 'retry', side_effect=Retry)
+        sample_email.email_state = READY
+
+        with pytest.raises(Retry):
+            send_email_notification(str(sample_email.id), READY)
+
+        assert mock_retry.called
+
+
+class WhenProcessingSendEventNotificationTask:
+
+    def it_does_not_notify_if_the_event_state_has_changed(self, mocker, db, db_session, sample_event):
+        mock_send_email = mocker.patch('app.na_celery.notification_tasks.send_email')
+
+        send_event_notification(str(sample_event.id), READY)
+
+        assert not mock_send_email.called
@@ -0,0 +1,31 @@
+from celery.exceptions import Retry
+import pytest
+
+from app.errors import CircuitOpenError
+from app.models import Event
+from app.na_celery.storage_tasks import upload_event_image
+
+
+class WhenProcessingUploadEventImageTask:
+
+    def it_uploads_the_image_and_updates_the_event(self, mocker, db, db_session, sample_event):
+        mocker.patch('app.na_celery.storage_tasks.Storage.__init__', return_value=None)
+        mock_upload = mocker.patch('app.na_celery.storage_tasks.Storage.upload_blob_from_base64string')
+
+        upload_event_image(
+            str(sample_event.id), 'test_img.png', '2018/test', 'data', event_image_filename='2018/test?1')
+
+        assert mock_upload.call_args[0] == ('test_img.png', '2018/test', 'data')
+        assert Event.query.one().image_filename == '2018/test?1'
+
+    def it_retries_if_storage_is_unavailable(self, mocker, db, db_session, sample_event):
+        mocker.patch(
+            'app.na_celery.storage_tasks.Storage.__init__', side_effect=CircuitOpenError('google_storage'))
+        mock_retry = mocker.patch.object(upload_event_image, 'retry', side_effect=Retry)
+        image_filename = sample_event.image_filename
+
+        with pytest.raises(Retry):
+            upload_event_image(str(sample_event.id), 'test_img.png', '2018/test', 'data')
+
+        assert mock_retry.called
+        assert Event.query.one().image_filename == image_filename
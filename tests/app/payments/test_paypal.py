@@ -71,7 +71,7 @@ class MockRequests:
 class WhenCreatingPaypalButton:
 
     def it_calls_paypal_apis_to_create_button(self, app, mocker, sample_uuid):
-        mocker.patch('app.payments.paypal.requests', MockRequests())
+        mocker.patch('app.payments.paypal.get_session', return_value=MockRequests())
 
         p = PayPal()
         button_id = p.create_update_paypal_button(
@@ -100,14 +100,15 @@ class WhenCreatingPaypalButton:
         assert button_id == 'MOCK_BUTTON_ID'
 
     def it_calls_paypal_apis_to_update_button(self, app, mocker):
-        mocker.patch('app.payments.paypal.requests', MockRequests())
+        mocker.patch('app.payments.paypal.get_session', return_value=MockRequests())
 
         p = PayPal()
         button_id = p.create_update_paypal_button(mock_item_id, 'test title')
         assert button_id == mock_update_button_id
 
     def it_raises_an_error_on_paypal_error(self, app, mocker):
-        mocker.patch('app.payments.paypal.requests', MockRequests(ack='Error', err_msg='&L_LONGMESSAGE0=Error'))
+        mocker.patch(
+            'app.payments.paypal.get_session', return_value=MockRequests(ack='Error', err_msg='&L_LONGMESSAGE0=Error'))
 
         p = PayPal()
 
@@ -118,14 +119,14 @@ class WhenCreatingPaypalButton:
 class WhenUpdatingPaypalButton:
 
     def it_calls_paypal_apis_to_update_button(self, app, mocker):
-        mocker.patch('app.payments.paypal.requests', MockRequests())
+        mocker.patch('app.payments.paypal.get_session', return_value=MockRequests())
 
         p = PayPal()
         button_id = p.create_update_paypal_button(mock_item_id, 'test title')
         assert button_id == mock_update_button_id
 
     def it_raises_an_error_if_no_item_found(self, app, mocker, sample_uuid):
-        mocker.patch('app.payments.paypal.requests', MockRequests())
+        mocker.patch('app.payments.paypal.get_session', return_value=MockRequests())
 
         p = PayPal()
         with pytest.raises(expected_exception=PaypalException):
@@ -3,6 +3,7 @@ import uuid
 
 from flask import json, url_for
 from tests.conftest import create_authorization_header
+from tests.db import create_article
 
 
 sample_articles = [
@@ -39,6 +40,30 @@ class WhenGettingArticles:
         assert len(data) == 1
         assert data[0]['id'] == str(sample_article.id)
 
+    def it_returns_articles_a_page_at_a_time(self, client, db_session):
+        articles = [create_article(old_id=old_id, title='Article {}'.format(old_id)) for old_id in [3, 1, 2]]
+
+        response = client.get(
+            url_for('articles.get_articles', limit=2),
+            headers=[create_authorization_header()]
+        )
+        assert response.status_code == 200
+
+        data = json.loads(response.get_data(as_text=True))
+
+        assert [a['id'] for a in data['data']] == [str(articles[1].id), str(articles[2].id)]
+        assert data['next']
+
+        response = client.get(
+            url_for('articles.get_articles', limit=2, cursor=data['next']),
+            headers=[create_authorization_header()]
+        )
+
+        data = json.loads(response.get_data(as_text=True))
+
+        assert [a['id'] for a in data['data']] == [str(articles[0].id)]
+        assert data['next'] is None
+
     def it_returns_all_articles_summary(self, client, sample_article, db_session):
         response = client.get(
             url_for('articles.get_articles_summary'),
@@ -52,6 +77,33 @@ class WhenGettingArticles:
         assert data[0]['id'] == str(sample_article.id)
 
 
+class WhenSearchingArticles:
+
+    def it_returns_ranked_articles_with_snippets(self, client, db_session):
+        create_article(old_id=1, title='Egyptians', content='<p>The pyramids of Egypt</p>')
+        article = create_article(old_id=2, title='Pyramids', content='<p>Building the pyramids</p>')
+        create_article(old_id=3, title='Greece', content='<p>The Parthenon</p>')
+
+        response = client.get(
+            url_for('articles.search_articles', q='pyramids'),
+            headers=[create_authorization_header()]
+        )
+        assert response.status_code == 200
+
+        data = json.loads(response.get_data(as_text=True))
+
+        assert len(data) == 2
+        assert data[0]['id'] == str(article.id)
+        assert data[0]['snippet'] == 'Building the <mark>pyramids</mark>'
+
+    def it_raises_400_without_search_text(self, client, db_session):
+        response = client.get(
+            url_for('articles.search_articles'),
+            headers=[create_authorization_header()]
+        )
+        assert response.status_code == 400
+
+
 class WhenGettingArticleByID:
 
     def it_returns_correct_article(self, client, sample_article, db_session):
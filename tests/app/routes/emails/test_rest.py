@@ -1,7 +1,7 @@
 from datetime import datetime, timedelta
 from freezegun import freeze_time
 from freezegun.api import FakeDatetime
-from mock import Mock, call
+from mock import call
 import pytest
 import six.moves.urllib as urllib
 from sqlalchemy.orm.exc import NoResultFound
@@ -9,8 +9,11 @@ from sqlalchemy.orm.exc import NoResultFound
 from bs4 import BeautifulSoup
 from flask import json, url_for
 
-from app.models import ANNOUNCEMENT, EVENT, MAGAZINE, MANAGED_EMAIL_TYPES, APPROVED, READY, REJECTED, Email
-from app.dao.emails_dao import dao_add_member_sent_to_email
+from app.models import (
+    ANNOUNCEMENT, EVENT, MAGAZINE, MANAGED_EMAIL_TYPES, APPROVED, READY, REJECTED, Email, EmailOutbox
+)
+from app.dao.emails_dao import dao_add_member_sent_to_email, dao_queue_email
+from app.na_celery.notification_tasks import send_email_notification
 from tests.conftest import create_authorization_header, request, TEST_ADMIN_USER
 from tests.db import create_email, create_event, create_event_date, create_member
 
@@ -271,6 +274,14 @@ class WhenPostingCreateEmail:
 
 class WhenPostingUpdateEmail:
 
+    @pytest.fixture(autouse=True)
+    def setup(self, mocker):
+        # runs the notification task straight away so that the email sent can be checked
+        self.mock_send_email_notification = mocker.patch(
+            'app.routes.emails.rest.notification_tasks.send_email_notification.apply_async',
+            side_effect=lambda args, kwargs: send_email_notification(*args, **kwargs)
+        )
+
     def it_updates_an_event_email(self, mocker, client, db, db_session, sample_email):
         data = {
             "event_id": str(sample_email.event_id),
@@ -313,7 +324,7 @@ class WhenPostingUpdateEmail:
         assert json_resp['message'] == 'event not found: {}'.format(sample_uuid)
 
     def it_updates_an_event_email_to_ready(self, mocker, client, db, db_session, sample_admin_user, sample_email):
-        mock_send_email = mocker.patch('app.routes.emails.rest.send_email', return_value=200)
+        mock_send_email = mocker.patch('app.na_celery.notification_tasks.send_email', return_value=200)
         data = {
             "event_id": str(sample_email.event_id),
             "details": sample_email.details,
@@ -336,11 +347,35 @@ class WhenPostingUpdateEmail:
 
         assert mock_send_email.call_args[0][0] == [TEST_ADMIN_USER]
 
-    def it_updates_an_event_email_to_rejected(
+    def it_does_not_notify_again_when_saving_the_same_state(
         self, mocker, client, db, db_session, sample_admin_user, sample_email
     ):
-        mock_send_email = mocker.patch('app.routes.emails.rest.send_email', return_value=200)
-        mock_revoke_task = mocker.patch('app.routes.emails.rest.revoke_task')
+        mock_send_email = mocker.patch('app.na_celery.notification_tasks.send_email', return_value=200)
+        data = {
+            "event_id": str(sample_email.event_id),
+            "details": sample_email.details,
+            "extra_txt": sample_email.extra_txt,
+            "replace_all": sample_email.replace_all,
+            "email_type": EVENT,
+            "email_state": READY
+        }
+
+        for _ in range(2):
+            response = client.post(
+                url_for('emails.update_email', email_id=str(sample_email.id)),
+                data=json.dumps(data),
+                headers=[('Content-Type', 'application/json'), create_authorization_header()]
+            )
+            assert response.status_code == 200
+
+        assert self.mock_send_email_notification.call_count == 1
+        assert mock_send_email.call_count == 1
+
+    def it_updates_an_event_email_to_rejected(
+        self, mocker, client, db, db_session, sample_admin_user, sample_email, sample_member
+    ):
+        mock_send_email = mocker.patch('app.na_celery.notification_tasks.send_email', return_value=200)
+        dao_queue_email(sample_email, datetime(2019, 8, 8, 10))
 
         data = {
             "event_id": str(sample_email.event_id),
@@ -349,8 +384,7 @@ class WhenPostingUpdateEmail:
             "replace_all": sample_email.replace_all,
             "email_type": EVENT,
             "email_state": REJECTED,
-            "reject_reason": 'test reason',
-            "task_id": 'task_id'
+            "reject_reason": 'test reason'
         }
 
         response = client.post(
@@ -365,7 +399,7 @@ class WhenPostingUpdateEmail:
         assert len(emails) == 1
         assert emails[0].extra_txt == data['extra_txt']
 
-        assert mock_revoke_task.call_args[0][0] == 'task_id'
+        assert not EmailOutbox.query.all()
         assert mock_send_email.call_args[0][0] == [TEST_ADMIN_USER]
         assert mock_send_email.call_args[0][1] == "test title email needs to be corrected"
         assert mock_send_email.call_args[0][2] == (
@@ -376,12 +410,8 @@ class WhenPostingUpdateEmail:
 
     @freeze_time("2019-08-08 10:00:00")
     def it_updates_an_event_email_to_approved(
-        self, mocker, client, db, db_session, sample_admin_user, sample_email
+        self, mocker, client, db, db_session, sample_admin_user, sample_email, sample_member
     ):
-        mock_result = Mock()
-        mock_result.id = 'test task_id'
-        mock_send_emails_task = mocker.patch(
-            'app.routes.emails.rest.email_tasks.send_emails.apply_async', return_value=mock_result)
 
         data = {
             "event_id": str(sample_email.event_id),
@@ -400,10 +430,10 @@ class WhenPostingUpdateEmail:
             headers=[('Content-Type', 'application/json'), create_authorization_header()]
         )
 
-        assert mock_send_emails_task.call_args[0][0] == (str(sample_email.id),)
-        assert mock_send_emails_task.call_args[1] == {'eta': FakeDatetime(2019, 8, 8, 10, 1)}
+        queued = EmailOutbox.query.all()
+        assert [(q.email_id, q.member_id) for q in queued] == [(sample_email.id, sample_member.id)]
+        assert queued[0].send_after == FakeDatetime(2019, 8, 8, 10, 1)
         assert response.json['extra_txt'] == data['extra_txt']
-        assert response.json['task_id'] == mock_result.id
         emails = Email.query.all()
         assert len(emails) == 1
         assert emails[0].email_state == data['email_state']
@@ -411,12 +441,8 @@ class WhenPostingUpdateEmail:
 
     @freeze_time("2019-07-01 10:00:00")
     def it_updates_an_event_email_to_approved_starting_email_starts_at_date(
-        self, mocker, client, db, db_session, sample_admin_user, sample_email
+        self, mocker, client, db, db_session, sample_admin_user, sample_email, sample_member
     ):
-        mock_result = Mock()
-        mock_result.id = 'test task_id'
-        mock_send_emails_task = mocker.patch(
-            'app.routes.emails.rest.email_tasks.send_emails.apply_async', return_value=mock_result)
 
         data = {
             "event_id": str(sample_email.event_id),
@@ -435,10 +461,10 @@ class WhenPostingUpdateEmail:
             headers=[('Content-Type', 'application/json'), create_authorization_header()]
         )
 
-        assert mock_send_emails_task.call_args[0][0] == (str(sample_email.id),)
-        assert mock_send_emails_task.call_args[1] == {'eta': FakeDatetime(2019, 8, 8, 9)}
+        queued = EmailOutbox.query.all()
+        assert [(q.email_id, q.member_id) for q in queued] == [(sample_email.id, sample_member.id)]
+        assert queued[0].send_after == FakeDatetime(2019, 8, 8, 9)
         assert response.json['extra_txt'] == data['extra_txt']
-        assert response.json['task_id'] == mock_result.id
         emails = Email.query.all()
         assert len(emails) == 1
         assert emails[0].email_state == data['email_state']
@@ -561,3 +587,20 @@ class WhenPostingImportingEmailsMailings:
         assert response.status_code == 400
         assert response.json['errors'] == [
             '0: Already exists email_to_member {}, {}'.format(str(sample_email.id), str(sample_member.id))]
+
+    def it_doesnt_create_duplicate_email_to_members(self, client, db_session, sample_email, sample_member):
+        data = [
+            {"id": "1", "emailid": "1", "mailinglistid": "1", "timestamp": "2019-06-10 17:30:00"},
+            {"id": "2", "emailid": "1", "mailinglistid": "1", "timestamp": "2019-06-11 17:30:00"},
+        ]
+
+        response = client.post(
+            url_for('emails.import_emails_members_sent_to'),
+            data=json.dumps(data),
+            headers=[('Content-Type', 'application/json'), create_authorization_header()]
+        )
+
+        assert response.status_code == 201
+        assert len(response.json['emails_members_sent_to']) == 1
+        assert response.json['errors'] == [
+            '1: Already exists email_to_member {}, {}'.format(str(sample_email.id), str(sample_member.id))]
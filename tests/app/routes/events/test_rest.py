@@ -1,5 +1,6 @@
 import copy
 from datetime import timedelta
+from io import BytesIO
 import pytest
 from flask import json, url_for
 from mock import Mock, call
@@ -7,11 +8,15 @@ from mock import Mock, call
 from freezegun import freeze_time
 from sqlalchemy.orm.exc import NoResultFound
 
-from app.errors import PaypalException
+from app.errors import CircuitOpenError, PaypalException
 from app.models import Event, EventDate, RejectReason, APPROVED, DRAFT, READY, REJECTED
+from app.na_celery.notification_tasks import send_event_notification
 
-from tests.conftest import create_authorization_header, TEST_ADMIN_USER
-from tests.db import create_event, create_event_date, create_event_type, create_speaker
+from tests.conftest import count_queries, create_authorization_header, TEST_ADMIN_USER
+from tests.db import create_event, create_event_date, create_event_type, create_reject_reason, create_speaker
+
+# token revocation check, table versions, events, event dates, speakers and reject reasons
+EVENTS_QUERY_BUDGET = 6
 
 base64img = (
     'iVBORw0KGgoAAAANSUhEUgAAADgAAAAsCAYAAAAwwXuTAAAACXBIWXMAAAsTAAALEwEAmpwYAAAEMElEQVRoge2ZTUxcVRTH'
@@ -295,6 +300,62 @@ class WhenGettingEvents:
         assert len(data) == 3
         assert data[0]['event_dates'][0]['event_datetime'] == str(event_date_earliest.event_datetime)[0:-3]
 
+    @freeze_time("2018-01-10T19:00:00")
+    @pytest.mark.parametrize('endpoint,kwargs', [
+        ('events.get_events', {}),
+        ('events.get_future_events', {}),
+        ('events.get_events_in_year', {'year': 2018}),
+        ('events.get_past_year_events', {}),
+        ('events.get_limited_events', {'limit': 2}),
+    ])
+    def it_returns_events_within_query_budget(
+        self, client, db, sample_event_type, sample_user, db_session, endpoint, kwargs
+    ):
+        for i, event_datetime in enumerate(['2017-12-20 19:00', '2018-01-20 19:00', '2018-01-25 19:00']):
+            speakers = [create_speaker(name='Speaker {}'.format(i)), create_speaker(name='Other Speaker {}'.format(i))]
+            event = create_event(
+                title='event {}'.format(i),
+                old_id=i,
+                event_type_id=sample_event_type.id,
+                event_dates=[
+                    create_event_date(event_datetime=event_datetime, speakers=speakers),
+                    create_event_date(event_datetime=event_datetime.replace('19:00', '20:00'), speakers=speakers)
+                ]
+            )
+            create_reject_reason(event.id, created_by=sample_user)
+
+        header = create_authorization_header()
+        db.session.expire_all()
+
+        with count_queries(db) as counter:
+            response = client.get(
+                url_for(endpoint, **kwargs),
+                headers=[('Content-Type', 'application/json'), header]
+            )
+
+        assert response.status_code == 200
+        assert json.loads(response.get_data(as_text=True))
+        assert counter.count <= EVENTS_QUERY_BUDGET
+
+
+class WhenSearchingEvents:
+
+    def it_returns_matching_events(self, client, sample_event_type, db_session):
+        event = create_event(title='Philosophy of Economics', description='How Plato can help understand economics')
+        create_event(title='Study Philosophy', description='Introducing the major systems of thought', old_id=2)
+
+        response = client.get(
+            url_for('events.search_events', q='plato'),
+            headers=[create_authorization_header()]
+        )
+        assert response.status_code == 200
+
+        data = json.loads(response.get_data(as_text=True))
+
+        assert len(data) == 1
+        assert data[0]['id'] == str(event.id)
+        assert '<mark>Plato</mark>' in data[0]['snippet']
+
 
 class WhenPostingExtractSpeakers:
 
@@ -323,9 +384,11 @@ class WhenPostingImportEvents(object):
     def mock_storage(self, mocker):
         mock_storage = mocker.patch("app.storage.utils.Storage.__init__", return_value=None)
         mock_storage_blob_exists = mocker.patch("app.storage.utils.Storage.blob_exists")
+        mock_storage_warm_index = mocker.patch("app.storage.utils.Storage.warm_index")
         yield
         mock_storage.assert_called_with('test-store')
         mock_storage_blob_exists.assert_called_with('2004/WinterCourse.jpg')
+        assert mock_storage_warm_index.called
 
     @pytest.fixture
     def mock_storage_not_exists(self, mocker):
@@ -333,6 +396,7 @@ class WhenPostingImportEvents(object):
         mock_storage = mocker.patch("app.storage.utils.Storage.__init__", return_value=None)
         mock_storage_blob_exists = mocker.patch("app.storage.utils.Storage.blob_exists", return_value=False)
         mock_storage_blob_upload = mocker.patch("app.storage.utils.Storage.upload_blob")
+        mocker.patch("app.storage.utils.Storage.warm_index")
         yield
         mock_storage.assert_called_with('test-store')
         mock_storage_blob_exists.assert_called_with('2004/Economics.jpg')
@@ -343,6 +407,7 @@ class WhenPostingImportEvents(object):
         mocker.patch("app.storage.utils.Storage.__init__", return_value=None)
         mocker.patch("app.storage.utils.Storage.blob_exists", return_value=False)
         mocker.patch("app.storage.utils.Storage.upload_blob")
+        mocker.patch("app.storage.utils.Storage.warm_index")
 
     def it_creates_events_for_imported_events(
         self, client, db_session, sample_event_type, sample_venue, sample_speaker, sample_data,
@@ -417,6 +482,26 @@ class WhenPostingImportEvents(object):
         assert json_resp['events'][0]['title'] == sample_data[1]['Title']
         assert str(json_resp['events'][0]['old_id']) == sample_data[1]['id']
 
+    def it_ignores_duplicate_events_in_imported_events(
+        self, client, mocker, db_session, sample_event_type, sample_venue, sample_speaker, sample_data
+    ):
+        mocker.patch("app.storage.utils.Storage.__init__", return_value=None)
+        mocker.patch("app.storage.utils.Storage.blob_exists", return_value=True)
+        sample_data.append(copy.deepcopy(sample_data[0]))
+
+        response = client.post(
+            url_for('events.import_events'),
+            data=json.dumps(sample_data),
+            headers=[('Content-Type', 'application/json'), create_authorization_header()]
+        )
+        assert response.status_code == 201
+
+        json_resp = json.loads(response.get_data(as_text=True))
+        assert len(json_resp['events']) == 2
+        assert json_resp['errors'] == [
+            u'event already exists: {} - {}'.format(sample_data[0]['id'], sample_data[0]['Title'])]
+        assert Event.query.count() == 2
+
     @pytest.mark.parametrize('field,desc', [
         ('Type', 'event type'),
         ('Speaker', 'speaker'),
@@ -549,6 +634,70 @@ class WhenPostingCreatingAnEvent:
         assert event.event_dates[0].end_time.strftime('%H:%M') == '21:00'
         assert event.event_dates[1].end_time.strftime('%H:%M') == '21:00'
 
+    def it_creates_an_event_and_defers_the_paypal_button_when_paypal_is_unavailable(
+        self, mocker, client, db_session, sample_req_event_data, mock_storage_without_asserts
+    ):
+        mocker.patch(
+            "app.routes.events.rest.PayPal.create_update_paypal_button", side_effect=CircuitOpenError('paypal'))
+        mock_paypal_task = mocker.patch(
+            "app.routes.events.rest.paypal_tasks.create_update_paypal_button.apply_async")
+
+        data = {
+            "event_type_id": sample_req_event_data['event_type'].id,
+            "title": "Test title",
+            "description": "Test description",
+            "event_dates": [
+                {
+                    "event_date": "2019-03-01 19:00",
+                    "end_time": "21:00",
+                }
+            ],
+            "venue_id": sample_req_event_data['venue'].id,
+            "fee": 15,
+            "conc_fee": 12,
+        }
+
+        response = client.post(
+            url_for('events.create_event'),
+            data=json.dumps(data),
+            headers=[('Content-Type', 'application/json'), create_authorization_header()]
+        )
+
+        assert response.status_code == 201
+        assert mock_paypal_task.call_args == call((response.json['id'],))
+        assert response.json["booking_code"] == ''
+
+    def it_creates_an_event_and_defers_the_image_upload_when_storage_is_unavailable(
+        self, mocker, client, db_session, sample_req_event_data
+    ):
+        mocker.patch("app.storage.utils.Storage.__init__", side_effect=CircuitOpenError('google_storage'))
+        mock_storage_task = mocker.patch("app.routes.events.rest.storage_tasks.upload_event_image.apply_async")
+
+        data = {
+            "event_type_id": sample_req_event_data['event_type'].id,
+            "title": "Test title",
+            "description": "Test description",
+            "image_filename": "test_img.png",
+            "image_data": base64img,
+            "event_dates": [
+                {
+                    "event_date": "2019-03-01 19:00",
+                }
+            ],
+            "venue_id": sample_req_event_data['venue'].id,
+        }
+
+        response = client.post(
+            url_for('events.create_event'),
+            data=json.dumps(data),
+            headers=[('Content-Type', 'application/json'), create_authorization_header()]
+        )
+
+        assert response.status_code == 201
+        assert mock_storage_task.call_args == call(
+            (response.json['id'], 'test_img.png', '2019/{}'.format(response.json['id']), base64img))
+        assert not response.json['image_filename']
+
     def it_creates_an_event_without_speakers_via_rest(
         self, mocker, client, db_session, sample_req_event_data, mock_storage_without_asserts, mock_paypal
     ):
@@ -783,6 +932,54 @@ class WhenDeletingEvent:
         assert data['message'] == '{} was not deleted'.format(sample_event.id)
 
 
+class WhenPostingEventImage:
+
+    @pytest.fixture
+    def mock_storage_upload(self, mocker):
+        mocker.patch("app.storage.utils.Storage.__init__", return_value=None)
+        return mocker.patch("app.storage.utils.Storage.upload_blob_from_file")
+
+    @freeze_time("2019-06-01T10:00:00")
+    def it_streams_the_request_body_to_storage(self, client, db_session, sample_event, mock_storage_upload):
+        response = client.post(
+            url_for('events.upload_event_image', event_id=sample_event.id),
+            data=b'image data',
+            headers=[('Content-Type', 'image/png'), create_authorization_header()]
+        )
+
+        assert response.status_code == 201
+        data = json.loads(response.get_data(as_text=True))
+        assert data['image_filename'].startswith('2019/{}?'.format(sample_event.id))
+        assert Event.query.one().image_filename == data['image_filename']
+
+        args, kwargs = mock_storage_upload.call_args
+        assert args[1:] == ('2019/{}'.format(sample_event.id), 'image/png')
+        assert kwargs['size'] == len(b'image data')
+
+    @freeze_time("2019-06-01T10:00:00")
+    def it_streams_a_multipart_image_to_storage(self, client, db_session, sample_event, mock_storage_upload):
+        response = client.post(
+            url_for('events.upload_event_image', event_id=sample_event.id),
+            data={'image': (BytesIO(b'image data'), 'test.png', 'image/png')},
+            content_type='multipart/form-data',
+            headers=[create_authorization_header()]
+        )
+
+        assert response.status_code == 201
+        args, _ = mock_storage_upload.call_args
+        assert args[1:] == ('2019/{}'.format(sample_event.id), 'image/png')
+
+    def it_raises_400_if_not_an_image(self, client, db_session, sample_event, mock_storage_upload):
+        response = client.post(
+            url_for('events.upload_event_image', event_id=sample_event.id),
+            data='{}',
+            headers=[('Content-Type', 'application/json'), create_authorization_header()]
+        )
+
+        assert response.status_code == 400
+        assert not mock_storage_upload.called
+
+
 class WhenPostingUpdatingAnEvent:
 
     @pytest.fixture(autouse=True)
@@ -798,7 +995,12 @@ class WhenPostingUpdatingAnEvent:
             'app.comms.email.current_app.config',
             self.mock_config
         )
-        self.mock_send_email = mocker.patch('app.comms.email.requests.post')
+        self.mock_send_email = mocker.patch('app.comms.sessions.PooledSession.post')
+        # runs the notification task straight away so that the email sent can be checked
+        self.mock_send_event_notification = mocker.patch(
+            'app.routes.events.rest.notification_tasks.send_event_notification.apply_async',
+            side_effect=lambda args: send_event_notification(*args)
+        )
 
     @pytest.fixture
     def mock_storage(self, mocker):
@@ -890,6 +1092,21 @@ class WhenPostingUpdatingAnEvent:
             }
         )
 
+    def it_does_not_notify_again_when_saving_the_same_state(
+        self, mocker, client, db_session, sample_req_event_data_with_event, mock_storage, mock_paypal, sample_admin_user
+    ):
+        data = dict(sample_req_event_data_with_event['data'], event_state=READY)
+
+        for _ in range(2):
+            response = client.post(
+                url_for('events.update_event', event_id=sample_req_event_data_with_event['event'].id),
+                data=json.dumps(data),
+                headers=[('Content-Type', 'application/json'), create_authorization_header()]
+            )
+            assert response.status_code == 200
+
+        assert self.mock_send_event_notification.call_count == 1
+
     def it_rejects_invalid_event_states(
         self, mocker, client, db_session, sample_req_event_data_with_event, mock_paypal
     ):
@@ -1306,6 +1523,33 @@ class WhenPostingUpdatingAnEvent:
         # use existing event date
         assert event_dates[0].id == old_event_date_id
 
+    def it_updates_an_event_and_defers_the_image_upload_when_storage_is_unavailable(
+        self, mocker, client, db_session, sample_req_event_data_with_event, mock_paypal
+    ):
+        mocker.patch("app.storage.utils.Storage.__init__", return_value=None)
+        mocker.patch(
+            "app.storage.utils.Storage.upload_blob_from_base64string",
+            side_effect=CircuitOpenError('google_storage')
+        )
+        mock_storage_task = mocker.patch("app.routes.events.rest.storage_tasks.upload_event_image.apply_async")
+
+        event = sample_req_event_data_with_event['event']
+        image_filename = event.image_filename
+        data = dict(sample_req_event_data_with_event['data'], image_filename='test_img.png', image_data=base64img)
+
+        response = client.post(
+            url_for('events.update_event', event_id=event.id),
+            data=json.dumps(data),
+            headers=[('Content-Type', 'application/json'), create_authorization_header()]
+        )
+
+        assert response.status_code == 200
+        assert mock_storage_task.call_args[0][0] == (
+            str(event.id), 'test_img.png', '2018/{}'.format(event.id), base64img)
+        assert mock_storage_task.call_args[0][1]['event_image_filename'].startswith('2018/{}?'.format(event.id))
+        assert response.json['errors'] == ['Storage unavailable, the image will be uploaded later']
+        assert Event.query.one().image_filename == image_filename
+
     def it_updates_an_event_add_event_dates_via_rest(
         self, mocker, client, db_session, sample_req_event_data_with_event, mock_storage_upload, mock_paypal
     ):
@@ -0,0 +1,95 @@
+import uuid
+
+from flask import json, url_for
+from mock import Mock
+
+from app.models import ImportJob, PENDING
+
+from tests.conftest import create_authorization_header
+from tests.db import create_import_job
+
+sample_marketings = [
+    {"id": "1", "marketingtxt": 'Poster', "ordernum": "0", "visible": "1"},
+    {"id": "2", "marketingtxt": 'Leaflet', "ordernum": "1", "visible": "1"},
+]
+
+
+class WhenGettingImportJob:
+
+    def it_returns_the_import_job_progress(self, client, db_session):
+        import_job = create_import_job(data=sample_marketings)
+
+        response = client.get(
+            url_for('imports.get_import_job', import_job_id=import_job.id),
+            headers=[create_authorization_header()]
+        )
+        assert response.status_code == 200
+
+        json_resp = json.loads(response.get_data(as_text=True))
+        assert json_resp['id'] == str(import_job.id)
+        assert json_resp['state'] == PENDING
+        assert json_resp['rows_total'] == 2
+        assert json_resp['rows_processed'] == 0
+        assert json_resp['errors'] == []
+
+    def it_returns_404_for_an_unknown_import_job(self, client, db_session):
+        response = client.get(
+            url_for('imports.get_import_job', import_job_id=uuid.uuid4()),
+            headers=[create_authorization_header()]
+        )
+        assert response.status_code == 404
+
+
+class WhenPostingImportInBackground:
+
+    def it_submits_an_import_job(self, mocker, client, db_session):
+        mock_result = Mock()
+        mock_result.id = 'test task_id'
+        mock_import_task = mocker.patch(
+            'app.routes.imports.rest.import_tasks.import_data.apply_async', return_value=mock_result)
+
+        response = client.post(
+            url_for('marketings.import_marketings', background='true'),
+            data=json.dumps(sample_marketings),
+            headers=[('Content-Type', 'application/json'), create_authorization_header()]
+        )
+        assert response.status_code == 202
+
+        json_resp = json.loads(response.get_data(as_text=True))
+        import_job = ImportJob.query.one()
+        assert json_resp['id'] == str(import_job.id)
+        assert import_job.import_type == 'marketings'
+        assert import_job.data == sample_marketings
+        assert mock_import_task.call_args[0] == ((str(import_job.id),), {})
+
+
+class WhenPostingNdjsonImport:
+
+    def it_streams_back_a_result_for_each_record(self, client, db_session):
+        data = '\n'.join([json.dumps(sample_marketings[0]), 'not json', json.dumps(sample_marketings[1])])
+
+        response = client.post(
+            url_for('marketings.import_marketings'),
+            data=data,
+            headers=[('Content-Type', 'application/x-ndjson'), create_authorization_header()]
+        )
+        assert response.status_code == 200
+        assert response.mimetype == 'application/x-ndjson'
+
+        results = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        assert results[0]['created']['description'] == 'Poster'
+        assert results[1]['row'] == 1
+        assert results[2]['created']['description'] == 'Leaflet'
+        assert results[3] == {'rows_processed': 3, 'rows_created': 2, 'errors': 1}
+
+    def it_streams_back_validation_errors(self, client, db_session):
+        response = client.post(
+            url_for('marketings.import_marketings'),
+            data=json.dumps({"id": "1"}),
+            headers=[('Content-Type', 'application/x-ndjson'), create_authorization_header()]
+        )
+
+        results = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        assert results[0]['row'] == 0
+        assert results[0]['error']
+        assert results[1] == {'rows_processed': 1, 'rows_created': 0, 'errors': 1}
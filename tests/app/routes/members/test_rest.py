@@ -111,3 +111,39 @@ class WhenPostingMembers:
         members = Member.query.all()
 
         assert len(members) == 2
+
+    def it_doesnt_import_members_with_existing_emails(self, client, db_session, sample_marketing, sample_member):
+        data = [
+            {
+                "id": "2",
+                "Name": "Test member 2",
+                "EmailAdd": sample_member.email,
+                "Active": "y",
+                "CreationDate": "2019-08-02",
+                "Marketing": "1",
+                "IsMember": "n",
+                "LastUpdated": "2019-08-11 10:00:00"
+            },
+            {
+                "id": "3",
+                "Name": "Test member 3",
+                "EmailAdd": "test3@example.com",
+                "Active": "y",
+                "CreationDate": "2019-08-02",
+                "Marketing": "1",
+                "IsMember": "n",
+                "LastUpdated": "2019-08-11 10:00:00"
+            },
+        ]
+        response = client.post(
+            url_for('members.import_members'),
+            data=json.dumps(data),
+            headers=[('Content-Type', 'application/json'), create_authorization_header()]
+        )
+        assert response.status_code == 201
+        assert response.json.get('errors') == ['member email already exists: 2, {}'.format(sample_member.email)]
+        assert [m['old_id'] for m in response.json['members']] == [3]
+
+        members = Member.query.all()
+
+        assert len(members) == 2
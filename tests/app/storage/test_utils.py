@@ -1,16 +1,34 @@
 import base64
+from google.api_core.exceptions import NotFound, ServiceUnavailable
+from mock import Mock
 import pytest
 
 from app.storage.utils import Storage, sizeof_fmt
 
 
+@pytest.fixture(autouse=True)
+def clear_storage_clients(mocker):
+    mocker.patch.dict('app.storage.utils._clients', clear=True)
+
+
 class MockBlob:
+    def __init__(self, name=None, exists=True):
+        self.name = name
+        self._exists = exists
+
+    def exists(self):
+        return self._exists
+
     def upload_from_filename(self, filename):
         self.source_filename = filename
 
     def upload_from_string(self, string, content_type=None):
         self.source_string = string
 
+    def upload_from_file(self, file_obj, size=None, content_type=None):
+        self.source_file = file_obj
+        self.content_type = content_type
+
     def make_public(self):
         self.public = True
 
@@ -20,18 +38,18 @@ class MockBucket:
         self.name = bucket_name
         self.bucket_created = False
 
-    def blob(self, filename=None):
+    def blob(self, filename=None, chunk_size=None):
         self.destination_filename = filename
-        self.blob = MockBlob()
+        self.chunk_size = chunk_size
+        self.blob = MockBlob(filename)
         return self.blob
 
     def upload_blob(self, filename):
         self.upload_block = True
 
-    def list_blobs(self, prefix, delimiter):
-        self.prefix = prefix
-        self.delimiter = delimiter
-        return ['prefix']
+    def list_blobs(self, fields=None):
+        self.list_blobs_called = True
+        return [MockBlob('2019/listed.png')]
 
     def create_bucket(self, bucket_name):
         self.bucket_created = True
@@ -46,6 +64,9 @@ class MockEmptyStorageClient:
     def list_buckets(self):
         return self.buckets
 
+    def lookup_bucket(self, bucket_name):
+        return None
+
     def create_bucket(self, bucket_name):
         self.buckets.append(bucket_name)
 
@@ -53,10 +74,7 @@ class MockEmptyStorageClient:
 
 
 class MockStorageClient:
-    def list_buckets(self):
-        return [MockBucket('test-store')]
-
-    def get_bucket(self, bucket_name):
+    def lookup_bucket(self, bucket_name):
         return MockBucket(bucket_name)
 
 
@@ -136,6 +154,22 @@ class WhenUsingStorage:
         assert not store.bucket.bucket_created
         assert store.bucket.name == 'test-store'
 
+    def it_creates_the_storage_client_and_bucket_once(self, app, mocker):
+        mocker.patch.dict('os.environ', {
+            'GOOGLE_APPLICATION_CREDENTIALS': 'path/to/creds'
+        })
+
+        mock_client = mocker.patch("google.cloud.storage.Client", return_value=MockStorageClient())
+        mock_lookup_bucket = mocker.patch.object(
+            MockStorageClient, 'lookup_bucket', return_value=MockBucket('test-store'))
+
+        store = Storage('test-store')
+        another_store = Storage('test-store')
+
+        assert mock_client.call_count == 1
+        assert mock_lookup_bucket.call_count == 1
+        assert store.bucket == another_store.bucket
+
     def it_uploads_a_file(self, app, mocker):
         mocker.patch.dict('os.environ', {
             'GOOGLE_APPLICATION_CREDENTIALS': 'path/to/creds'
@@ -173,12 +207,54 @@ class WhenUsingStorage:
         mocker.patch("google.auth.compute_engine.Credentials")
 
         store = Storage('test-store')
-        res = store.blob_exists('prefix', 'delimiter')
+        res = store.blob_exists('2019/test.png')
 
-        assert store.bucket.prefix == 'prefix'
-        assert store.bucket.delimiter == 'delimiter'
+        assert store.bucket.destination_filename == '2019/test.png'
         assert res
 
+    def it_checks_blob_exists_using_the_index(self, app, mocker):
+        mocker.patch.dict('os.environ', {
+            'GOOGLE_APPLICATION_CREDENTIALS': 'path/to/creds'
+        })
+
+        mocker.patch("google.cloud.storage.Client", MockStorageClient)
+        mocker.patch("google.auth.compute_engine.Credentials")
+
+        store = Storage('test-store')
+        store.warm_index()
+        mock_blob = mocker.patch.object(store.bucket, 'blob')
+
+        assert store.blob_exists('2019/listed.png')
+        assert not mock_blob.called
+
+    def it_checks_storage_if_blob_not_in_the_index(self, app, mocker):
+        mocker.patch.dict('os.environ', {
+            'GOOGLE_APPLICATION_CREDENTIALS': 'path/to/creds'
+        })
+
+        mocker.patch("google.cloud.storage.Client", MockStorageClient)
+        mocker.patch("google.auth.compute_engine.Credentials")
+
+        store = Storage('test-store')
+        store.warm_index()
+
+        assert store.blob_exists('2019/test.png')
+        assert store.index.contains('2019/test.png')
+
+    def it_adds_uploaded_blobs_to_the_index(self, app, mocker):
+        mocker.patch.dict('os.environ', {
+            'GOOGLE_APPLICATION_CREDENTIALS': 'path/to/creds'
+        })
+
+        mocker.patch("google.cloud.storage.Client", MockStorageClient)
+        mocker.patch("google.auth.compute_engine.Credentials")
+
+        store = Storage('test-store')
+        store.warm_index()
+        store.upload_blob('source', 'destination')
+
+        assert store.index.contains('destination')
+
     def it_logs_args_if_development_and_no_google_config_when_blob_exists(self, app, mocker):
         mocker.patch.dict('app.storage.utils.current_app.config', {
             'ENVIRONMENT': 'development',
@@ -188,7 +264,7 @@ class WhenUsingStorage:
         mock_logger = mocker.patch("app.storage.utils.current_app.logger.info")
 
         store = Storage('test-store')
-        store.blob_exists('prfix', 'delimiter')
+        store.blob_exists('2019/test.png')
 
         assert mock_logger.called
 
@@ -205,6 +281,56 @@ class WhenUsingStorage:
 
         assert store.bucket.blob.source_string == base64.b64decode(self.base64img)
 
+    def it_streams_a_file(self, app, mocker):
+        mocker.patch.dict('os.environ', {
+            'GOOGLE_APPLICATION_CREDENTIALS': 'path/to/creds'
+        })
+
+        mocker.patch("google.cloud.storage.Client", MockStorageClient)
+        mocker.patch("google.auth.compute_engine.Credentials")
+
+        store = Storage('test-store')
+        store.upload_blob_from_file('file', '2019/test.png', 'image/png')
+
+        assert store.bucket.destination_filename == '2019/test.png'
+        assert store.bucket.chunk_size == app.config['STORAGE_UPLOAD_CHUNK_SIZE']
+        assert store.bucket.blob.source_file == 'file'
+        assert store.bucket.blob.content_type == 'image/png'
+        assert store.bucket.blob.public
+
+    def it_streams_a_small_file_without_chunks(self, app, mocker):
+        mocker.patch.dict('os.environ', {
+            'GOOGLE_APPLICATION_CREDENTIALS': 'path/to/creds'
+        })
+
+        mocker.patch("google.cloud.storage.Client", MockStorageClient)
+        mocker.patch("google.auth.compute_engine.Credentials")
+
+        store = Storage('test-store')
+        store.upload_blob_from_file('file', '2019/test.png', 'image/png', size=1024)
+
+        assert store.bucket.chunk_size is None
+        assert store.bucket.blob.source_file == 'file'
+
+    def it_does_not_count_client_errors_as_storage_failing(self, app, mocker):
+        mocker.patch.dict('os.environ', {
+            'GOOGLE_APPLICATION_CREDENTIALS': 'path/to/creds'
+        })
+
+        mocker.patch("google.cloud.storage.Client", MockStorageClient)
+        mocker.patch("google.auth.compute_engine.Credentials")
+
+        store = Storage('test-store')
+        mock_record_failure = mocker.patch.object(store.breaker, 'record_failure')
+
+        with pytest.raises(NotFound):
+            store.call(Mock(side_effect=NotFound('missing')))
+        assert not mock_record_failure.called
+
+        with pytest.raises(ServiceUnavailable):
+            store.call(Mock(side_effect=ServiceUnavailable('unavailable')))
+        assert mock_record_failure.called
+
     def it_logs_args_if_development_and_no_google_config_when_upload_from_base64string(self, app, mocker):
         mocker.patch.dict('app.storage.utils.current_app.config', {
             'ENVIRONMENT': 'development',
@@ -122,5 +122,7 @@ class WhenUsingEmailModel:
             'email_state': u'draft',
             'send_starts_at': '2019-06-02',
             'expires': '2019-06-21',
-            'task_id': None
+            'sent_at': None,
+            'sent_count': None,
+            'failed_count': None
         }
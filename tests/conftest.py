@@ -10,6 +10,7 @@ from alembic.config import Config
 from flask_migrate import Migrate, MigrateCommand
 from flask_script import Manager
 import sqlalchemy
+from sqlalchemy import event as sqlalchemy_event
 from flask_jwt_extended import create_access_token, create_refresh_token
 
 from app import create_app, db as _db, get_env
@@ -57,7 +58,8 @@ def app():
         'FRONTEND_URL': 'http://frontend-test',
         'FRONTEND_ADMIN_URL': 'http://frontend-test/admin',
         'CELERY_BROKER_URL': 'http://mock-celery',
-        'EMAIL_DELAY': 60
+        'EMAIL_DELAY': 60,
+        'CACHE_BACKEND': None
     })
 
     ctx = _app.app_context()
@@ -231,6 +233,27 @@ def request(url, method, data=None, headers=None):
     return r
 
 
+class QueryCounter(object):
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def _count(self, *args, **kwargs):
+        self.count += 1
+
+    def __enter__(self):
+        sqlalchemy_event.listen(self.engine, 'before_cursor_execute', self._count)
+        return self
+
+    def __exit__(self, *args):
+        sqlalchemy_event.remove(self.engine, 'before_cursor_execute', self._count)
+
+
+def count_queries(db):
+    return QueryCounter(db.engine)
+
+
 def create_authorization_header(client_id='testadmin'):
     expires = datetime.timedelta(minutes=1)
 
@@ -7,6 +7,7 @@ from app.dao.events_dao import dao_create_event, dao_get_event_by_old_id
 from app.dao.event_dates_dao import dao_create_event_date
 from app.dao.event_types_dao import dao_create_event_type
 from app.dao.fees_dao import dao_create_fee
+from app.dao.import_jobs_dao import dao_create_import_job
 from app.dao.marketings_dao import dao_create_marketing
 from app.dao.members_dao import dao_create_member
 from app.dao.reject_reasons_dao import dao_create_reject_reason
@@ -14,7 +15,8 @@ from app.dao.speakers_dao import dao_create_speaker
 from app.dao.users_dao import dao_create_user
 from app.dao.venues_dao import dao_create_venue
 from app.models import (
-    Article, Email, Event, EventDate, EventType, Fee, Marketing, Member, RejectReason, Speaker, User, Venue,
+    Article, Email, Event, EventDate, EventType, Fee, ImportJob, Marketing, Member, RejectReason, Speaker, User,
+    Venue,
     EVENT
 )
 
@@ -326,3 +328,14 @@ def create_reject_reason(event_id=None, reason='Test reason', resolved=False, cr
     dao_create_reject_reason(reject_reason)
 
     return reject_reason
+
+
+def create_import_job(import_type='marketings', data=None):
+    if data is None:
+        data = []
+
+    import_job = ImportJob(import_type=import_type, data=data, rows_total=len(data), errors=[])
+
+    dao_create_import_job(import_job)
+
+    return import_job